@@ -0,0 +1,97 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ArtifactCache:
+    """
+    Byte-bounded LRU cache of rendered artifacts (DOCX bytes, preview HTML).
+
+    Entries are keyed by artifact kind, the content hash of the resume they
+    were rendered from and an optional variant (e.g. the session id baked
+    into the preview HTML), so a changed resume is never served a stale
+    artifact. bind() remembers which hash each session last rendered and
+    drops the old artifacts once the session's data changes, unless another
+    session with the same content is still bound to them.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_sessions: int = 10000):
+        self.max_bytes = max_bytes
+        self.max_sessions = max_sessions
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._session_hashes: "OrderedDict[str, str]" = OrderedDict()
+        # Number of sessions in _session_hashes bound to each content hash
+        self._hash_sessions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kind: str, content_hash: str, variant: str = "") -> Optional[bytes]:
+        key = (kind, content_hash, variant)
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+
+    def contains(self, kind: str, content_hash: str, variant: str = "") -> bool:
+        """Whether an artifact is cached, without counting a hit or miss."""
+        with self._lock:
+            return (kind, content_hash, variant) in self._entries
+
+    def put(self, kind: str, content_hash: str, content: bytes, variant: str = "") -> None:
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            key = (kind, content_hash, variant)
+            if key in self._entries:
+                self.bytes -= len(self._entries.pop(key))
+            self._entries[key] = content
+            self.bytes += len(content)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def bind(self, session_id: str, content_hash: str) -> None:
+        """Record the session's current content hash, dropping artifacts of the previous one."""
+        with self._lock:
+            previous = self._session_hashes.pop(session_id, None)
+            self._session_hashes[session_id] = content_hash
+            if previous == content_hash:
+                return
+            self._hash_sessions[content_hash] = self._hash_sessions.get(content_hash, 0) + 1
+            if len(self._session_hashes) > self.max_sessions:
+                # The forgotten session's artifacts are left to the LRU
+                _, forgotten = self._session_hashes.popitem(last=False)
+                self._release(forgotten)
+            if previous is not None and not self._release(previous):
+                for key in [k for k in self._entries if k[1] == previous]:
+                    self.bytes -= len(self._entries.pop(key))
+
+    def _release(self, content_hash: str) -> int:
+        # Unbind one session from content_hash, returning how many remain bound
+        remaining = self._hash_sessions[content_hash] - 1
+        if remaining:
+            self._hash_sessions[content_hash] = remaining
+        else:
+            del self._hash_sessions[content_hash]
+        return remaining
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+class Backend:
+    """One Ollama server and the counters used to route requests to it."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def stats(self, now: float) -> Dict:
+        return {
+            "url": self.url,
+            "available": self.available(now),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ejections": self.ejections
+        }
+
+class BackendPool:
+    """
+    Route requests over several Ollama servers.
+
+    Each request goes to the available backend with the fewest requests in
+    flight, ties going to the one that has served fewer requests overall.
+    A backend is ejected for eject_seconds after max_failures consecutive
+    failures. While ejected it only gets health checks, and a passing check
+    brings it back early. If every backend is ejected, the one due back
+    first is used anyway rather than failing the request outright.
+    """
+
+    def __init__(self, urls: Sequence[str], max_failures: int = 3, eject_seconds: float = 30,
+                 health_interval: float = 10):
+        if not urls:
+            raise ValueError("at least one Ollama backend is required")
+        self.backends = [Backend(url) for url in urls]
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.health_interval = health_interval
+        self.retries = 0
+        self._health_task: Optional[asyncio.Task] = None
+
+    def pick(self, exclude: Sequence[Backend] = ()) -> Optional[Backend]:
+        """
+        Choose the backend for the next request.
+
+        Args:
+            exclude: Backends that already failed this request
+
+        Returns:
+            Optional[Backend]: None once every backend has been excluded
+        """
+        candidates = [backend for backend in self.backends if backend not in exclude]
+        if not candidates:
+            return None
+        now = time.monotonic()
+        available = [backend for backend in candidates if backend.available(now)]
+        if not available:
+            return min(candidates, key=lambda backend: backend.ejected_until)
+        return min(available, key=lambda backend: (backend.in_flight, backend.requests))
+
+    @contextmanager
+    def track(self, backend: Backend) -> Iterator[None]:
+        """Count a request as in flight on backend while the block runs."""
+        backend.in_flight += 1
+        backend.requests += 1
+        try:
+            yield
+        finally:
+            backend.in_flight -= 1
+
+    def record_success(self, backend: Backend) -> None:
+        backend.consecutive_failures = 0
+        backend.ejected_until = 0.0
+
+    def record_failure(self, backend: Backend, error: Exception) -> None:
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        if backend.consecutive_failures >= self.max_failures and backend.available(time.monotonic()):
+            backend.ejected_until = time.monotonic() + self.eject_seconds
+            backend.ejections += 1
+            logger.warning(
+                f"Ejected Ollama backend {backend.url} for {self.eject_seconds:.0f}s "
+                f"after {backend.consecutive_failures} failures: {str(error)}"
+            )
+
+    def start_health_checks(self, check: Callable[[Backend], Awaitable[bool]]) -> None:
+        """
+        Run check on every backend each health_interval seconds.
+
+        Args:
+            check: Returns whether the backend answers; exceptions count as failures
+        """
+        if self._health_task is None and self.health_interval > 0:
+            self._health_task = asyncio.create_task(self._check_forever(check))
+
+    async def stop_health_checks(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    async def _check_forever(self, check: Callable[[Backend], Awaitable[bool]]) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await asyncio.gather(*[self._check(backend, check) for backend in self.backends])
+
+    async def _check(self, backend: Backend, check: Callable[[Backend], Awaitable[bool]]) -> None:
+        try:
+            healthy = await check(backend)
+            error: Exception = Exception("health check failed")
+        except Exception as e:
+            healthy, error = False, e
+        if healthy:
+            if not backend.available(time.monotonic()):
+                logger.info(f"Ollama backend {backend.url} passed its health check, routing to it again")
+            self.record_success(backend)
+        else:
+            self.record_failure(backend, error)
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        backends: List[Dict] = [backend.stats(now) for backend in self.backends]
+        return {
+            "backends": backends,
+            "available": sum(backend["available"] for backend in backends),
+            "retries": self.retries
+        }
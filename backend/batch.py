@@ -0,0 +1,136 @@
+import asyncio
+import json
+import logging
+import re
+import time
+import zipfile
+from typing import Any, AsyncIterator, Callable, Dict, List, Set, Tuple
+
+from ollama_client import OllamaClient
+from renderer import ArtifactRenderer
+from scheduler import BULK, OllamaScheduler
+from zip_stream import ZipStream
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+class BatchGenerator:
+    """
+    Enhances and renders a batch of resumes into a streamed ZIP archive.
+
+    At most `concurrency` items are in flight at once. Each one is
+    validated, enhanced through the Ollama scheduler at bulk priority and
+    rendered in the DOCX pool. Finished DOCX files are written to the
+    archive in completion order and sent right away, so memory use depends
+    on the concurrency rather than on the batch size. Items that fail are
+    recorded in manifest.json, the last file in the archive, and do not
+    stop the batch.
+    """
+
+    def __init__(self, ollama_client: OllamaClient, renderer: ArtifactRenderer,
+                 scheduler: OllamaScheduler, concurrency: int = 4, max_items: int = 1000):
+        self.ollama_client = ollama_client
+        self.renderer = renderer
+        self.scheduler = scheduler
+        self.concurrency = max(1, concurrency)
+        self.max_items = max_items
+
+    async def stream(self, items: AsyncIterator[Any], validate: Callable[[Any], Dict],
+                     use_cache: bool = True) -> AsyncIterator[bytes]:
+        """
+        Stream the ZIP archive for a batch of raw resume records.
+
+        Args:
+            items: Raw records, e.g. decoded JSON objects or JSONL lines
+            validate: Turns one raw record into resume data, raising on
+                invalid input
+            use_cache: Passed through to OllamaClient.enhance_resume
+
+        Yields:
+            bytes: Consecutive chunks of the archive
+        """
+        archive = ZipStream()
+        manifest: List[Dict] = []
+        pending: Set[asyncio.Task] = set()
+        started = time.perf_counter()
+        index = 0
+
+        def finished(task: asyncio.Task) -> bytes:
+            entry, content = task.result()
+            if content is None:
+                manifest.append(entry)
+                return b""
+            entry["file"] = self._file_name(entry)
+            manifest.append(entry)
+            # DOCX files are already deflated
+            return archive.add(entry["file"], content, zipfile.ZIP_STORED)
+
+        try:
+            async for raw in items:
+                if index >= self.max_items:
+                    manifest.append({"index": index, "status": "skipped",
+                                     "error": f"Batch limit of {self.max_items} items reached"})
+                    break
+                pending.add(asyncio.ensure_future(self._process(index, raw, validate, use_cache)))
+                index += 1
+                if len(pending) >= self.concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        chunk = finished(task)
+                        if chunk:
+                            yield chunk
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    chunk = finished(task)
+                    if chunk:
+                        yield chunk
+        finally:
+            # The client went away or the input broke; stop outstanding items
+            for task in pending:
+                task.cancel()
+
+        # A skipped entry stands for the rest of the input, not one item
+        failed = sum(1 for entry in manifest if entry["status"] == "failed")
+        logger.info(f"Batch of {index} resumes finished with {failed} failures "
+                    f"in {time.perf_counter() - started:.2f}s")
+        manifest.sort(key=lambda entry: entry["index"])
+        yield archive.add(MANIFEST_NAME, json.dumps({
+            "total": index,
+            "succeeded": index - failed,
+            "failed": failed,
+            "items": manifest
+        }, indent=2).encode("utf-8"))
+        yield archive.close()
+
+    async def _process(self, index: int, raw: Any, validate: Callable[[Any], Dict],
+                       use_cache: bool) -> Tuple[Dict, Any]:
+        entry: Dict = {"index": index}
+        try:
+            resume = validate(raw)
+        except Exception as e:
+            entry.update(status="failed", stage="validate", error=str(e))
+            return entry, None
+        entry["name"] = resume.get("name", "")
+
+        async with self.scheduler.slot(BULK, queue_limit=False):
+            enhanced = await self.ollama_client.enhance_resume(resume, use_cache=use_cache)
+        # enhance_resume hands the input back when the model call fails
+        entry["enhanced"] = enhanced is not resume
+
+        try:
+            content = await self.renderer.render_docx(enhanced)
+        except Exception as e:
+            logger.error(f"Error rendering batch item {index}: {str(e)}")
+            entry.update(status="failed", stage="render", error=str(e))
+            return entry, None
+
+        entry.update(status="ok", bytes=len(content))
+        return entry, content
+
+    def _file_name(self, entry: Dict) -> str:
+        # The index prefix keeps names unique and in input order
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", entry.get("name", "")).strip("_").lower() or "resume"
+        return f"{entry['index']:04d}_{slug[:60]}.docx"
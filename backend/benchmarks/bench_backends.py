@@ -0,0 +1,100 @@
+"""
+Show how OllamaClient spreads load over several Ollama servers and fails over.
+
+Several stub servers are started, the last one --slow-factor times slower
+than the others. Three phases of concurrent requests are run against them:
+
+1. all healthy: least-outstanding routing sends fewer requests to the slow one
+2. one server down: its requests are retried elsewhere, it is ejected after
+   OLLAMA_MAX_FAILURES failures, and no request fails
+3. recovered: a health check brings it back into rotation
+
+--failure-rate additionally makes every server fail that share of requests
+at random, which retries absorb as long as another server answers.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_backends --backends 3 --requests 300 --concurrency 24 --latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List
+
+from ollama_client import OllamaClient
+from benchmarks.stub_ollama import StubOllama
+
+
+async def run_phase(client: OllamaClient, stubs: List[StubOllama], name: str,
+                    total: int, concurrency: int) -> Dict:
+    before = [stub.request_count for stub in stubs]
+    retries_before = client.backends.retries
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            try:
+                # Distinct prompts so single-flight does not merge requests
+                await client._generate({"model": "stub", "prompt": f"{name} {i}"})
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(total)])
+    elapsed = time.perf_counter() - start
+    pool = client.backends.stats()
+    return {
+        "phase": name,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(total / elapsed, 1),
+        "errors": errors,
+        "retries": client.backends.retries - retries_before,
+        "received_per_backend": [stub.request_count - b for stub, b in zip(stubs, before)],
+        "available": [backend["available"] for backend in pool["backends"]]
+    }
+
+
+async def main(backends: int, total: int, concurrency: int, latency: float,
+               slow_factor: float, failure_rate: float) -> None:
+    stubs = [
+        StubOllama(latency=latency * (slow_factor if i == backends - 1 else 1),
+                   failure_rate=failure_rate, seed=i)
+        for i in range(backends)
+    ]
+    urls = [await stub.start() for stub in stubs]
+    client = OllamaClient(base_url=urls, model="stub", max_failures=3, eject_seconds=60, health_interval=0.5)
+    await client.start()
+    try:
+        reports = [await run_phase(client, stubs, "healthy", total, concurrency)]
+
+        stubs[0].down = True
+        reports.append(await run_phase(client, stubs, "one_down", total, concurrency))
+
+        stubs[0].down = False
+        # Let a health check reinstate it before its ejection runs out
+        await asyncio.sleep(client.backends.health_interval * 2)
+        reports.append(await run_phase(client, stubs, "recovered", total, concurrency))
+
+        print(json.dumps({"reports": reports, "pool": client.backends.stats()}, indent=2))
+    finally:
+        await client.close()
+        for stub in stubs:
+            await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-backend routing and failover")
+    parser.add_argument("--backends", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--slow-factor", type=float, default=4.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    # Injected failures are expected here; keep their logs out of the report
+    logging.disable(logging.ERROR)
+    asyncio.run(main(args.backends, args.requests, args.concurrency, args.latency,
+                     args.slow_factor, args.failure_rate))
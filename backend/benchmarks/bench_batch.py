@@ -0,0 +1,83 @@
+"""
+Measure batch generation throughput and show that memory stays flat as the
+batch grows: the archive is streamed and discarded chunk by chunk, and the
+Python heap peak is reported for each batch size.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_batch --sizes 25 100 400 --concurrency 4 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+import jinja2
+
+from batch import BatchGenerator
+from ollama_client import OllamaClient
+from renderer import ArtifactRenderer
+from scheduler import OllamaScheduler
+from benchmarks.stub_ollama import StubOllama
+
+RESUME = {
+    "title": "Software Engineer", "phone": "555-0100", "email": "bench@example.com",
+    "location": "Remote", "summary": "Builds web services",
+    "education": [{"institution": "State University", "degree": "BSc", "year_range": "2020",
+                   "cgpa": "3.6", "location": ""}],
+    "skills": ["Python", "SQL", "Docker"],
+    "projects": [{"name": "Tracker", "description": "Issue tracker"}],
+    "experience": [{"title": "Developer", "company": "Acme", "duration": "2 years",
+                    "description": "Built APIs"}],
+    "certifications": []
+}
+
+
+async def records(count: int):
+    for i in range(count):
+        # Distinct names so nothing is served from the enhancement cache
+        yield {**RESUME, "name": f"Bench User {i}"}
+
+
+async def run_batch(generator: BatchGenerator, size: int) -> dict:
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    archive_bytes = 0
+    async for chunk in generator.stream(records(size), dict):
+        archive_bytes += len(chunk)
+    elapsed = time.perf_counter() - start
+    return {
+        "items": size,
+        "seconds": round(elapsed, 3),
+        "items_per_sec": round(size / elapsed, 1),
+        "archive_mb": round(archive_bytes / 1e6, 2),
+        "heap_peak_mb": round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+    }
+
+
+async def main(sizes, concurrency: int, latency: float) -> None:
+    stub = StubOllama(latency=latency)
+    base_url = await stub.start()
+    client = OllamaClient(base_url=base_url, model="stub")
+    await client.start()
+    renderer = ArtifactRenderer(jinja2.Environment())
+    scheduler = OllamaScheduler(max_concurrency=concurrency, max_queue=1000, user_rate=0)
+    generator = BatchGenerator(client, renderer, scheduler, concurrency=concurrency, max_items=max(sizes))
+    tracemalloc.start()
+    try:
+        results = [await run_batch(generator, size) for size in sizes]
+        print(json.dumps({"concurrency": concurrency, "latency": latency, "runs": results}, indent=2))
+    finally:
+        tracemalloc.stop()
+        await renderer.close()
+        await client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch generation throughput and memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 400])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.concurrency, args.latency))
@@ -0,0 +1,63 @@
+"""
+Compare Ollama request throughput with a per-call ClientSession (the old
+behaviour) against the shared pooled session in OllamaClient.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_connection_pool --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from ollama_client import OllamaClient
+from benchmarks.stub_ollama import StubOllama
+
+
+async def _per_call_session(base_url: str) -> None:
+    async with aiohttp.ClientSession() as session:
+        async with session.post(
+            f"{base_url}/generate",
+            json={"model": "stub", "prompt": "hi", "stream": False}
+        ) as response:
+            await response.json()
+
+
+async def _run(label: str, call, total: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return {"mode": label, "requests": total, "seconds": round(elapsed, 3),
+            "requests_per_sec": round(total / elapsed, 1)}
+
+
+async def main(total: int, concurrency: int) -> None:
+    stub = StubOllama()
+    base_url = await stub.start()
+    client = OllamaClient(base_url=base_url, model="stub")
+    await client.start()
+    try:
+        results = [
+            await _run("per_call_session", lambda: _per_call_session(base_url), total, concurrency),
+            await _run("pooled_session", lambda: client.generate_resume({"name": "Bench"}), total, concurrency),
+        ]
+    finally:
+        await client.close()
+        await stub.stop()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ollama connection pool benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,130 @@
+"""
+DOCX rendering benchmarks.
+
+Reports single-thread docs/sec for small and large resumes, building a
+fresh python-docx Document per request (the old approach) versus the
+prebuilt template in DocxGenerator. It then renders many distinct resumes
+concurrently through ArtifactRenderer and checks that every document
+holds only its own data and that no files are left in the temp directory.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_docx --documents 200 --executor thread
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+
+import jinja2
+from docx import Document
+
+from docx_generator import DocxGenerator
+from renderer import ArtifactRenderer
+
+
+def sample_resume(index: int) -> dict:
+    return {
+        "name": f"Candidate {index}",
+        "title": "Software Engineer",
+        "phone": f"+1 555 {index:04d}",
+        "email": f"candidate{index}@example.com",
+        "location": "Remote",
+        "summary": f"Engineer number {index} with a focus on reliable backend systems.",
+        "education": [{"institution": "State University", "degree": "BSc Computer Science",
+                       "year_range": "2018-2022", "cgpa": "3.7", "location": ""}],
+        "skills": ["Python", "Go", "SQL", "Docker"],
+        "projects": [{"name": f"Project {index}", "description": "A service that does useful work."}],
+        "experience": [{"title": "Engineer", "company": "Acme", "duration": "2 years",
+                        "description": "Built and operated APIs."}],
+        "certifications": [{"title": "CKA", "issuer": "CNCF", "date": "2023"}]
+    }
+
+
+def large_resume(index: int) -> dict:
+    resume = sample_resume(index)
+    resume["skills"] = [f"Skill {i}" for i in range(50)]
+    resume["projects"] = [{"name": f"Project {i}", "description": "Designed, built and shipped. " * 5}
+                          for i in range(30)]
+    resume["experience"] = [{"title": "Engineer", "company": f"Company {i}", "duration": "1 year",
+                             "description": "Owned services end to end. " * 5} for i in range(20)]
+    resume["certifications"] = [{"title": f"Cert {i}", "issuer": "Issuer", "date": "2023"}
+                                for i in range(10)]
+    return resume
+
+
+def _per_request_document(generator: DocxGenerator, resume: dict) -> bytes:
+    document = Document()
+    generator.setup_styles(document)
+    generator.build(document, resume)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _docs_per_sec(render, resume: dict, seconds: float = 2.0) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        render(resume)
+        count += 1
+    return round(count / (time.perf_counter() - start), 1)
+
+
+def throughput() -> list:
+    generator = DocxGenerator()
+    results = []
+    for size, resume in (("small", sample_resume(0)), ("large", large_resume(0))):
+        results.append({
+            "resume": size,
+            "per_request_document_docs_per_sec": _docs_per_sec(
+                lambda r: _per_request_document(generator, r), resume),
+            "prebuilt_template_docs_per_sec": _docs_per_sec(generator.render, resume)
+        })
+    return results
+
+
+async def concurrency_check(documents: int, executor: str, workers: int) -> dict:
+    temp_dir = tempfile.gettempdir()
+    before = set(os.listdir(temp_dir))
+    renderer = ArtifactRenderer(jinja2.Environment(loader=jinja2.FileSystemLoader("templates")),
+                                executor=executor, workers=workers)
+    try:
+        start = time.perf_counter()
+        contents = await asyncio.gather(*(renderer.render_docx(sample_resume(i)) for i in range(documents)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await renderer.close()
+
+    for i, content in enumerate(contents):
+        text = "\n".join(p.text for p in Document(io.BytesIO(content)).paragraphs)
+        assert f"Candidate {i}\n" in text, f"document {i} is missing its own name"
+        assert text.count("Candidate ") == 1, f"document {i} contains another resume's data"
+    leftover = set(os.listdir(temp_dir)) - before
+
+    return {
+        "executor": executor,
+        "documents": documents,
+        "seconds": round(elapsed, 3),
+        "docs_per_sec": round(documents / elapsed, 1),
+        "isolated": True,
+        "leftover_temp_files": len(leftover)
+    }
+
+
+async def main(documents: int, executor: str, workers: int) -> None:
+    print(json.dumps({
+        "throughput": throughput(),
+        "concurrent": await concurrency_check(documents, executor, workers)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DOCX rendering benchmarks")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.documents, args.executor, args.workers))
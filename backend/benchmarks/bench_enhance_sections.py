@@ -0,0 +1,110 @@
+"""
+Compare whole-resume enhancement with per-section enhancement.
+
+The stub model takes --seconds-per-token for every word it writes, so one
+long answer takes as long as all section answers back to back, while the
+section prompts run concurrently. With --break-section, that section's
+answer is malformed: whole mode then loses the entire enhancement, while
+sections mode keeps every other section.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_enhance_sections --seconds-per-token 0.002 --break-section projects
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Dict, Optional
+
+from ollama_client import OllamaClient
+from benchmarks.stub_ollama import StubOllama
+
+RESUME = {
+    "name": "Bench User", "title": "Software Engineer", "phone": "555-0100",
+    "email": "bench@example.com", "location": "Remote",
+    "summary": "Web developer interest",
+    "education": [{"institution": "State University", "degree": "BSc", "year_range": "2020",
+                   "cgpa": "3.6", "location": ""}],
+    "skills": ["HTML", "CSS", "JavaScript"],
+    "projects": [{"name": "Tracker", "description": "Issue tracker"},
+                 {"name": "Shop", "description": "Online store"}],
+    "experience": [{"title": "Developer", "company": "Acme", "duration": "2 years",
+                    "description": "Built APIs"}],
+    "certifications": [{"title": "AWS Developer", "issuer": "Amazon", "date": "2023"}]
+}
+
+FILLER = " ".join(["with measurable impact across teams and products"] * 6)
+
+ENHANCED = {
+    "summary": f"Detail-oriented software engineer {FILLER}.",
+    "education": RESUME["education"],
+    "skills": RESUME["skills"] + ["React", "Node.js", "SQL", "Testing", "Communication"],
+    "projects": [{"name": p["name"], "description": f"{p['description']} {FILLER}"} for p in RESUME["projects"]],
+    "experience": [{**e, "description": f"{e['description']} {FILLER}"} for e in RESUME["experience"]],
+    "certifications": RESUME["certifications"]
+}
+
+
+def make_responder(broken: Optional[str]):
+    def respond(payload: Dict) -> str:
+        match = re.search(r'Enhance the "(\w+)" section', payload["prompt"])
+        if match:
+            section = match.group(1)
+            answer = json.dumps({section: ENHANCED[section]})
+            return answer[:-2] if section == broken else answer
+        # Whole-resume prompt: one object holding every section
+        answer = json.dumps({**RESUME, **ENHANCED})
+        return answer[:-2] if broken else answer
+    return respond
+
+
+async def run(mode: str, base_url: str, rounds: int) -> Dict:
+    client = OllamaClient(base_url=base_url, model="stub", enhance_mode=mode)
+    await client.start()
+    try:
+        latencies, enhanced_fields = [], 0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = await client.enhance_resume(dict(RESUME), use_cache=False)
+            latencies.append(time.perf_counter() - start)
+            enhanced_fields = sum(result.get(field) != RESUME.get(field) for field in ENHANCED)
+        report = {
+            "mode": mode,
+            "seconds_avg": round(sum(latencies) / len(latencies), 3),
+            "sections_enhanced": enhanced_fields
+        }
+        if mode == "sections":
+            report["per_section"] = {
+                section: {
+                    "enhanced": stats["enhanced"],
+                    "failed": stats["failed"],
+                    "seconds_avg": round(stats["seconds_avg"], 3)
+                }
+                for section, stats in client.section_stats.stats().items()
+            }
+        return report
+    finally:
+        await client.close()
+
+
+async def main(seconds_per_token: float, rounds: int, broken: Optional[str]) -> None:
+    stub = StubOllama(respond=make_responder(broken), seconds_per_token=seconds_per_token)
+    base_url = await stub.start()
+    try:
+        reports = [await run(mode, base_url, rounds) for mode in ("whole", "sections")]
+        print(json.dumps(reports, indent=2))
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Whole vs per-section enhancement")
+    parser.add_argument("--seconds-per-token", type=float, default=0.002)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--break-section", choices=sorted(ENHANCED), default=None)
+    args = parser.parse_args()
+    # Failed sections are expected here; keep their error logs out of the report
+    logging.disable(logging.ERROR)
+    asyncio.run(main(args.seconds_per_token, args.rounds, args.break_section))
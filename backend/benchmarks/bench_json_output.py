@@ -0,0 +1,91 @@
+"""
+Count how many enhancement generations are lost to malformed JSON.
+
+The stub model wraps a share of its answers in prose or code fences, and
+truncates a few, unless the request carries Ollama's "format" parameter, in
+which case it always answers clean JSON the way constrained decoding does.
+Each ENHANCE_FORMAT mode is run against it; "none" shows how many answers
+the tolerant extractor recovers that plain json.loads would have thrown
+away.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_json_output --requests 200 --noisy 0.3 --truncated 0.03
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+from typing import Dict
+
+from ollama_client import OllamaClient
+from benchmarks.bench_enhance_sections import ENHANCED, RESUME
+from benchmarks.stub_ollama import StubOllama
+
+WRAPPERS = [
+    "Here is the enhanced resume:\n\n{answer}\n\nLet me know if you need any changes!",
+    "```json\n{answer}\n```",
+    "Sure! I expanded the summary and projects.\n```\n{answer}\n```",
+    "{answer}\n\nNote: I added a few related skills.",
+]
+
+
+def make_responder(noisy: float, truncated: float, seed: int):
+    rng = random.Random(seed)
+
+    def respond(payload: Dict) -> str:
+        answer = json.dumps({**RESUME, **ENHANCED})
+        if "format" in payload:
+            return answer
+        roll = rng.random()
+        if roll < truncated:
+            return answer[:len(answer) // 2]
+        if roll < truncated + noisy:
+            return rng.choice(WRAPPERS).format(answer=answer)
+        return answer
+    return respond
+
+
+async def run(mode: str, base_url: str, requests: int) -> Dict:
+    client = OllamaClient(base_url=base_url, model="stub", enhance_format=mode)
+    await client.start()
+    try:
+        for i in range(requests):
+            # Distinct names so single-flight does not merge requests
+            await client.enhance_resume({**RESUME, "name": f"Bench User {i}"}, use_cache=False)
+        counts = client.parse_stats.stats()["resume"]
+        return {
+            "format": mode,
+            "parsed": counts["parsed"],
+            "recovered": counts["recovered"],
+            "failed": counts["failed"],
+            "wasted_without_extractor": counts["recovered"] + counts["failed"],
+            "wasted": counts["failed"]
+        }
+    finally:
+        await client.close()
+
+
+async def main(requests: int, noisy: float, truncated: float, seed: int) -> None:
+    reports = []
+    for mode in ("none", "json", "schema"):
+        # A fresh stub per mode so every mode sees the same noise
+        stub = StubOllama(respond=make_responder(noisy, truncated, seed))
+        base_url = await stub.start()
+        try:
+            reports.append(await run(mode, base_url, requests))
+        finally:
+            await stub.stop()
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Malformed JSON answers and recovery")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--noisy", type=float, default=0.3)
+    parser.add_argument("--truncated", type=float, default=0.03)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    # Failed parses are expected here; keep their logs out of the report
+    logging.disable(logging.ERROR)
+    asyncio.run(main(args.requests, args.noisy, args.truncated, args.seed))
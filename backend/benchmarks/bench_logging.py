@@ -0,0 +1,127 @@
+"""
+Measure how long logging stalls the event loop per enhancement request.
+
+"before" reproduces the old setup: a JSON StreamHandler writing on the
+calling thread and three resume bodies serialized with
+json.dumps(indent=2) per completion, including one whose record was then
+discarded. "after" uses configure_logging(): records go through a queue to
+a writer thread and LogPayload serializes them only there.
+
+The sink can be slowed down with --sink-delay (seconds per write) to mimic
+a congested pipe or log driver, which is when writing on the event loop
+hurts most.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_logging --requests 2000 --sink-delay 0.0002
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from pythonjsonlogger import jsonlogger
+
+from logging_setup import LogPayload, configure_logging, logging_stats, stop_logging
+from benchmarks.bench_enhance_sections import ENHANCED, RESUME
+
+
+class SlowFile:
+    """File wrapper that takes delay seconds per write, like a congested pipe."""
+
+    def __init__(self, path: str, delay: float):
+        self.file = open(path, "w")
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return self.file.write(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _summary(stalls: List[float], total: float) -> Dict:
+    stalls = sorted(stalls)
+    return {
+        "stall_ms_avg": round(sum(stalls) / len(stalls) * 1000, 4),
+        "stall_ms_p99": round(stalls[int(len(stalls) * 0.99)] * 1000, 4),
+        "stall_ms_max": round(stalls[-1] * 1000, 4),
+        "seconds_until_written": round(total, 3)
+    }
+
+
+def run_before(requests: int, sink: SlowFile) -> Dict:
+    app_logger = logging.getLogger("bench.before.main")
+    client_logger = logging.getLogger("bench.before.client")  # No handler, as before
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(message)s'))
+    app_logger.addHandler(handler)
+    app_logger.setLevel(logging.INFO)
+    app_logger.propagate = False
+    client_logger.propagate = False
+    enhanced = {**RESUME, **ENHANCED}
+
+    stalls = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        began = time.perf_counter()
+        app_logger.info(f"Original resume data: {json.dumps(RESUME, indent=2)}")
+        client_logger.info(f"Enhanced resume data: {json.dumps(enhanced, indent=2)}")
+        app_logger.info(f"Enhanced resume data: {json.dumps(enhanced, indent=2)}")
+        stalls.append(time.perf_counter() - began)
+    total = time.perf_counter() - start
+    app_logger.removeHandler(handler)
+    return {"setup": "before", **_summary(stalls, total)}
+
+
+def run_after(requests: int, sink: SlowFile, sample_rate: float, max_chars: int) -> Dict:
+    configure_logging(queue_size=requests * 3, sample_rate=sample_rate, max_chars=max_chars, stream=sink)
+    app_logger = logging.getLogger("bench.after.main")
+    client_logger = logging.getLogger("bench.after.client")
+    enhanced = {**RESUME, **ENHANCED}
+
+    stalls = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        began = time.perf_counter()
+        app_logger.info("Original resume data: %s", LogPayload(RESUME))
+        client_logger.debug("Parsed enhanced resume data: %s", LogPayload(enhanced))
+        app_logger.info("Enhanced resume data: %s", LogPayload(enhanced))
+        stalls.append(time.perf_counter() - began)
+    stats = logging_stats()
+    # Wait for the writer thread so both setups are timed until written
+    stop_logging()
+    total = time.perf_counter() - start
+    return {"setup": "after", **_summary(stalls, total), **stats}
+
+
+def main(requests: int, sink_delay: float, sample_rate: float, max_chars: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        reports = []
+        for name in ("before", "after"):
+            path = os.path.join(directory, f"{name}.log")
+            sink = SlowFile(path, sink_delay)
+            if name == "before":
+                reports.append(run_before(requests, sink))
+            else:
+                reports.append(run_after(requests, sink, sample_rate, max_chars))
+            sink.close()
+            reports[-1]["log_mb"] = round(os.path.getsize(path) / 1e6, 2)
+        print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event-loop stall caused by logging")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--sink-delay", type=float, default=0.0)
+    parser.add_argument("--sample-rate", type=float, default=1.0)
+    parser.add_argument("--max-chars", type=int, default=4096)
+    args = parser.parse_args()
+    main(args.requests, args.sink_delay, args.sample_rate, args.max_chars)
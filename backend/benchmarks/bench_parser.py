@@ -0,0 +1,222 @@
+"""
+Compare the single-pass ResumeParser with the legacy Markdown -> HTML ->
+BeautifulSoup parser: every document in a corpus of hand-written edge cases
+and seeded, randomly styled resumes must parse to the same result (Experience
+aside, which the legacy parser dropped), then both are timed.
+
+The same corpus is also fed to IncrementalResumeParser in model-sized token
+fragments. It must produce the buffered result and emit every field exactly
+once. Its throughput is reported next to that of a consumer that appends
+each token to a buffer and parses the joined text once the stream ends; the
+parsing work is the same, so the gap is the cost of one feed() call per
+token, paid for fields that arrive while the model is still generating.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_parser --documents 500 --repeat 3
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+from resume_parser import IncrementalResumeParser, ResumeParser
+from benchmarks.legacy_resume_parser import LegacyResumeParser
+
+EDGE_CASES = [
+    "",
+    "# Only A Name",
+    "Jane Doe\n========\nEngineer\n--------\n\n### Summary\nLine one\nline two\n\nSecond paragraph",
+    "#NoSpace #\n##  Title ##\n### Skills ###\n* a\n+ b\n- c",
+    "### Skills\n- a\n    - nested one\n    - nested two\n    more\n- b",
+    "### Skills\n- a\n\n    - loose nested\n\n- b\n\n    indented paragraph\n\nafter the list",
+    "### Skills\n- a\n  - two spaces is not nested\n- b\ncontinued lazily",
+    "### Skills\n1. ordered lists\n2. are skipped\n\n- but this bullet joins the list",
+    "### Skills\nIntro paragraph\n- not a list without a blank line\n\n- real item",
+    "### Summary\n**Bold** _italic_ snake_case `co*de*` [link](http://x) ![img](y) <http://a.b>\n"
+    "a &amp; b &copy; <b>tag</b> \\*escaped\\* 2 &lt; 3 a*b*c",
+    "### Summary\nHard break  \nnext line\n\n---\n\n### Skills\n- after a rule",
+    "### Summary\n> quoted text\nlazy quote\n\nreal summary\n\n    indented code\n\nend",
+    "### Skills\n- item\n> quote in item\n\n### Projects\n- Name: Description with: colons",
+    "### Skills\n- first\n\n### Skills\n- duplicate sections use the first one",
+    "### Education\n- MIT - BSc CS (2016-2020)\n- Stanford - MSc (2022)\n- No dash entry\n"
+    "- A - B - C (2019)\n\n### Certifications\n- AWS - Amazon (2023)\n- No Date - Issuer\n",
+    "```markdown\n# Fenced Name\n## Fenced Title\n### Skills\n- inside a fence\n```",
+    "## Title before name\n# Name after\n### Summary\n#### Sub heading\nStill summary\n### Unknown\ntext",
+    "### **Skills**\n- bold heading\n### Summary:\nnot a known heading",
+]
+
+SECTIONS = ["Summary", "Education", "Skills", "Projects", "Certifications", "Languages", "Experience"]
+WORDS = ("build ship scale design test deploy data service cloud python api team "
+         "lead platform model stream cache queue metric latency user").split()
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _styled(rng: random.Random, text: str) -> str:
+    style = rng.random()
+    if style < 0.1:
+        return f"**{text}**"
+    if style < 0.15:
+        return f"*{text}*"
+    if style < 0.2:
+        return f"[{text}](https://example.com)"
+    if style < 0.23:
+        return f"`{text}`"
+    return text
+
+
+def _bullets(rng: random.Random, items: List[str]) -> str:
+    marker = rng.choice("-*+")
+    loose = rng.random() < 0.15
+    return ("\n\n" if loose else "\n").join(f"{marker} {item}" for item in items)
+
+
+def generated_resume(rng: random.Random) -> str:
+    name = _phrase(rng, 2).title()
+    lines = []
+    if rng.random() < 0.1:
+        lines.append(f"{name}\n{'=' * len(name)}")
+    else:
+        lines.append(f"# {name}")
+    lines.append(f"## {_phrase(rng, 2).title()}")
+    for section in rng.sample(SECTIONS, rng.randint(3, len(SECTIONS))):
+        heading = f"### {section}" + (" ###" if rng.random() < 0.05 else "")
+        if section == "Summary":
+            paragraphs = [_styled(rng, _phrase(rng, rng.randint(5, 20))) for _ in range(rng.randint(1, 3))]
+            body = "\n\n".join(paragraphs)
+        elif section == "Education":
+            body = _bullets(rng, [
+                f"{_phrase(rng, 2).title()} University - BSc {_phrase(rng, 1)} "
+                f"({rng.randint(2000, 2020)}-{rng.randint(2021, 2025)})"
+                for _ in range(rng.randint(1, 3))
+            ])
+        elif section == "Projects":
+            body = _bullets(rng, [
+                f"{_styled(rng, _phrase(rng, 2).title())}: {_phrase(rng, rng.randint(4, 12))}"
+                for _ in range(rng.randint(1, 4))
+            ])
+        elif section == "Certifications":
+            body = _bullets(rng, [
+                f"{_phrase(rng, 2).title()} - {_phrase(rng, 1).title()} ({rng.randint(2010, 2025)})"
+                for _ in range(rng.randint(1, 3))
+            ])
+        elif section == "Experience":
+            body = _bullets(rng, [
+                f"{_phrase(rng, 2).title()} at {_phrase(rng, 1).title()} "
+                f"({rng.randint(2010, 2020)}-{rng.randint(2021, 2025)}): {_phrase(rng, 8)}"
+                for _ in range(rng.randint(1, 3))
+            ])
+        else:
+            items = [_styled(rng, _phrase(rng, rng.randint(1, 3))) for _ in range(rng.randint(2, 12))]
+            if rng.random() < 0.1:
+                items[0] += "\n    - " + _phrase(rng, 2)
+            body = _bullets(rng, items)
+        lines.append(f"{heading}\n{'' if rng.random() < 0.5 else chr(10)}{body}")
+        if rng.random() < 0.05:
+            lines.append("---")
+    return "\n\n".join(lines) + "\n"
+
+
+def _comparable(result: Dict) -> Dict:
+    # The legacy parser had no Experience support
+    return {key: value for key, value in result.items() if key != "experience"}
+
+
+def tokenize(rng: random.Random, document: str) -> List[str]:
+    # Model tokens are a few characters long and ignore line boundaries
+    tokens, position = [], 0
+    while position < len(document):
+        size = rng.randint(1, 6)
+        tokens.append(document[position:position + size])
+        position += size
+    return tokens
+
+
+def parse_incrementally(parser: ResumeParser, tokens: List[str]) -> Dict:
+    incremental = IncrementalResumeParser(parser)
+    fields = []
+    for token in tokens:
+        fields.extend(incremental.feed(token))
+    fields.extend(incremental.close())
+    assert len(fields) == len({key for key, _ in fields}), "a field was emitted twice"
+    assert dict(fields) == incremental.result
+    return incremental.resume()
+
+
+def stream_incrementally(parser: ResumeParser, tokens: List[str]) -> Dict:
+    # What a streaming consumer does, without the checks of parse_incrementally
+    incremental = IncrementalResumeParser(parser)
+    for token in tokens:
+        incremental.feed(token)
+    incremental.close()
+    return incremental.resume()
+
+
+def stream_buffered(parser: ResumeParser, tokens: List[str]) -> Dict:
+    # The consumer incremental parsing replaces: collect the stream, parse at the end
+    buffer = []
+    for token in tokens:
+        buffer.append(token)
+    return parser.parse_markdown_to_json("".join(buffer))
+
+
+def _time(parse, documents: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in documents:
+            parse(document)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(documents: int, repeat: int, seed: int) -> None:
+    rng = random.Random(seed)
+    corpus = EDGE_CASES + [generated_resume(rng) for _ in range(documents)]
+    parser, legacy = ResumeParser(), LegacyResumeParser()
+
+    mismatches = []
+    for index, document in enumerate(corpus):
+        expected = legacy.parse_markdown_to_json(document)
+        actual = _comparable(parser.parse_markdown_to_json(document))
+        if actual != expected:
+            mismatches.append({"index": index, "markdown": document, "legacy": expected, "single_pass": actual})
+
+    token_streams = [tokenize(rng, document) for document in corpus]
+    for index, tokens in enumerate(token_streams):
+        expected = parser.parse_markdown_to_json(corpus[index])
+        actual = parse_incrementally(parser, tokens)
+        if actual != expected:
+            mismatches.append({"index": index, "markdown": corpus[index], "buffered": expected, "incremental": actual})
+
+    legacy_seconds = _time(legacy.parse_markdown_to_json, corpus, repeat)
+    single_pass_seconds = _time(parser.parse_markdown_to_json, corpus, repeat)
+    buffered_seconds = _time(lambda tokens: stream_buffered(parser, tokens), token_streams, repeat)
+    incremental_seconds = _time(lambda tokens: stream_incrementally(parser, tokens), token_streams, repeat)
+    report = {
+        "documents": len(corpus),
+        "mismatches": len(mismatches),
+        "legacy_docs_per_sec": round(len(corpus) / legacy_seconds, 1),
+        "single_pass_docs_per_sec": round(len(corpus) / single_pass_seconds, 1),
+        "speedup": round(legacy_seconds / single_pass_seconds, 1),
+        "tokens": sum(len(tokens) for tokens in token_streams),
+        "buffered_token_docs_per_sec": round(len(corpus) / buffered_seconds, 1),
+        "incremental_token_docs_per_sec": round(len(corpus) / incremental_seconds, 1),
+        "incremental_vs_buffered": round(buffered_seconds / incremental_seconds, 3)
+    }
+    print(json.dumps(report, indent=2))
+    for mismatch in mismatches[:3]:
+        print(json.dumps(mismatch, indent=2))
+    assert not mismatches, "parser outputs differ"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume parser parity and throughput")
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.documents, args.repeat, args.seed)
@@ -0,0 +1,54 @@
+"""
+Show that concurrent identical Ollama calls are coalesced into one upstream
+request, and that cancelling one caller does not affect the others.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_single_flight --callers 20 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from ollama_client import OllamaClient
+from benchmarks.stub_ollama import StubOllama
+
+RESUME = {"name": "Bench User", "summary": "Web developer interest", "skills": ["HTML"]}
+
+
+async def main(callers: int, latency: float) -> None:
+    stub = StubOllama(latency=latency)
+    base_url = await stub.start()
+    client = OllamaClient(base_url=base_url, model="stub")
+    await client.start()
+    try:
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(client.enhance_resume(dict(RESUME))) for _ in range(callers)]
+        await asyncio.sleep(latency / 2)
+        # One impatient caller gives up; the rest must still get the result
+        tasks[0].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        elapsed = time.perf_counter() - start
+
+        completed = [r for r in results if isinstance(r, dict)]
+        report = {
+            "callers": callers,
+            "cancelled": sum(isinstance(r, asyncio.CancelledError) for r in results),
+            "completed": len(completed),
+            "upstream_requests": stub.request_count,
+            "seconds": round(elapsed, 3)
+        }
+        print(json.dumps(report, indent=2))
+        assert stub.request_count == 1, "identical calls were not coalesced"
+        assert len(completed) == callers - 1
+    finally:
+        await client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-flight coalescing check")
+    parser.add_argument("--callers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.callers, args.latency))
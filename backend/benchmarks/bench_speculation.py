@@ -0,0 +1,120 @@
+"""
+Measure how much end-of-flow waiting speculative section enhancement saves.
+
+Each simulated user answers the chat questions with --think seconds between
+answers. Once the inputs of a section are final, it is enhanced in the
+background; the final enhancement then only waits for the leftovers. Every
+run is repeated with speculation off for comparison, and --change-step
+makes users re-send that step's answer differently to exercise invalidation.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_speculation --users 4 --think 0.2 --seconds-per-token 0.003
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import Dict, List, Optional
+
+from enhancement_cache import EnhancementCache
+from main import CONVERSATION_FLOW, SECTION_READY_STEP, _apply_answer
+from ollama_client import OllamaClient
+from scheduler import OllamaScheduler
+from speculation import SpeculativeEnhancer
+from benchmarks.stub_ollama import StubOllama
+
+ANSWERS = [
+    "Bench User", "Software Engineer", "555-0100", "bench@example.com", "Remote",
+    "Web developer interested in distributed systems",
+    "State University", "BSc Computer Science", "2020", "3.6",
+    "Python, SQL, Docker",
+    "Tracker - Issue tracker for small teams",
+    "Developer, Acme, 2 years, Built APIs",
+    "AWS Developer, Amazon, 2023"
+]
+
+FILLER = " ".join(["with measurable impact across teams and products"] * 6)
+
+
+def respond(payload: Dict) -> str:
+    section = re.search(r'Enhance the "(\w+)" section', payload["prompt"]).group(1)
+    value = json.loads(payload["prompt"].split("Resume data:\n", 1)[1].rsplit("\n\n", 1)[0])[section]
+    if section == "summary":
+        value = f"{value} {FILLER}"
+    elif section == "skills":
+        value = value + FILLER.split()
+    elif section in ("projects", "experience"):
+        value = [{**entry, "description": f"{entry['description']} {FILLER}"} for entry in value]
+    return json.dumps({section: value})
+
+
+def ready_sections(step: int) -> List[str]:
+    # Sections whose inputs are final once this step is answered
+    return [section for section, ready_step in SECTION_READY_STEP.items() if step >= ready_step]
+
+
+async def user(index: int, speculator: SpeculativeEnhancer, client: OllamaClient,
+               think: float, change_step: Optional[int]) -> float:
+    session_id = f"user-{index}"
+    resume: Dict = {}
+    for step, entry in enumerate(CONVERSATION_FLOW):
+        # Distinct names so nothing is served from another user's results
+        answer = f"{ANSWERS[step]} {index}" if step == 0 else ANSWERS[step]
+        _apply_answer(resume, entry["field"], answer)
+        if step == change_step:
+            speculator.speculate(session_id, resume, ready_sections(step))
+            await asyncio.sleep(think / 2)
+            _apply_answer(resume, entry["field"], f"{answer} (revised)")
+        if step < len(CONVERSATION_FLOW) - 1:
+            speculator.speculate(session_id, resume, ready_sections(step))
+            await asyncio.sleep(think)
+
+    start = time.perf_counter()
+    with speculator.final(session_id, resume):
+        await client.enhance_resume(resume)
+    return time.perf_counter() - start
+
+
+async def run(base_url: str, speculative: bool, users: int, think: float,
+              change_step: Optional[int]) -> Dict:
+    # Speculative results reach the final step through the section cache
+    client = OllamaClient(base_url=base_url, model="stub", cache=EnhancementCache(), enhance_mode="sections")
+    await client.start()
+    try:
+        speculator = SpeculativeEnhancer(client, OllamaScheduler(max_concurrency=8), enabled=speculative)
+        latencies: List[float] = await asyncio.gather(*[
+            user(index, speculator, client, think, change_step) for index in range(users)
+        ])
+        stats = speculator.stats()
+        return {
+            "speculative": speculative,
+            "final_seconds_avg": round(sum(latencies) / len(latencies), 3),
+            "final_seconds_max": round(max(latencies), 3),
+            "hit_rate": round(stats["hit_rate"], 3),
+            "started": stats["started"],
+            "invalidated": stats["invalidated"],
+            "saved_seconds_avg": round(stats["saved_seconds_avg"], 3)
+        }
+    finally:
+        await client.close()
+
+
+async def main(users: int, think: float, seconds_per_token: float, change_step: Optional[int]) -> None:
+    stub = StubOllama(respond=respond, seconds_per_token=seconds_per_token)
+    base_url = await stub.start()
+    try:
+        reports = [await run(base_url, speculative, users, think, change_step) for speculative in (False, True)]
+        print(json.dumps(reports, indent=2))
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speculative section enhancement")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--think", type=float, default=0.2)
+    parser.add_argument("--seconds-per-token", type=float, default=0.003)
+    parser.add_argument("--change-step", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.think, args.seconds_per_token, args.change_step))
@@ -0,0 +1,314 @@
+"""
+End-to-end load test plus parser and DOCX micro-benchmarks, reported as JSON.
+
+The API runs under uvicorn against an in-process stub Ollama server whose
+latency, token rate, streaming and malformed-answer share are set from the
+command line. Each simulated user starts a session, answers every
+CONVERSATION_FLOW question through /api/chat (the last answer triggers
+enhancement, through /api/chat/stream with --stream), then fetches the
+preview and the DOCX. With --bulk, all answers go in one request to
+/api/session/{id}/answers instead. The micro-benchmarks time
+ResumeParser.parse_markdown_to_json and DocxGenerator.generate_resume.
+
+Every measurement reports p50/p95/p99 latency in seconds and operations per
+second. --output saves the report, and --baseline compares it with a saved
+one, so a change can be checked for regressions.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_suite --users 50 --concurrency 16 --output before.json
+    python -m benchmarks.bench_suite --users 50 --concurrency 16 --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from docx_generator import DocxGenerator
+from resume_parser import ResumeParser
+from benchmarks.bench_docx import large_resume, sample_resume
+from benchmarks.bench_enhance_sections import make_responder
+from benchmarks.bench_parser import generated_resume
+from benchmarks.bench_workers import ANSWERS
+from benchmarks.stub_ollama import StubOllama
+
+# CONVERSATION_FLOW field of each of ANSWERS. main is not imported here
+# because importing it configures logging for the whole benchmark process.
+FIELDS = ["name", "title", "phone", "email", "location", "summary", "education", "education_degree",
+          "education_year", "education_cgpa", "skills", "projects", "experience", "certifications"]
+
+# Step names reported for the end-to-end flow, in request order
+STEPS = ("session", "chat", "chat_final", "answers", "preview", "download")
+
+
+def summarize(latencies: List[float], seconds: Optional[float] = None) -> Dict:
+    """
+    Percentiles of a list of latencies.
+
+    Args:
+        latencies: Seconds per operation
+        seconds: Wall time the operations took together; their sum if not
+            given, i.e. when they ran one after another
+
+    Returns:
+        Dict: count, p50/p95/p99/max in seconds and operations per second
+    """
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+
+    def percentile(q: float) -> float:
+        return round(ordered[min(int(len(ordered) * q), len(ordered) - 1)], 6)
+
+    elapsed = seconds if seconds is not None else sum(ordered)
+    return {
+        "count": len(ordered),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1], 6),
+        "per_sec": round(len(ordered) / elapsed, 1) if elapsed else 0.0
+    }
+
+
+def _time_each(operation: Callable, inputs: List, repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            operation(item)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def micro_benchmarks(documents: int, repeat: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    corpus = [generated_resume(rng) for _ in range(documents)]
+    parser = ResumeParser()
+
+    generator = DocxGenerator()
+    resumes = [sample_resume(i) if i % 4 else large_resume(i) for i in range(documents)]
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, "resume.docx")
+        docx_latencies = _time_each(lambda resume: generator.generate_resume(resume, output_path),
+                                    resumes, repeat)
+    return {
+        "parse_markdown_to_json": summarize(_time_each(parser.parse_markdown_to_json, corpus, repeat)),
+        "docx_generate_resume": summarize(docx_latencies)
+    }
+
+
+class Recorder:
+    """Latencies per flow step, plus requests that failed."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {step: [] for step in STEPS + ("user_flow",)}
+        self.errors: Dict[str, int] = {}
+
+    async def request(self, step: str, send) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await send()
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            key = f"{step}: {e.response.status_code}" if isinstance(e, httpx.HTTPStatusError) else f"{step}: {type(e).__name__}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+            return None
+        self.latencies[step].append(time.perf_counter() - start)
+        return response
+
+
+async def _stream_chat(client: httpx.AsyncClient, session_id: str, message: str) -> httpx.Response:
+    # Read the whole event stream so the latency covers the enhancement
+    async with client.stream("POST", "/api/chat/stream",
+                             json={"session_id": session_id, "message": message}) as response:
+        async for _ in response.aiter_lines():
+            pass
+    return response
+
+
+async def _user(client: httpx.AsyncClient, recorder: Recorder, index: int, stream: bool, bulk: bool) -> None:
+    start = time.perf_counter()
+    response = await recorder.request("session", lambda: client.post("/api/session", json={"user_id": f"user-{index}"}))
+    if response is None:
+        return
+    session_id = response.json()["session_id"]
+    # Distinct answers so the enhancement cache and single-flight do not merge users
+    answers = [f"{ANSWERS[0]} {index}"] + ANSWERS[1:]
+    if bulk:
+        send = lambda: client.post(f"/api/session/{session_id}/answers",
+                                   json={"answers": dict(zip(FIELDS, answers))})
+        if await recorder.request("answers", send) is None:
+            return
+        answers = []
+    for step, answer in enumerate(answers):
+        if step < len(answers) - 1:
+            send = lambda answer=answer: client.post("/api/chat", json={"session_id": session_id, "message": answer})
+            name = "chat"
+        elif stream:
+            send = lambda answer=answer: _stream_chat(client, session_id, answer)
+            name = "chat_final"
+        else:
+            send = lambda answer=answer: client.post("/api/chat", json={"session_id": session_id, "message": answer})
+            name = "chat_final"
+        if await recorder.request(name, send) is None:
+            return
+    if await recorder.request("preview", lambda: client.get(f"/api/resume_preview/{session_id}")) is None:
+        return
+    if await recorder.request("download", lambda: client.get(f"/api/download/{session_id}")) is None:
+        return
+    recorder.latencies["user_flow"].append(time.perf_counter() - start)
+
+
+async def _wait_ready(url: str) -> None:
+    # /api/ready answers 200 once the model has been loaded on the stub
+    async with httpx.AsyncClient() as client:
+        for _ in range(300):
+            try:
+                if (await client.get(f"{url}/api/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("API server did not become ready")
+
+
+async def end_to_end(args: argparse.Namespace, ollama_url: str) -> Dict:
+    env = {
+        **os.environ,
+        "OLLAMA_BASE_URL": ollama_url,
+        "OLLAMA_MODEL": "stub",
+        "ENHANCE_MODE": args.enhance_mode,
+        "ENHANCE_FORMAT": args.enhance_format,
+        "LOG_LEVEL": "WARNING",
+        # Admission control would turn the load test into a test of its limits
+        "OLLAMA_MAX_CONCURRENCY": str(args.ollama_concurrency),
+        "OLLAMA_MAX_QUEUE": "100000",
+        "USER_RATE_BURST": "1000"
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{args.port}"
+    recorder = Recorder()
+    try:
+        await _wait_ready(url)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=300) as client:
+            async def one(i):
+                async with semaphore:
+                    await _user(client, recorder, i, args.stream, args.bulk)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.users)))
+            elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    requests = sum(len(latencies) for step, latencies in recorder.latencies.items() if step != "user_flow")
+    return {
+        "users": args.users,
+        "completed_users": len(recorder.latencies["user_flow"]),
+        "seconds": round(elapsed, 3),
+        "requests": requests,
+        "requests_per_sec": round(requests / elapsed, 1),
+        "errors": recorder.errors,
+        "steps": {step: summarize(latencies, elapsed) for step, latencies in recorder.latencies.items()}
+    }
+
+
+def compare(report: Dict, baseline: Dict) -> Dict:
+    """
+    Ratio of each latency percentile and rate to the baseline's.
+
+    Latency ratios above 1 and per_sec ratios below 1 are regressions.
+    """
+    def flatten(section: Dict, prefix: str = "") -> Dict[str, float]:
+        values = {}
+        for key, value in section.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, dict):
+                values.update(flatten(value, f"{name}."))
+            elif key in ("p50", "p95", "p99", "per_sec", "requests_per_sec"):
+                values[name] = value
+        return values
+
+    current, previous = flatten(report), flatten(baseline)
+    return {
+        name: round(value / previous[name], 3)
+        for name, value in current.items()
+        if previous.get(name)
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    per_token = 1 / args.tokens_per_second if args.tokens_per_second else 0.0
+    stub = StubOllama(respond=make_responder(None), latency=args.latency,
+                      token_delay=per_token, seconds_per_token=per_token,
+                      malformed_rate=args.malformed_rate, seed=args.seed)
+    report = {
+        "config": {
+            **{key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+            "python": platform.python_version()
+        }
+    }
+    if not args.skip_micro:
+        report["micro"] = micro_benchmarks(args.documents, args.repeat, args.seed)
+    if not args.skip_e2e:
+        ollama_url = await stub.start()
+        try:
+            report["end_to_end"] = await end_to_end(args, ollama_url)
+        finally:
+            await stub.stop()
+        report["end_to_end"]["stub"] = {
+            "generate_requests": stub.request_count,
+            "malformed_answers": stub.malformed_count
+        }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["compared_to_baseline"] = compare(report, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end load test and micro-benchmarks")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--stream", action="store_true", help="send the last answer through /api/chat/stream")
+    parser.add_argument("--bulk", action="store_true",
+                        help="submit all answers in one /api/session/{id}/answers request")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub seconds before answering")
+    parser.add_argument("--tokens-per-second", type=float, default=2000,
+                        help="stub generation speed; 0 answers at once")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="share of stub answers wrapped in prose/fences or truncated")
+    parser.add_argument("--enhance-mode", default="whole", choices=["whole", "sections"])
+    parser.add_argument("--enhance-format", default="schema", choices=["none", "json", "schema"])
+    parser.add_argument("--ollama-concurrency", type=int, default=1000,
+                        help="OLLAMA_MAX_CONCURRENCY for the server")
+    parser.add_argument("--documents", type=int, default=200, help="documents per micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--output", help="write the report to this file")
+    parser.add_argument("--baseline", help="compare with a report written by --output")
+    asyncio.run(main(parser.parse_args()))
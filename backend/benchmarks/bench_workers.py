@@ -0,0 +1,116 @@
+"""
+Load test the conversation flow against uvicorn with several worker
+processes sharing the SQLite session backend.
+
+Each simulated user starts a session, answers every CONVERSATION_FLOW
+question through /api/chat (the last answer triggers enhancement against
+the stub Ollama server), then fetches the preview and the DOCX.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_workers --workers 1 2 4 --users 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.stub_ollama import StubOllama
+
+ANSWERS = [
+    "Jane Doe", "Software Engineer", "+1 555 0100", "jane@example.com", "Berlin",
+    "Backend developer who likes distributed systems", "TU Berlin", "BSc Computer Science",
+    "2020-2024", "3.8", "Python, Go, SQL", "Scheduler: a priority job scheduler",
+    "Engineer, Acme, 2 years, built APIs", "CKA, CNCF, 2023"
+]
+
+
+async def _user(client: httpx.AsyncClient, index: int) -> None:
+    response = await client.post("/api/session", json={"user_id": f"user-{index}"})
+    response.raise_for_status()
+    session_id = response.json()["session_id"]
+    for answer in ANSWERS:
+        response = await client.post("/api/chat", json={"session_id": session_id, "message": answer})
+        response.raise_for_status()
+    (await client.get(f"/api/resume_preview/{session_id}")).raise_for_status()
+    (await client.get(f"/api/download/{session_id}")).raise_for_status()
+
+
+async def _wait_ready(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        for _ in range(200):
+            try:
+                await client.get(f"{url}/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("API server did not start")
+
+
+async def _run(workers: int, users: int, concurrency: int, ollama_url: str, port: int) -> dict:
+    db_dir = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "OLLAMA_BASE_URL": ollama_url,
+        "SESSION_BACKEND": "sqlite",
+        "SESSION_DB": os.path.join(db_dir, "sessions.db"),
+        # Keep admission control out of the way; this measures the API itself
+        "OLLAMA_MAX_CONCURRENCY": "1000",
+        "OLLAMA_MAX_QUEUE": "100000",
+        "USER_RATE_BURST": "1000"
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_ready(url)
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+            async def one(i):
+                async with semaphore:
+                    await _user(client, i)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(users)))
+            elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    requests = users * (len(ANSWERS) + 3)
+    return {
+        "workers": workers,
+        "users": users,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(requests / elapsed, 1)
+    }
+
+
+async def main(worker_counts, users: int, concurrency: int, port: int) -> None:
+    stub = StubOllama(response=json.dumps({"name": "Jane Doe", "summary": "Enhanced"}))
+    ollama_url = await stub.start()
+    try:
+        results = [await _run(w, users, concurrency, ollama_url, port) for w in worker_counts]
+    finally:
+        await stub.stop()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-worker session backend load test")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.users, args.concurrency, args.port))
@@ -0,0 +1,154 @@
+"""
+Minimal stand-in for the Ollama HTTP API used by the benchmarks.
+
+Run standalone with ``python -m benchmarks.stub_ollama --port 11434`` from the
+backend directory, or start it in-process with ``StubOllama().start()``.
+"""
+import argparse
+import asyncio
+import json
+import random
+from typing import Callable, Dict, Optional
+
+from aiohttp import web
+
+
+class StubOllama:
+    def __init__(self, latency: float = 0.0, response: Optional[str] = None,
+                 token_delay: float = 0.0, respond: Optional[Callable[[Dict], str]] = None,
+                 seconds_per_token: float = 0.0, load_seconds: float = 0.0,
+                 failure_rate: float = 0.0, malformed_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.response = response if response is not None else json.dumps({"summary": "stub"})
+        # Optional per-request answer, e.g. chosen by prompt
+        self.respond = respond
+        # Non-streaming answers also take this long per generated word, like a real model
+        self.seconds_per_token = seconds_per_token
+        # The first request pays this once, like Ollama loading the model
+        self.load_seconds = load_seconds
+        self.loaded = False
+        # Share of generate requests answered with a 500; down fails everything
+        self.failure_rate = failure_rate
+        self.down = False
+        # Share of answers wrapped in prose or code fences, or cut short, like an
+        # unconstrained model; applied even when the request asks for a format
+        self.malformed_rate = malformed_rate
+        self.malformed_count = 0
+        self._random = random.Random(seed)
+        self.request_count = 0
+        self.port: Optional[int] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/generate", self.handle_generate)
+        app.router.add_get("/api/tags", self.handle_tags)
+        return app
+
+    async def handle_tags(self, request: web.Request) -> web.Response:
+        if self.down:
+            return web.json_response({"error": "stub is down"}, status=503)
+        return web.json_response({"models": [{"name": "stub"}]})
+
+    async def handle_generate(self, request: web.Request) -> web.StreamResponse:
+        self.request_count += 1
+        payload = await request.json()
+        if self.down or self._random.random() < self.failure_rate:
+            return web.json_response({"error": "injected failure"}, status=500)
+        if not self.loaded:
+            await asyncio.sleep(self.load_seconds)
+            self.loaded = True
+        if "prompt" not in payload:
+            # Load request
+            return web.json_response({
+                "model": "stub",
+                "response": "",
+                "done": True,
+                "load_duration": int(self.load_seconds * 1e9)
+            })
+        text = self.respond(payload) if self.respond else self.response
+        if self.malformed_rate and self._random.random() < self.malformed_rate:
+            text = self._malformed(text)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if payload.get("stream", True):
+            return await self._stream(request, text, payload)
+        if self.seconds_per_token:
+            await asyncio.sleep(self.seconds_per_token * len(text.split(" ")))
+        return web.json_response({
+            "model": "stub",
+            "response": text,
+            "done": True,
+            **self._statistics(payload, text)
+        })
+
+    def _malformed(self, text: str) -> str:
+        self.malformed_count += 1
+        roll = self._random.random()
+        if roll < 0.2:
+            return text[:len(text) // 2]
+        if roll < 0.6:
+            return f"Here is the enhanced resume:\n\n{text}\n\nLet me know if you need any changes!"
+        return f"```json\n{text}\n```"
+
+    def _statistics(self, payload: Dict, text: str) -> Dict:
+        # The token counts and durations (in nanoseconds) Ollama adds to its final response
+        tokens = len(text.split(" "))
+        per_token = self.seconds_per_token or self.token_delay or 0.001
+        return {
+            "load_duration": 0,
+            "prompt_eval_count": len(payload["prompt"].split()),
+            "prompt_eval_duration": int(len(payload["prompt"].split()) * per_token * 1e8),
+            "eval_count": tokens,
+            "eval_duration": int(tokens * per_token * 1e9)
+        }
+
+    async def _stream(self, request: web.Request, text: str, payload: Dict) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        # Split on spaces so clients see many small token chunks
+        tokens = text.split(" ")
+        for i, token in enumerate(tokens):
+            piece = token if i == 0 else " " + token
+            await response.write(json.dumps({"model": "stub", "response": piece, "done": False}).encode() + b"\n")
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+        final = {"model": "stub", "response": "", "done": True, **self._statistics(payload, text)}
+        await response.write(json.dumps(final).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the ``/api`` base URL."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{self.port}/api"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--seconds-per-token", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    stub = StubOllama(latency=args.latency, token_delay=args.token_delay,
+                      seconds_per_token=args.seconds_per_token, failure_rate=args.failure_rate,
+                      malformed_rate=args.malformed_rate)
+    web.run_app(stub.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
+
+logger = logging.getLogger(__name__)
+
+# Close codes sent to WebSocket chat clients
+CLOSE_SESSION_NOT_FOUND = 4404
+CLOSE_HEARTBEAT_TIMEOUT = 4408
+CLOSE_REPLACED = 4409
+CLOSE_TOO_SLOW = 1013  # "try again later": reconnect and resume
+
+class Outbox:
+    """
+    Bounded queue of messages for one WebSocket, drained by run().
+
+    Nothing that produces messages ever waits on a slow client. Tokens are
+    appended to the last queued message while it is an unsent token
+    message, so a client that falls behind gets fewer, larger chunks and
+    the stream itself never fills the queue. Any other message arriving
+    while max_messages are waiting marks the outbox as overflowed and
+    closes the connection; the client then reconnects and the session
+    state is pushed again.
+    """
+
+    def __init__(self, websocket: WebSocket, max_messages: int = 256):
+        self.websocket = websocket
+        self.max_messages = max_messages
+        self.overflowed = False
+        self.coalesced = 0
+        self._messages: Deque[Dict] = deque()
+        self._ready = asyncio.Event()
+
+    def send(self, message: Dict) -> None:
+        if self.overflowed:
+            return
+        if len(self._messages) >= self.max_messages:
+            self.overflowed = True
+            logger.warning("WebSocket client is not reading; closing the connection")
+        else:
+            self._messages.append(message)
+        self._ready.set()
+
+    def send_token(self, text: str) -> None:
+        if self._messages and self._messages[-1]["type"] == "token":
+            self._messages[-1]["text"] += text
+            self.coalesced += 1
+        else:
+            self.send({"type": "token", "text": text})
+
+    async def run(self) -> None:
+        """Write queued messages until the outbox overflows or the socket closes."""
+        while not self.overflowed:
+            if not self._messages:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            try:
+                await self.websocket.send_json(self._messages.popleft())
+            except (WebSocketDisconnect, RuntimeError):
+                # The client went away; the receiving side sees the disconnect
+                return
+        await close_websocket(self.websocket, CLOSE_TOO_SLOW)
+
+async def close_websocket(websocket: WebSocket, code: int) -> None:
+    """Close the socket unless it is closed already."""
+    if websocket.application_state != WebSocketState.DISCONNECTED:
+        try:
+            await websocket.close(code)
+        except RuntimeError:
+            # The client went away first
+            pass
+
+class EnhancementRun:
+    """
+    A session's enhancement, running independently of any connection.
+
+    Progress is sent to every attached outbox. Sections finished so far
+    are replayed to outboxes attached later, so a client that reconnects
+    mid-enhancement catches up on everything but the raw tokens.
+    """
+
+    def __init__(self):
+        self.outboxes: Set[Outbox] = set()
+        self.sections: Dict[str, Any] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    def attach(self, outbox: Outbox) -> None:
+        outbox.send({"type": "progress", "status": "enhancing"})
+        for field, value in self.sections.items():
+            outbox.send({"type": "section", "field": field, "value": value})
+        self.outboxes.add(outbox)
+
+    def detach(self, outbox: Outbox) -> None:
+        self.outboxes.discard(outbox)
+
+    def publish(self, message: Dict) -> None:
+        if message["type"] == "section":
+            self.sections[message["field"]] = message["value"]
+        for outbox in list(self.outboxes):
+            outbox.send(message)
+
+    def publish_token(self, text: str) -> None:
+        for outbox in list(self.outboxes):
+            outbox.send_token(text)
+
+class ChatSockets:
+    """
+    Open WebSocket chat connections and running enhancements, per session.
+
+    One connection per session is kept: a new one (typically the same
+    client reconnecting before the old socket timed out) replaces it.
+    """
+
+    def __init__(self, heartbeat_interval: float = 20, heartbeat_timeout: float = 60,
+                 max_messages: int = 256):
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_messages = max_messages
+        self.connections: Dict[str, WebSocket] = {}
+        self.runs: Dict[str, EnhancementRun] = {}
+        self.accepted = 0
+        self.replaced = 0
+        self.timeouts = 0
+        self.overflows = 0
+
+    async def connect(self, session_id: str, websocket: WebSocket) -> Outbox:
+        await websocket.accept()
+        self.accepted += 1
+        previous = self.connections.get(session_id)
+        self.connections[session_id] = websocket
+        if previous is not None:
+            self.replaced += 1
+            await close_websocket(previous, CLOSE_REPLACED)
+        return Outbox(websocket, self.max_messages)
+
+    def disconnect(self, session_id: str, outbox: Outbox) -> None:
+        if self.connections.get(session_id) is outbox.websocket:
+            del self.connections[session_id]
+        run = self.runs.get(session_id)
+        if run is not None:
+            run.detach(outbox)
+        if outbox.overflowed:
+            self.overflows += 1
+
+    def start_run(self, session_id: str, enhance: Callable[[EnhancementRun], Awaitable[None]]) -> EnhancementRun:
+        """
+        Start enhance(run) as a task that outlives the connection.
+
+        Returns the session's run, which is the running one if there is one.
+        """
+        run = self.runs.get(session_id)
+        if run is not None:
+            return run
+        run = self.runs[session_id] = EnhancementRun()
+
+        async def execute() -> None:
+            try:
+                await enhance(run)
+            finally:
+                del self.runs[session_id]
+
+        run.task = asyncio.create_task(execute())
+        return run
+
+    async def heartbeat(self, outbox: Outbox, last_seen: Callable[[], float]) -> None:
+        """
+        Ping the client every heartbeat_interval seconds.
+
+        Closes the connection when nothing, not even a pong, has been
+        received for heartbeat_timeout seconds.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if loop.time() - last_seen() > self.heartbeat_timeout:
+                self.timeouts += 1
+                await close_websocket(outbox.websocket, CLOSE_HEARTBEAT_TIMEOUT)
+                return
+            outbox.send({"type": "ping"})
+
+    async def close(self) -> None:
+        """Cancel running enhancements; called on shutdown."""
+        tasks = [run.task for run in self.runs.values() if run.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        return {
+            "connections": len(self.connections),
+            "enhancements_running": len(self.runs),
+            "accepted": self.accepted,
+            "replaced": self.replaced,
+            "heartbeat_timeouts": self.timeouts,
+            "closed_too_slow": self.overflows
+        }
@@ -1,143 +1,218 @@
+import copy
+import io
+import zipfile
 from docx import Document
+from docx.document import Document as DocumentObject
+from docx.opc.oxml import serialize_part_xml
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
 from typing import Dict, List
 import logging
+import time
+
+from metrics import STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
+DOCX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+DOCUMENT_PART = 'word/document.xml'
+
 class DocxGenerator:
-    def __init__(self):
-        self.document = Document()
-        self.setup_styles()
+    """
+    Renders resume data to DOCX.
+
+    The styled base document is loaded once per instance. All per-document
+    state is local to each render, so one instance can be shared by
+    concurrent threads.
+    """
 
-    def setup_styles(self):
+    def __init__(self):
+        self._template, self._static_parts = self._load_template()
+        # Resolve style ids once; python-docx would scan styles.xml on every lookup
+        self._style_ids = {
+            name: self._template.styles[name].style_id
+            for name in ('Heading 1', 'Heading 2', 'List Bullet')
+        }
+
+    def setup_styles(self, document):
         # Set default font
-        style = self.document.styles['Normal']
+        style = document.styles['Normal']
         font = style.font
         font.name = 'Arial'
         font.size = Pt(11)
 
-    def add_heading(self, text, level=1):
-        heading = self.document.add_heading(text, level)
+    def add_heading(self, document, text, level=1):
+        heading = self.add_paragraph(document, text, f'Heading {level}')
         heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
         return heading
 
-    def add_paragraph(self, text, style=None):
-        paragraph = self.document.add_paragraph(text, style)
+    def add_paragraph(self, document, text, style=None):
+        paragraph = document.add_paragraph(text)
+        if style:
+            # Same pStyle python-docx writes, without its per-call style lookup
+            paragraph._p.style = self._style_ids[style]
         return paragraph
 
-    def add_bullet_points(self, items):
+    def add_bullet_points(self, document, items):
         for item in items:
-            paragraph = self.document.add_paragraph(style='List Bullet')
+            paragraph = self.add_paragraph(document, '', 'List Bullet')
             paragraph.add_run(item)
 
     def generate_resume(self, resume_data, output_path):
+        content = self.render(resume_data)
+        with open(output_path, 'wb') as output:
+            output.write(content)
+        logger.info(f"Resume saved to {output_path}")
+        return output_path
+
+    def render(self, resume_data) -> bytes:
+        """
+        Render resume data to DOCX bytes in memory.
+
+        Args:
+            resume_data: Structured resume data
+
+        Returns:
+            bytes: The DOCX file contents
+        """
         try:
-            # Clear any existing content
-            self.document = Document()
-            self.setup_styles()
-
-            # Add name and title with enhanced formatting
-            name = resume_data.get('name', '')
-            title = resume_data.get('title', '')
-            if name:
-                name_paragraph = self.document.add_paragraph()
-                name_run = name_paragraph.add_run(name)
-                name_run.bold = True
-                name_run.font.size = Pt(24)  # Increased font size to 24pt
-                name_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            if title:
-                title_paragraph = self.document.add_paragraph()
-                title_run = title_paragraph.add_run(title)
-                title_run.bold = True
-                title_run.font.size = Pt(14)  # Increased font size to 14pt
-                title_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            # Add contact information
-            contact_info = []
-            if resume_data.get('phone'):
-                contact_info.append(resume_data['phone'])
-            if resume_data.get('email'):
-                contact_info.append(resume_data['email'])
-            if resume_data.get('location'):
-                contact_info.append(resume_data['location'])
-            if contact_info:
-                contact_paragraph = self.document.add_paragraph()
-                contact_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                contact_paragraph.add_run(" | ".join(contact_info))
-
-            # Add summary
-            summary = resume_data.get('summary', '')
-            if summary:
-                self.add_heading('Summary', level=1)
-                self.add_paragraph(summary)
-
-            # Add education
-            education = resume_data.get('education', [])
-            if education:
-                self.add_heading('Education', level=1)
-                for edu in education:
-                    self._add_education(self.document, edu)
-
-            # Add skills
-            skills = resume_data.get('skills', [])
-            if skills:
-                self.add_heading('Skills', level=1)
-                self.add_paragraph(", ".join(skills))
-
-            # Add projects
-            projects = resume_data.get('projects', [])
-            if projects:
-                self.add_heading('Projects', level=1)
-                for project in projects:
-                    if project.get('name'):
-                        self.add_paragraph(project['name'], style='Heading 2')
-                    if project.get('description'):
-                        self.add_paragraph(project['description'])
-
-            # Add experience
-            experience = resume_data.get('experience', [])
-            if experience:
-                self.add_heading('Experience', level=1)
-                for exp in experience:
-                    exp_text = []
-                    if exp.get('title'):
-                        exp_text.append(exp['title'])
-                    if exp.get('company'):
-                        exp_text.append(f"at {exp['company']}")
-                    if exp.get('duration'):
-                        exp_text.append(f"({exp['duration']})")
-                    if exp_text:
-                        self.add_paragraph(" ".join(exp_text), style='Heading 2')
-                    if exp.get('description'):
-                        self.add_paragraph(exp['description'])
-
-            # Add certifications
-            certifications = resume_data.get('certifications', [])
-            if certifications:
-                self.add_heading('Certifications', level=1)
-                for cert in certifications:
-                    cert_text = []
-                    if cert.get('title'):
-                        cert_text.append(cert['title'])
-                    if cert.get('issuer'):
-                        cert_text.append(f"- {cert['issuer']}")
-                    if cert.get('date'):
-                        cert_text.append(f"({cert['date']})")
-                    if cert_text:
-                        self.add_paragraph(" ".join(cert_text))
-
-            # Save the document
-            self.document.save(output_path)
-            logger.info(f"Resume saved to {output_path}")
-            return output_path
+            start = time.perf_counter()
+            document = self._new_document()
+            self.build(document, resume_data)
+            content = self._package(document)
+            # Only reaches /metrics from threads; process pool workers have their own registry
+            STAGE_SECONDS.observe(time.perf_counter() - start, "docx_build")
+            return content
 
         except Exception as e:
             logger.error(f"Error generating DOCX: {str(e)}")
             raise
 
+    def build(self, document, resume_data):
+        """Add the resume sections to an empty, styled document."""
+        # Add name and title with enhanced formatting
+        name = resume_data.get('name', '')
+        title = resume_data.get('title', '')
+        if name:
+            name_paragraph = document.add_paragraph()
+            name_run = name_paragraph.add_run(name)
+            name_run.bold = True
+            name_run.font.size = Pt(24)  # Increased font size to 24pt
+            name_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        if title:
+            title_paragraph = document.add_paragraph()
+            title_run = title_paragraph.add_run(title)
+            title_run.bold = True
+            title_run.font.size = Pt(14)  # Increased font size to 14pt
+            title_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # Add contact information
+        contact_info = []
+        if resume_data.get('phone'):
+            contact_info.append(resume_data['phone'])
+        if resume_data.get('email'):
+            contact_info.append(resume_data['email'])
+        if resume_data.get('location'):
+            contact_info.append(resume_data['location'])
+        if contact_info:
+            contact_paragraph = document.add_paragraph()
+            contact_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            contact_paragraph.add_run(" | ".join(contact_info))
+
+        # Add summary
+        summary = resume_data.get('summary', '')
+        if summary:
+            self.add_heading(document, 'Summary', level=1)
+            self.add_paragraph(document, summary)
+
+        # Add education
+        education = resume_data.get('education', [])
+        if education:
+            self.add_heading(document, 'Education', level=1)
+            for edu in education:
+                self._add_education(document, edu)
+
+        # Add skills
+        skills = resume_data.get('skills', [])
+        if skills:
+            self.add_heading(document, 'Skills', level=1)
+            self.add_paragraph(document, ", ".join(skills))
+
+        # Add projects
+        projects = resume_data.get('projects', [])
+        if projects:
+            self.add_heading(document, 'Projects', level=1)
+            for project in projects:
+                if project.get('name'):
+                    self.add_paragraph(document, project['name'], style='Heading 2')
+                if project.get('description'):
+                    self.add_paragraph(document, project['description'])
+
+        # Add experience
+        experience = resume_data.get('experience', [])
+        if experience:
+            self.add_heading(document, 'Experience', level=1)
+            for exp in experience:
+                exp_text = []
+                if exp.get('title'):
+                    exp_text.append(exp['title'])
+                if exp.get('company'):
+                    exp_text.append(f"at {exp['company']}")
+                if exp.get('duration'):
+                    exp_text.append(f"({exp['duration']})")
+                if exp_text:
+                    self.add_paragraph(document, " ".join(exp_text), style='Heading 2')
+                if exp.get('description'):
+                    self.add_paragraph(document, exp['description'])
+
+        # Add certifications
+        certifications = resume_data.get('certifications', [])
+        if certifications:
+            self.add_heading(document, 'Certifications', level=1)
+            for cert in certifications:
+                cert_text = []
+                if cert.get('title'):
+                    cert_text.append(cert['title'])
+                if cert.get('issuer'):
+                    cert_text.append(f"- {cert['issuer']}")
+                if cert.get('date'):
+                    cert_text.append(f"({cert['date']})")
+                if cert_text:
+                    self.add_paragraph(document, " ".join(cert_text))
+
+    def _load_template(self):
+        # Parse and style python-docx's default template once
+        template = Document()
+        self.setup_styles(template)
+        buffer = io.BytesIO()
+        template.save(buffer)
+
+        # Compress every part except the body once; renders only append the body
+        static = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as source, \
+                zipfile.ZipFile(static, 'w', zipfile.ZIP_DEFLATED) as target:
+            for info in source.infolist():
+                if info.filename != DOCUMENT_PART:
+                    target.writestr(info, source.read(info.filename), zipfile.ZIP_DEFLATED)
+        return template, static.getvalue()
+
+    def _new_document(self):
+        """
+        Return an empty document backed by the prebuilt template.
+
+        Only the small body element is copied; styles, numbering and the rest
+        of the package are shared read-only with the template.
+        """
+        element = copy.deepcopy(self._template.element)
+        return DocumentObject(element, self._template.part)
+
+    def _package(self, document) -> bytes:
+        buffer = io.BytesIO(self._static_parts)
+        with zipfile.ZipFile(buffer, 'a', zipfile.ZIP_DEFLATED) as package:
+            package.writestr(DOCUMENT_PART, serialize_part_xml(document.element))
+        return buffer.getvalue()
+
     def _add_education(self, doc, education_data):
         """Add education section to the document."""
         p = doc.add_paragraph()
@@ -155,4 +230,13 @@ class DocxGenerator:
         
         if details:
             p = doc.add_paragraph()
-            p.add_run(" | ".join(details)).italic = True 
\ No newline at end of file
+            p.add_run(" | ".join(details)).italic = True 
+
+_shared_generator = None
+
+def render_docx(resume_data) -> bytes:
+    """Render resume data to DOCX bytes; module-level so process pools can pickle it."""
+    global _shared_generator
+    if _shared_generator is None:
+        _shared_generator = DocxGenerator()
+    return _shared_generator.render(resume_data)
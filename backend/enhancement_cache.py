@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class EnhancementCache:
+    """
+    Two-tier cache for enhance_resume results.
+
+    Entries live in a bounded in-memory LRU and, when db_path is given, in a
+    SQLite file so they survive restarts. Values are stored as JSON text so
+    every hit hands back an independent copy.
+
+    Code running on the event loop uses the *_async methods: memory hits
+    are answered inline and SQLite work runs on a single thread of the
+    cache's own. The SQLite tier is trimmed to disk_max_entries once a
+    write takes it over, down to nine tenths of it, so trims are rare.
+    """
+
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None,
+                 disk_max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.disk_max_entries = disk_max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Upper bound on the rows in the SQLite tier; replaced rows count twice until a trim
+        self._disk_rows = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS enhance_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS enhance_cache_accessed ON enhance_cache (accessed)")
+            self._disk_rows = self._db.execute("SELECT COUNT(*) FROM enhance_cache").fetchone()[0]
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-enhance-cache")
+            logger.info(f"Enhancement cache persisted to {db_path}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self._memory_get(key)
+        if value is None and self._db is not None:
+            return self._disk_get(key)
+        if value is None:
+            self._miss()
+        return value
+
+    def put(self, key: str, value: Dict) -> None:
+        text = json.dumps(value)
+        with self._lock:
+            self._remember(key, text)
+        if self._db is not None:
+            self._disk_put(key, text)
+
+    def invalidate(self, key: str) -> bool:
+        """Drop one entry from both tiers. Returns True if it was cached."""
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+        if self._db is not None:
+            removed = self._disk_invalidate(key) or removed
+        return removed
+
+    async def get_async(self, key: str) -> Optional[Dict]:
+        value = self._memory_get(key)
+        if value is None and self._db is not None:
+            return await self._run(self._disk_get, key)
+        if value is None:
+            self._miss()
+        return value
+
+    async def put_async(self, key: str, value: Dict) -> None:
+        text = json.dumps(value)
+        with self._lock:
+            self._remember(key, text)
+        if self._db is not None:
+            await self._run(self._disk_put, key, text)
+
+    async def invalidate_async(self, key: str) -> bool:
+        """invalidate() for the event loop."""
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+        if self._db is not None:
+            removed = await self._run(self._disk_invalidate, key) or removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM enhance_cache")
+                self._disk_rows = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self._db is not None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _memory_get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return json.loads(value)
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _disk_get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM enhance_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE enhance_cache SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            # Promote to the memory tier
+            self._remember(key, row[0])
+            self.hits += 1
+            self.disk_hits += 1
+            return json.loads(row[0])
+
+    def _disk_put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO enhance_cache (key, value, accessed) VALUES (?, ?, ?)",
+                (key, text, time.time())
+            )
+            self._disk_rows += 1
+            if self._disk_rows > self.disk_max_entries:
+                self._trim_disk()
+
+    def _disk_invalidate(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM enhance_cache WHERE key = ?", (key,))
+            return cursor.rowcount > 0
+
+    def _trim_disk(self) -> None:
+        # Other processes may share the file, so count before deleting
+        rows = self._db.execute("SELECT COUNT(*) FROM enhance_cache").fetchone()[0]
+        excess = rows - self.disk_max_entries * 9 // 10 if rows > self.disk_max_entries else 0
+        if excess > 0:
+            cursor = self._db.execute(
+                "DELETE FROM enhance_cache WHERE key IN "
+                "(SELECT key FROM enhance_cache ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+            rows -= excess
+        self._disk_rows = rows
+
+    def _remember(self, key: str, text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
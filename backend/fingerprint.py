@@ -0,0 +1,13 @@
+import hashlib
+import json
+from typing import Any
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value to JSON with a stable key order and no whitespace."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Return a SHA-256 hex digest identifying the given JSON-compatible values."""
+    return hashlib.sha256(canonical_json(parts).encode("utf-8")).hexdigest()
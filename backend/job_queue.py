@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    session_id: Optional[str]
+    factory: Optional[Callable[[], Awaitable[Any]]] = field(repr=False)
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "session_id": self.session_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        # Wake everyone watching this job and arm a fresh event for the next change
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+class JobQueue:
+    """
+    In-process asyncio job queue served by a fixed pool of workers.
+
+    Submissions beyond max_depth are rejected with QueueFullError so callers
+    can push back on clients instead of piling up work. Every accepted job
+    is counted in exactly one of succeeded, failed, cancelled (running when
+    the queue stopped), running or the queue depth.
+    """
+
+    def __init__(self, workers: int = 4, max_depth: int = 100, retention: int = 1000):
+        self.workers = workers
+        self.max_depth = max_depth
+        self.retention = retention
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self.submitted = 0
+        self.running = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, factory: Callable[[], Awaitable[Any]],
+               session_id: Optional[str] = None) -> Job:
+        """
+        Queue a job without waiting for it to run.
+
+        Args:
+            kind: Short job type label, e.g. "enhance"
+            factory: Zero-argument callable returning the coroutine to run
+            session_id: Session the job belongs to, if any
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            QueueFullError: If max_depth jobs are already waiting
+        """
+        job = Job(id=str(uuid.uuid4()), kind=kind, session_id=session_id, factory=factory)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_depth} waiting)")
+        self.submitted += 1
+        self._jobs[job.id] = job
+        self._trim()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """Wait up to timeout seconds for the job to finish."""
+        deadline = time.monotonic() + timeout
+        while not job.finished:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(job._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return job
+
+    async def watch(self, job: Job) -> AsyncIterator[Dict]:
+        """Yield the job's state now and after every status change until it finishes."""
+        while True:
+            changed = job._changed
+            yield job.to_dict()
+            if job.finished:
+                return
+            await changed.wait()
+
+    def stats(self) -> Dict:
+        waits = sorted(self._wait_times)
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_depth": self.max_depth,
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "running": self.running,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "wait_seconds_avg": sum(waits) / len(waits) if waits else 0.0,
+            "wait_seconds_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+            "wait_seconds_max": waits[-1] if waits else 0.0
+        }
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            job.started_at = time.time()
+            self._wait_times.append(job.started_at - job.created_at)
+            self.running += 1
+            job._set_status("running")
+            try:
+                job.result = await job.factory()
+                self.succeeded += 1
+                status = "succeeded"
+            except asyncio.CancelledError:
+                job.error = "Job cancelled"
+                job.finished_at = time.time()
+                self.cancelled += 1
+                job._set_status("cancelled")
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+                job.error = str(e)
+                self.failed += 1
+                status = "failed"
+            finally:
+                self.running -= 1
+                job.factory = None
+                self._queue.task_done()
+            job.finished_at = time.time()
+            job._set_status(status)
+
+    def _trim(self) -> None:
+        # Forget the oldest finished jobs once more than `retention` are tracked
+        excess = len(self._jobs) - self.retention
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finished][:excess]:
+            del self._jobs[job_id]
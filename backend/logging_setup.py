@@ -0,0 +1,142 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+from typing import IO, Any, Dict, Optional
+
+from pythonjsonlogger import jsonlogger
+
+class LogPayload:
+    """
+    A large log argument that is only serialized when the record is written.
+
+    Pass it as a %-style argument, e.g.
+    logger.info("Enhanced resume data: %s", LogPayload(resume)). Records
+    below the logger's level never serialize it, and emitted ones are
+    serialized on the listener thread instead of the event loop. The text
+    is cut to max_chars characters.
+
+    A shallow copy is taken so later replacement of top-level fields does
+    not change what gets logged.
+    """
+
+    max_chars = 4096
+
+    def __init__(self, value: Any, max_chars: Optional[int] = None):
+        self.value = dict(value) if isinstance(value, dict) else value
+        if max_chars is not None:
+            self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else json.dumps(self.value, default=str)
+        if self.max_chars and len(text) > self.max_chars:
+            return f"{text[:self.max_chars]}... ({len(text) - self.max_chars} more chars)"
+        return text
+
+class PayloadSampler(logging.Filter):
+    """Keep only sample_rate of the records that carry a LogPayload."""
+
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.sample_rate >= 1 or not isinstance(record.args, tuple):
+            return True
+        if not any(isinstance(arg, LogPayload) for arg in record.args):
+            return True
+        if random.random() < self.sample_rate:
+            return True
+        self.dropped += 1
+        return False
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler formats every record before queueing it, which would
+    serialize payloads on the caller's thread. The queue is bounded, and
+    records arriving while it is full are dropped and counted instead of
+    blocking the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The record stays in this process, so args and exc_info need no pickling
+        return copy.copy(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        # The stock listener uses put_nowait, which raises queue.Full when
+        # stopped while the queue is full and leaves the thread running
+        self.queue.put(self._sentinel)
+
+_handler: Optional[DeferredQueueHandler] = None
+_sampler: Optional[PayloadSampler] = None
+_listener: Optional[DrainingQueueListener] = None
+
+def configure_logging(level: str = "INFO", queue_size: int = 10000, sample_rate: float = 1.0,
+                      max_chars: int = 4096, stream: Optional[IO] = None) -> None:
+    """
+    Route all application logging through a queue to a JSON stream handler.
+
+    Log calls only copy the record onto the queue; a listener thread
+    formats and writes it. Calling this again reconfigures the sampling and
+    truncation but keeps the running listener.
+
+    Args:
+        level: Root logger level
+        queue_size: Records buffered before new ones are dropped
+        sample_rate: Share of records carrying a LogPayload that are kept
+        max_chars: Longest LogPayload text written, 0 for no limit
+        stream: Where records are written; stderr by default
+    """
+    global _handler, _sampler, _listener
+    LogPayload.max_chars = max_chars
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        _sampler.sample_rate = sample_rate
+        return
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _sampler = PayloadSampler(sample_rate)
+    _handler = DeferredQueueHandler(log_queue)
+    _handler.addFilter(_sampler)
+    root.addHandler(_handler)
+    _listener = DrainingQueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        if _handler is not None:
+            logging.getLogger().removeHandler(_handler)
+
+def logging_stats() -> Dict:
+    return {
+        "queued": _handler.queue.qsize() if _handler is not None else 0,
+        "dropped_queue_full": _handler.dropped if _handler is not None else 0,
+        "dropped_sampling": _sampler.dropped if _sampler is not None else 0
+    }
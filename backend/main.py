@@ -1,35 +1,145 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from typing import Dict, List, Optional
+from pydantic import BaseModel, ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import uuid
 import json
+import asyncio
+import time
 from datetime import datetime
 import logging
-from pythonjsonlogger import jsonlogger
-import os
-import tempfile
+import io
+from contextlib import asynccontextmanager
 
 from ollama_client import OllamaClient
-from docx_generator import DocxGenerator
-from resume_parser import ResumeParser
+from docx_generator import DOCX_MEDIA_TYPE
+from resume_parser import IncrementalResumeParser, ResumeParser
+from enhancement_cache import EnhancementCache
+from job_queue import JobQueue, QueueFullError
+from scheduler import BULK, INTERACTIVE, OllamaScheduler, SchedulerRejected
+from session_store import InMemorySessionStore, SessionStore, SqliteSessionStore
+from renderer import ArtifactRenderer
+from schemas import ResumeData
+from batch import BatchGenerator
+from section_enhancement import SECTION_CONTEXT
+from speculation import SpeculativeEnhancer
+from warmup import ModelWarmer
+from chat_socket import CLOSE_SESSION_NOT_FOUND, ChatSockets, EnhancementRun, Outbox, close_websocket
+from logging_setup import LogPayload, configure_logging, logging_stats
+from metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, PROMETHEUS_CONTENT_TYPE, REGISTRY
+import settings
 
-# Configure logging
+# Configure logging; records are written by a background thread
+configure_logging(
+    level=settings.LOG_LEVEL,
+    queue_size=settings.LOG_QUEUE_SIZE,
+    sample_rate=settings.LOG_PAYLOAD_SAMPLE_RATE,
+    max_chars=settings.LOG_PAYLOAD_MAX_CHARS
+)
 logger = logging.getLogger(__name__)
-formatter = jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(message)s')
-handler = logging.StreamHandler()
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-logger.setLevel(logging.INFO)
 
-app = FastAPI(title="ResuLLMe API")
+# Initialize components
+enhancement_cache = EnhancementCache(
+    max_entries=settings.ENHANCE_CACHE_SIZE,
+    db_path=settings.ENHANCE_CACHE_DB or None,
+    disk_max_entries=settings.ENHANCE_CACHE_DISK_SIZE
+)
+ollama_client = OllamaClient(cache=enhancement_cache)
+resume_parser = ResumeParser()
+scheduler = OllamaScheduler(
+    max_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+    max_queue=settings.OLLAMA_MAX_QUEUE,
+    user_rate=settings.USER_RATE_LIMIT,
+    user_burst=settings.USER_RATE_BURST
+)
+warmer = ModelWarmer(
+    ollama_client,
+    ping_interval=settings.OLLAMA_KEEPALIVE_PING_INTERVAL,
+    retry_interval=settings.OLLAMA_WARMUP_RETRY,
+    enabled=settings.OLLAMA_WARMUP
+)
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    max_depth=settings.JOB_QUEUE_SIZE,
+    retention=settings.JOB_RETENTION
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Share one pooled HTTP session across all Ollama calls
+    await ollama_client.start()
+    await job_queue.start()
+    # Load the model before the first user needs it
+    warmer.start()
+    sessions.start_sweeper(settings.SESSION_SWEEP_INTERVAL)
+    resume_data.start_sweeper(settings.SESSION_SWEEP_INTERVAL)
+    try:
+        yield
+    finally:
+        await sessions.stop_sweeper()
+        await resume_data.stop_sweeper()
+        await warmer.stop()
+        await chat_sockets.close()
+        await job_queue.stop()
+        await ollama_client.close()
+        enhancement_cache.close()
+        sessions.close()
+        resume_data.close()
+        await renderer.close()
+
+app = FastAPI(title="ResuLLMe API", lifespan=lifespan)
 
 # Mount static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+renderer = ArtifactRenderer(
+    templates.env,
+    executor=settings.DOCX_EXECUTOR,
+    workers=settings.DOCX_WORKERS,
+    cache_bytes=settings.ARTIFACT_CACHE_BYTES
+)
+speculator = SpeculativeEnhancer(
+    ollama_client,
+    scheduler,
+    enabled=settings.ENHANCE_SPECULATIVE and settings.ENHANCE_MODE == "sections"
+)
+chat_sockets = ChatSockets(
+    heartbeat_interval=settings.WS_HEARTBEAT_INTERVAL,
+    heartbeat_timeout=settings.WS_HEARTBEAT_TIMEOUT,
+    max_messages=settings.WS_SEND_QUEUE
+)
+batch_generator = BatchGenerator(
+    ollama_client,
+    renderer,
+    scheduler,
+    concurrency=settings.BATCH_CONCURRENCY,
+    max_items=settings.BATCH_MAX_ITEMS
+)
+
+@app.exception_handler(SchedulerRejected)
+async def scheduler_rejected_handler(request: Request, exc: SchedulerRejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.middleware("http")
+async def record_traffic(request: Request, call_next):
+    # Keep the model warm while users are active; load balancer probes do not count
+    if request.url.path != "/api/ready":
+        warmer.touch()
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template so per-session URLs share one series
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    HTTP_REQUESTS.inc(1, request.method, path, str(response.status_code))
+    HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, request.method, path)
+    return response
 
 # CORS configuration
 app.add_middleware(
@@ -40,14 +150,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components
-ollama_client = OllamaClient()
-docx_generator = DocxGenerator()
-resume_parser = ResumeParser()
+def _create_store(table: str) -> SessionStore:
+    # SQLite lets several uvicorn workers share sessions; memory is per process
+    if settings.SESSION_BACKEND == "sqlite":
+        return SqliteSessionStore(
+            settings.SESSION_DB,
+            table,
+            ttl=settings.SESSION_TTL,
+            max_entries=settings.SESSION_MAX_ENTRIES,
+            max_bytes=settings.SESSION_MAX_BYTES,
+            busy_timeout=settings.SESSION_DB_BUSY_TIMEOUT
+        )
+    return InMemorySessionStore(
+        ttl=settings.SESSION_TTL,
+        max_entries=settings.SESSION_MAX_ENTRIES,
+        max_bytes=settings.SESSION_MAX_BYTES
+    )
 
-# In-memory storage for sessions and user data
-sessions: Dict[str, Dict] = {}
-resume_data: Dict[str, Dict] = {}
+# Bounded storage for sessions and user data
+sessions = _create_store("sessions")
+resume_data = _create_store("resumes")
 
 # Conversation flow
 CONVERSATION_FLOW = [
@@ -67,28 +189,36 @@ CONVERSATION_FLOW = [
     {"question": "List any certifications (name, issuer, and date).", "field": "certifications"}
 ]
 
+# Step after which each section's prompt input is final: the last question
+# answering the section or one of its context fields
+SECTION_READY_STEP = {
+    section: max(
+        step for step, entry in enumerate(CONVERSATION_FLOW)
+        if entry["field"].split("_")[0] in [section] + context
+    )
+    for section, context in SECTION_CONTEXT.items()
+}
+
+# Keep proxies from buffering Server-Sent Events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 class SessionRequest(BaseModel):
     user_id: Optional[str] = None
 
     class Config:
         extra = "allow"  # Allow extra fields in the request
 
+class SessionAnswers(BaseModel):
+    answers: Dict[str, str]  # CONVERSATION_FLOW field -> answer text
+    enhance: bool = True  # Enhance right away instead of waiting for "Generate my resume"
+    use_cache: bool = True
+    background: bool = False
+
 class ChatMessage(BaseModel):
     session_id: str
     message: str
-
-class ResumeData(BaseModel):
-    name: str
-    title: str
-    phone: str
-    email: str
-    location: str
-    summary: str
-    education: List[Dict]
-    skills: List[str]
-    projects: List[Dict]
-    experience: List[Dict]
-    certifications: List[Dict]
+    use_cache: bool = True  # False forces a fresh enhancement
+    background: bool = False  # Run the enhancement as a job and return its id
 
 @app.post("/api/session")
 async def start_session(request: SessionRequest = None):
@@ -96,205 +226,799 @@ async def start_session(request: SessionRequest = None):
         request = SessionRequest()
         
     session_id = str(uuid.uuid4())
-    sessions[session_id] = {
+    await sessions.set_async(session_id, {
         "created_at": datetime.now().isoformat(),
         "user_id": request.user_id,
         "messages": [],
         "current_step": 0,
         "resume_data": {}
-    }
+    })
     logger.info(f"New session started: {session_id}")
     return {
         "session_id": session_id,
         "question": CONVERSATION_FLOW[0]["question"]
     }
 
-@app.post("/api/chat")
-async def chat(message: ChatMessage):
-    if message.session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[message.session_id]
-    current_step = session["current_step"]
-    
-    # Store the message
+# Fields every resume must carry before it is sent for enhancement
+REQUIRED_FIELDS = ['name', 'title', 'phone', 'email', 'location', 'summary', 
+                   'education', 'skills', 'projects', 'experience', 'certifications']
+
+def _apply_answer(resume: Dict, current_field: str, text: str) -> None:
+    """Parse one answer into the resume data based on the field type."""
+    if current_field == "skills":
+        resume[current_field] = [skill.strip() for skill in text.split(",")]
+    elif current_field == "education":
+        # Initialize education array if it doesn't exist
+        if "education" not in resume:
+            resume["education"] = []
+        # Add new education entry
+        resume["education"].append({
+            "institution": text,
+            "degree": "",
+            "year_range": "",
+            "cgpa": "",
+            "location": ""
+        })
+    elif current_field == "education_degree":
+        # Update the most recent education entry
+        if resume["education"]:
+            resume["education"][-1]["degree"] = text
+    elif current_field == "education_year":
+        # Update the most recent education entry
+        if resume["education"]:
+            resume["education"][-1]["year_range"] = text
+    elif current_field == "education_cgpa":
+        # Update the most recent education entry
+        if resume["education"]:
+            resume["education"][-1]["cgpa"] = text
+    elif current_field == "projects":
+        resume[current_field] = [{
+            "name": text.split(":")[0].strip(),
+            "description": text.split(":")[1].strip() if ":" in text else ""
+        }]
+    elif current_field == "experience":
+        resume[current_field] = [{
+            "title": text.split(",")[0].strip(),
+            "company": text.split(",")[1].strip() if "," in text else "",
+            "duration": text.split(",")[2].strip() if len(text.split(",")) > 2 else "",
+            "description": text.split(",")[3].strip() if len(text.split(",")) > 3 else ""
+        }]
+    elif current_field == "certifications":
+        resume[current_field] = [{
+            "title": text.split(",")[0].strip(),
+            "issuer": text.split(",")[1].strip() if "," in text else "",
+            "date": text.split(",")[2].strip() if len(text.split(",")) > 2 else ""
+        }]
+    else:
+        resume[current_field] = text
+
+def _record_message(session: Dict, text: str) -> None:
+    # Store the message, keeping only the most recent ones
     session["messages"].append({
-        "text": message.message,
+        "text": text,
         "timestamp": datetime.now().isoformat()
     })
+    messages = session["messages"]
+    if len(messages) > settings.SESSION_MAX_MESSAGES:
+        # Not [:-limit]: with a limit of 0 that slice is empty and nothing is dropped
+        del messages[:len(messages) - settings.SESSION_MAX_MESSAGES]
+
+def _is_generate_request(text: str) -> bool:
+    return "generate" in text.lower() and "resume" in text.lower()
+
+def _completes_flow(session: Dict, text: str) -> bool:
+    """Whether this message would trigger enhancement in _process_message."""
+    if _is_generate_request(text):
+        return session["current_step"] >= len(CONVERSATION_FLOW)
+    return session["current_step"] == len(CONVERSATION_FLOW) - 1
+
+def _process_message(session: Dict, text: str) -> Tuple[Dict, bool]:
+    """
+    Advance the conversation with one user message.
+
+    Returns the reply for the client and whether the resume is now ready to
+    be enhanced. When it is, the reply only holds the final response text.
+    """
+    current_step = session["current_step"]
+    _record_message(session, text)
+
+    # Check if this is a resume generation request
+    if _is_generate_request(text):
+        if current_step < len(CONVERSATION_FLOW):
+            return {
+                "response": "Please complete all the questions first before generating your resume.",
+                "question": CONVERSATION_FLOW[current_step]["question"]
+            }, False
+        return {
+            "response": "I've generated your resume! I've enhanced it with additional details to make it more professional. You can preview it below and download it as a DOCX file."
+        }, True
+
+    # Process current step
+    _apply_answer(session["resume_data"], CONVERSATION_FLOW[current_step]["field"], text)
+
+    # Move to next step
+    session["current_step"] += 1
+
+    if session["current_step"] < len(CONVERSATION_FLOW):
+        return {
+            "response": "Got it!",
+            "question": CONVERSATION_FLOW[session["current_step"]]["question"]
+        }, False
+    return {
+        "response": "Thank you! I've enhanced your resume with additional details. Type 'Generate my resume' to proceed."
+    }, True
+
+async def _advance_session(session_id: str, text: str) -> Tuple[Dict, bool, Dict]:
+    """
+    Run _process_message as one atomic update of the stored session.
+
+    Returns the reply, whether the resume is ready and the updated session.
+    """
+    outcome = {}
+
+    def step(session: Dict) -> None:
+        outcome["reply"], outcome["ready"] = _process_message(session, text)
+
+    session = await sessions.update_async(session_id, step)
+    if session is None:
+        raise KeyError(f"Session {session_id} expired")
+    if not outcome["ready"]:
+        # The final enhancement starts right away otherwise
+        speculator.speculate(session_id, session["resume_data"], [
+            section for section, ready_step in SECTION_READY_STEP.items()
+            if session["current_step"] > ready_step
+        ])
+    return outcome["reply"], outcome["ready"], session
+
+def _ensure_required_fields(resume: Dict) -> Dict:
+    # Ensure all required fields are present in the resume data
+    for field in REQUIRED_FIELDS:
+        if field not in resume:
+            resume[field] = ""
+    return resume
+
+async def _prepare_for_enhancement(session_id: str) -> Dict:
+    session = await sessions.update_async(session_id, lambda s: _ensure_required_fields(s["resume_data"]))
+    if session is None:
+        raise KeyError(f"Session {session_id} expired")
+
+    # Log the original resume data
+    logger.info("Original resume data: %s", LogPayload(session["resume_data"]))
+    return session["resume_data"]
+
+async def _store_enhanced(session_id: str, enhanced_data: Dict) -> None:
+    # Log the enhanced resume data
+    logger.info("Enhanced resume data: %s", LogPayload(enhanced_data))
+
+    # Store the enhanced resume data
+    await _set_resume(session_id, enhanced_data)
+
+    # Downloads usually follow right away, so render them now
+    renderer.prerender(session_id, enhanced_data)
+
+async def _set_resume(session_id: str, resume: Dict) -> None:
+    await resume_data.set_async(session_id, resume)
+    # Drop rendered artifacts of the session's previous resume
+    renderer.bind(session_id, resume)
+
+def _user_key(session_id: str, session: Dict) -> str:
+    # Rate-limit by user when the client identifies one, else by session
+    return session.get("user_id") or session_id
+
+def _enhance_priority(use_cache: bool) -> int:
+    # Forced regenerations yield to first-time completions
+    return INTERACTIVE if use_cache else BULK
+
+def _admit(session_id: str, session: Dict, check_capacity: bool = True) -> None:
+    """
+    Admission check run before any state changes for an LLM call.
+
+    Raises SchedulerRejected (answered as 429/503 with Retry-After) when the
+    user is over their rate or the Ollama wait queue is full. Calls that
+    pass then queue for a slot without the queue limit.
+    """
+    scheduler.admit(_user_key(session_id, session))
+    if check_capacity:
+        scheduler.ensure_capacity()
+
+async def _enhance_session(session_id: str, use_cache: bool = True) -> Dict:
+    # Enhance the resume data using Ollama when all questions are answered
+    resume = await _prepare_for_enhancement(session_id)
+    with speculator.final(session_id, resume, use_cache):
+        async with scheduler.slot(_enhance_priority(use_cache), queue_limit=False):
+            enhanced_data = await ollama_client.enhance_resume(resume, use_cache=use_cache)
+    await _store_enhanced(session_id, enhanced_data)
+    return enhanced_data
+
+async def _generate_session(session_id: str) -> Dict:
+    session = await sessions.get_async(session_id)
+    if session is None:
+        raise KeyError(f"Session {session_id} expired")
+
+    # Generate resume using Ollama
+    async with scheduler.slot(BULK, queue_limit=False):
+        markdown_resume = await ollama_client.generate_resume(session)
+
+    # Parse markdown to JSON
+    parsed_resume = resume_parser.parse_markdown_to_json(markdown_resume)
+
+    # Store the resume data
+    await _set_resume(session_id, parsed_resume)
+    return parsed_resume
+
+def _submit_job(kind: str, session_id: str, factory) -> Dict:
+    try:
+        job = job_queue.submit(kind, factory, session_id=session_id)
+    except QueueFullError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail="Server busy, please retry shortly")
+    return {"job_id": job.id, "status": job.status}
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/chat")
+async def chat(message: ChatMessage):
+    session = await sessions.get_async(message.session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
     
     try:
-        # Check if this is a resume generation request
-        if "generate" in message.message.lower() and "resume" in message.message.lower():
-            if current_step < len(CONVERSATION_FLOW):
-                return {
-                    "response": "Please complete all the questions first before generating your resume.",
-                    "question": CONVERSATION_FLOW[current_step]["question"]
-                }
-            
-            # Ensure all required fields are present in the resume data
-            for field in ['name', 'title', 'phone', 'email', 'location', 'summary', 
-                         'education', 'skills', 'projects', 'experience', 'certifications']:
-                if field not in session["resume_data"]:
-                    session["resume_data"][field] = ""
-            
-            # Log the original resume data
-            logger.info(f"Original resume data: {json.dumps(session['resume_data'], indent=2)}")
-            
-            # Enhance the resume data using Ollama
-            enhanced_data = await ollama_client.enhance_resume(session["resume_data"])
-            
-            # Log the enhanced resume data
-            logger.info(f"Enhanced resume data: {json.dumps(enhanced_data, indent=2)}")
-            
-            # Store the enhanced resume data
-            resume_data[message.session_id] = enhanced_data
-            
-            return {
-                "response": "I've generated your resume! I've enhanced it with additional details to make it more professional. You can preview it below and download it as a DOCX file.",
-                "resume_data": enhanced_data,
-                "completed": True
-            }
-        
-        # Process current step
-        current_field = CONVERSATION_FLOW[current_step]["field"]
-        
-        # Parse the response based on the field type
-        if current_field == "skills":
-            session["resume_data"][current_field] = [skill.strip() for skill in message.message.split(",")]
-        elif current_field == "education":
-            # Initialize education array if it doesn't exist
-            if "education" not in session["resume_data"]:
-                session["resume_data"]["education"] = []
-            # Add new education entry
-            session["resume_data"]["education"].append({
-                "institution": message.message,
-                "degree": "",
-                "year_range": "",
-                "cgpa": "",
-                "location": ""
-            })
-        elif current_field == "education_degree":
-            # Update the most recent education entry
-            if session["resume_data"]["education"]:
-                session["resume_data"]["education"][-1]["degree"] = message.message
-        elif current_field == "education_year":
-            # Update the most recent education entry
-            if session["resume_data"]["education"]:
-                session["resume_data"]["education"][-1]["year_range"] = message.message
-        elif current_field == "education_cgpa":
-            # Update the most recent education entry
-            if session["resume_data"]["education"]:
-                session["resume_data"]["education"][-1]["cgpa"] = message.message
-        elif current_field == "projects":
-            session["resume_data"][current_field] = [{
-                "name": message.message.split(":")[0].strip(),
-                "description": message.message.split(":")[1].strip() if ":" in message.message else ""
-            }]
-        elif current_field == "experience":
-            session["resume_data"][current_field] = [{
-                "title": message.message.split(",")[0].strip(),
-                "company": message.message.split(",")[1].strip() if "," in message.message else "",
-                "duration": message.message.split(",")[2].strip() if len(message.message.split(",")) > 2 else "",
-                "description": message.message.split(",")[3].strip() if len(message.message.split(",")) > 3 else ""
-            }]
-        elif current_field == "certifications":
-            session["resume_data"][current_field] = [{
-                "title": message.message.split(",")[0].strip(),
-                "issuer": message.message.split(",")[1].strip() if "," in message.message else "",
-                "date": message.message.split(",")[2].strip() if len(message.message.split(",")) > 2 else ""
-            }]
-        else:
-            session["resume_data"][current_field] = message.message
-        
-        # Move to next step
-        session["current_step"] += 1
-        
-        if session["current_step"] < len(CONVERSATION_FLOW):
-            return {
-                "response": "Got it!",
-                "question": CONVERSATION_FLOW[session["current_step"]]["question"]
-            }
-        else:
-            # Ensure all required fields are present in the resume data
-            for field in ['name', 'title', 'phone', 'email', 'location', 'summary', 
-                         'education', 'skills', 'projects', 'experience', 'certifications']:
-                if field not in session["resume_data"]:
-                    session["resume_data"][field] = ""
-            
-            # Log the original resume data
-            logger.info(f"Original resume data: {json.dumps(session['resume_data'], indent=2)}")
-            
-            # Enhance the resume data using Ollama when all questions are answered
-            enhanced_data = await ollama_client.enhance_resume(session["resume_data"])
-            
-            # Log the enhanced resume data
-            logger.info(f"Enhanced resume data: {json.dumps(enhanced_data, indent=2)}")
-            
-            resume_data[message.session_id] = enhanced_data
-            
+        if _completes_flow(session, message.message):
+            _admit(message.session_id, session, check_capacity=not message.background)
+
+        reply, ready, _ = await _advance_session(message.session_id, message.message)
+        if not ready:
+            return reply
+
+        if message.background:
             return {
-                "response": "Thank you! I've enhanced your resume with additional details. Type 'Generate my resume' to proceed.",
-                "resume_data": enhanced_data,
-                "completed": True
+                **reply,
+                **_submit_job(
+                    "enhance",
+                    message.session_id,
+                    lambda: _enhance_session(message.session_id, message.use_cache)
+                ),
+                "completed": False
             }
+
+        enhanced_data = await _enhance_session(message.session_id, message.use_cache)
+
+        return {
+            **reply,
+            "resume_data": enhanced_data,
+            "completed": True
+        }
             
+    except (HTTPException, SchedulerRejected):
+        raise
+    except Exception as e:
+        logger.error(f"Error processing message: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error processing message")
+
+def _check_answers(session: Dict, answers: Dict[str, str]) -> None:
+    """
+    Make sure answers cover exactly the questions the session has left.
+
+    Raises:
+        HTTPException: 422 for an empty submission, unknown fields or
+            unanswered questions, 409 if the session already has some of
+            the answers or is complete ("Generate my resume" regenerates)
+    """
+    if not answers:
+        raise HTTPException(status_code=422, detail="No answers given")
+    if session["current_step"] >= len(CONVERSATION_FLOW):
+        raise HTTPException(status_code=409, detail="All questions are already answered")
+    fields = [entry["field"] for entry in CONVERSATION_FLOW]
+    unknown = [field for field in answers if field not in fields]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    answered = [field for field in fields[:session["current_step"]] if field in answers]
+    if answered:
+        raise HTTPException(status_code=409, detail=f"Already answered: {', '.join(answered)}")
+    missing = [field for field in fields[session["current_step"]:] if field not in answers]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing answers: {', '.join(missing)}")
+
+def _apply_answers(session: Dict, answers: Dict[str, str]) -> None:
+    """Record every remaining answer in flow order, as /api/chat would one at a time."""
+    _check_answers(session, answers)
+    for entry in CONVERSATION_FLOW[session["current_step"]:]:
+        _record_message(session, answers[entry["field"]])
+        _apply_answer(session["resume_data"], entry["field"], answers[entry["field"]])
+    session["current_step"] = len(CONVERSATION_FLOW)
+
+@app.post("/api/session/{session_id}/answers")
+async def submit_answers(session_id: str, submission: SessionAnswers):
+    """
+    Answer all remaining questions of a session in one request.
+
+    answers maps each CONVERSATION_FLOW field (name, title, ..., education,
+    education_degree, education_year, education_cgpa, skills, projects,
+    experience, certifications) to the text a user would have typed, and is
+    parsed with the same rules as /api/chat. With enhance (the default) the
+    resume is enhanced in the same request, or as a job with background;
+    otherwise the session waits for "Generate my resume" as usual.
+    """
+    session = await sessions.get_async(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    # Reject bad submissions before they count against the user's rate
+    _check_answers(session, submission.answers)
+    if submission.enhance:
+        _admit(session_id, session, check_capacity=not submission.background)
+
+    # Checked again inside the update in case a /api/chat message raced in
+    if await sessions.update_async(session_id, lambda s: _apply_answers(s, submission.answers)) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if not submission.enhance:
+        return {
+            "response": "Thank you! Type 'Generate my resume' to proceed.",
+            "completed": False
+        }
+
+    reply = {
+        "response": "Thank you! I've enhanced your resume with additional details. You can preview it below and download it as a DOCX file."
+    }
+    if submission.background:
+        return {
+            **reply,
+            **_submit_job(
+                "enhance",
+                session_id,
+                lambda: _enhance_session(session_id, submission.use_cache)
+            ),
+            "completed": False
+        }
+
+    try:
+        enhanced_data = await _enhance_session(session_id, submission.use_cache)
+    except Exception as e:
+        logger.error(f"Error enhancing submitted answers: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error processing answers")
+    return {
+        **reply,
+        "resume_data": enhanced_data,
+        "completed": True
+    }
+
+@app.post("/api/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """
+    Same as /api/chat, but answers over Server-Sent Events.
+
+    When the message completes the conversation, enhancement tokens are
+    forwarded as "token" events while Ollama writes them. Every stream ends
+    with a "done" event carrying the same body /api/chat would return.
+    """
+    session = await sessions.get_async(message.session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if _completes_flow(session, message.message):
+        _admit(message.session_id, session)
+
+    try:
+        reply, ready, _ = await _advance_session(message.session_id, message.message)
     except Exception as e:
         logger.error(f"Error processing message: {str(e)}")
         raise HTTPException(status_code=500, detail="Error processing message")
 
+    async def events():
+        if not ready:
+            yield _sse_event("done", reply)
+            return
+        try:
+            resume = await _prepare_for_enhancement(message.session_id)
+            with speculator.final(message.session_id, resume, message.use_cache):
+                async with scheduler.slot(_enhance_priority(message.use_cache), queue_limit=False):
+                    async for event in ollama_client.enhance_resume_stream(resume, use_cache=message.use_cache):
+                        if event["type"] == "token":
+                            yield _sse_event("token", {"text": event["text"]})
+                        elif event["type"] == "section":
+                            yield _sse_event("section", {"field": event["section"], "value": event["value"]})
+                        else:
+                            await _store_enhanced(message.session_id, event["resume_data"])
+                            yield _sse_event("done", {
+                                **reply,
+                                "resume_data": event["resume_data"],
+                                "completed": True
+                            })
+        except Exception as e:
+            logger.error(f"Error processing message: {str(e)}")
+            yield _sse_event("error", {"detail": "Error processing message"})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+async def _push_state(session_id: str, session: Dict, outbox: Outbox) -> None:
+    """Tell a newly connected client where its session stands."""
+    run = chat_sockets.runs.get(session_id)
+    if run is not None:
+        run.attach(outbox)
+        return
+    step = session["current_step"]
+    resume = await resume_data.get_async(session_id) if step >= len(CONVERSATION_FLOW) else None
+    if step < len(CONVERSATION_FLOW):
+        outbox.send({"type": "question", "step": step, "question": CONVERSATION_FLOW[step]["question"]})
+    elif resume is not None:
+        outbox.send({"type": "resume", "resume_data": resume, "completed": True})
+    else:
+        outbox.send({"type": "reply", "response": "Type 'Generate my resume' to proceed."})
+
+async def _enhance_over_socket(session_id: str, run: EnhancementRun, use_cache: bool) -> None:
+    try:
+        resume = await _prepare_for_enhancement(session_id)
+        with speculator.final(session_id, resume, use_cache):
+            async with scheduler.slot(_enhance_priority(use_cache), queue_limit=False):
+                async for event in ollama_client.enhance_resume_stream(resume, use_cache=use_cache):
+                    if event["type"] == "token":
+                        run.publish_token(event["text"])
+                    elif event["type"] == "section":
+                        run.publish({"type": "section", "field": event["section"], "value": event["value"]})
+                    else:
+                        await _store_enhanced(session_id, event["resume_data"])
+                        run.publish({"type": "resume", "resume_data": event["resume_data"], "completed": True})
+    except Exception as e:
+        logger.error(f"Error enhancing resume: {str(e)}")
+        run.publish({"type": "error", "detail": "Error enhancing resume"})
+
+async def _handle_socket_message(session_id: str, session: Dict, data: Any, outbox: Outbox) -> None:
+    if not isinstance(data, dict) or data.get("type") not in ("message", "ping", "pong"):
+        outbox.send({"type": "error", "detail": 'Expected {"type": "message", "text": ...}'})
+        return
+    if data["type"] == "ping":
+        outbox.send({"type": "pong"})
+        return
+    if data["type"] == "pong":
+        return
+    text = data.get("text")
+    if not isinstance(text, str):
+        outbox.send({"type": "error", "detail": "Message text is missing"})
+        return
+    if session_id in chat_sockets.runs:
+        outbox.send({"type": "error", "detail": "Your resume is still being enhanced"})
+        return
+
+    if session["current_step"] >= len(CONVERSATION_FLOW) and not _is_generate_request(text):
+        outbox.send({"type": "reply", "response": "All questions are answered. Type 'Generate my resume' to proceed."})
+        return
+    try:
+        if _completes_flow(session, text):
+            _admit(session_id, session)
+        reply, ready, session = await _advance_session(session_id, text)
+    except SchedulerRejected as e:
+        outbox.send({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+        return
+    except Exception as e:
+        logger.error(f"Error processing message: {str(e)}")
+        outbox.send({"type": "error", "detail": "Error processing message"})
+        return
+
+    if not ready:
+        outbox.send({"type": "question", "step": session["current_step"], **reply})
+        return
+    outbox.send({"type": "reply", **reply})
+    use_cache = data.get("use_cache", True) is not False
+    run = chat_sockets.start_run(session_id, lambda run: _enhance_over_socket(session_id, run, use_cache))
+    run.attach(outbox)
+
+@app.websocket("/ws/chat/{session_id}")
+async def chat_socket(websocket: WebSocket, session_id: str):
+    """
+    The /api/chat conversation over one persistent connection.
+
+    Clients send {"type": "message", "text": ...} for each answer. The
+    server pushes "question" messages with the next question, "reply" once
+    the answers are complete, then enhancement progress ("progress",
+    "token" and "section") and finally "resume" with the enhanced resume.
+    Failures arrive as "error" messages and leave the connection open.
+
+    The server sends {"type": "ping"} every WS_HEARTBEAT_INTERVAL seconds;
+    any client message, e.g. {"type": "pong"}, counts as a sign of life.
+    Enhancements keep running when the connection drops. Reconnecting to
+    the same session pushes its current question, the progress of a
+    running enhancement, or the finished resume.
+    """
+    session = await sessions.get_async(session_id)
+    if session is None:
+        await websocket.accept()
+        await websocket.send_json({"type": "error", "detail": "Session not found"})
+        await close_websocket(websocket, CLOSE_SESSION_NOT_FOUND)
+        return
+
+    outbox = await chat_sockets.connect(session_id, websocket)
+    loop = asyncio.get_running_loop()
+    last_seen = loop.time()
+    writer = asyncio.create_task(outbox.run())
+    heartbeat = asyncio.create_task(chat_sockets.heartbeat(outbox, lambda: last_seen))
+    try:
+        await _push_state(session_id, session, outbox)
+        while True:
+            text = await websocket.receive_text()
+            last_seen = loop.time()
+            warmer.touch()
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                data = None
+            session = await sessions.get_async(session_id)
+            if session is None:
+                writer.cancel()
+                await websocket.send_json({"type": "error", "detail": "Session not found"})
+                await close_websocket(websocket, CLOSE_SESSION_NOT_FOUND)
+                break
+            await _handle_socket_message(session_id, session, data, outbox)
+    except (WebSocketDisconnect, RuntimeError):
+        # Closed by the client, or by the server after a timeout or overflow
+        pass
+    finally:
+        chat_sockets.disconnect(session_id, outbox)
+        heartbeat.cancel()
+        writer.cancel()
+        await asyncio.gather(heartbeat, writer, return_exceptions=True)
+
 @app.post("/api/generate")
-async def generate_resume(session_id: str):
-    if session_id not in sessions:
+async def generate_resume(session_id: str, background: bool = False):
+    session = await sessions.get_async(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
+
+    _admit(session_id, session, check_capacity=not background)
+
+    if background:
+        return _submit_job("generate", session_id, lambda: _generate_session(session_id))
     
     try:
-        # Generate resume using Ollama
-        markdown_resume = await ollama_client.generate_resume(sessions[session_id])
-        
-        # Parse markdown to JSON
-        parsed_resume = resume_parser.parse_markdown_to_json(markdown_resume)
-        
-        # Store the resume data
-        resume_data[session_id] = parsed_resume
-        
-        return parsed_resume
+        return await _generate_session(session_id)
     except Exception as e:
         logger.error(f"Error generating resume: {str(e)}")
         raise HTTPException(status_code=500, detail="Error generating resume")
 
+@app.post("/api/generate/stream")
+async def generate_resume_stream(session_id: str):
+    """
+    Same as /api/generate, but streams the Markdown as "token" events and
+    finishes with a "done" event holding the parsed resume.
+
+    Each field is parsed as soon as the model finishes it and sent as a
+    "section" event ({"field", "value"}); the session's resume data fills
+    in field by field, so previews can show the partial resume.
+    """
+    session = await sessions.get_async(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    _admit(session_id, session)
+
+    async def events():
+        try:
+            parser = IncrementalResumeParser(resume_parser)
+            async with scheduler.slot(BULK, queue_limit=False):
+                async for token in ollama_client.generate_resume_stream(session):
+                    yield _sse_event("token", {"text": token})
+                    fields = parser.feed(token)
+                    if fields:
+                        await _set_resume(session_id, parser.resume())
+                    for field, value in fields:
+                        yield _sse_event("section", {"field": field, "value": value})
+
+            for field, value in parser.close():
+                yield _sse_event("section", {"field": field, "value": value})
+            parsed_resume = parser.resume()
+            await _set_resume(session_id, parsed_resume)
+            yield _sse_event("done", parsed_resume)
+        except Exception as e:
+            logger.error(f"Error generating resume: {str(e)}")
+            yield _sse_event("error", {"detail": "Error generating resume"})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+def _validate_batch_item(raw: Any) -> Dict:
+    # JSONL uploads arrive as raw lines, JSON bodies as decoded objects
+    if isinstance(raw, bytes):
+        raw = json.loads(raw)
+    try:
+        return ResumeData.model_validate(raw).model_dump()
+    except ValidationError as e:
+        # Keep manifest entries short: one "field: problem" per error
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+            for error in e.errors()
+        ))
+
+async def _list_records(records: List) -> AsyncIterator[Any]:
+    for record in records:
+        yield record
+
+async def _jsonl_records(upload: UploadFile) -> AsyncIterator[bytes]:
+    # Read the upload in chunks so large files never sit in memory whole
+    buffer = b""
+    while True:
+        chunk = await upload.read(64 * 1024)
+        if not chunk:
+            break
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+@app.post("/api/batch/generate")
+async def batch_generate(request: Request, use_cache: bool = True):
+    """
+    Enhance and render many resumes in one call.
+
+    Accepts a JSON list of ResumeData records, or a multipart upload with a
+    JSONL file (one record per line) in the "file" field. Responds with a
+    ZIP of DOCX files streamed as items finish; per-item results, including
+    failures, are listed in its manifest.json.
+    """
+    client = request.client.host if request.client else "unknown"
+    scheduler.admit(f"batch:{client}")
+    scheduler.ensure_capacity()
+
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Upload a JSONL file in the 'file' field")
+        items = _jsonl_records(upload)
+    else:
+        try:
+            records = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON list of resumes")
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON list of resumes")
+        items = _list_records(records)
+
+    filename = f"resumes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(
+        batch_generator.stream(items, _validate_batch_item, use_cache=use_cache),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/queue/stats")
+async def get_queue_stats():
+    return {**job_queue.stats(), "scheduler": scheduler.stats()}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    """
+    Return a job's status and result.
+
+    With wait > 0 the request long-polls for up to that many seconds
+    (capped at JOB_MAX_WAIT) until the job finishes.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if wait > 0:
+        await job_queue.wait(job, min(wait, settings.JOB_MAX_WAIT))
+    return job.to_dict()
+
+@app.get("/api/jobs/{job_id}/events")
+async def get_job_events(job_id: str):
+    """Stream a "status" event on every job state change until it finishes."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for state in job_queue.watch(job):
+            yield _sse_event("status", state)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.get("/api/sessions/stats")
+async def get_session_stats():
+    return {
+        "sessions": await sessions.stats_async(),
+        "resumes": await resume_data.stats_async(),
+        "websockets": chat_sockets.stats()
+    }
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    return {**enhancement_cache.stats(), "artifacts": renderer.stats()}
+
+@app.get("/api/ready")
+async def readiness():
+    """Readiness probe: 503 until the Ollama model is loaded."""
+    state = warmer.stats()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
+@app.get("/api/backends/stats")
+async def backend_stats():
+    return ollama_client.backends.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of stage latencies, HTTP traffic and Ollama statistics."""
+    # Set as a header: a text/* media_type would get a second "; charset=" appended
+    return Response(content=REGISTRY.render(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+@app.get("/api/logging/stats")
+async def log_stats():
+    return logging_stats()
+
+@app.get("/api/enhance/stats")
+async def get_enhance_stats():
+    return {
+        "mode": ollama_client.enhance_mode,
+        "format": ollama_client.enhance_format,
+        "json": ollama_client.parse_stats.stats(),
+        "sections": ollama_client.section_stats.stats(),
+        "speculation": speculator.stats()
+    }
+
+@app.delete("/api/cache/enhance/{session_id}")
+async def invalidate_enhancement(session_id: str):
+    """Forget the cached enhancement for the session's current answers."""
+    session = await sessions.get_async(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    resume = _ensure_required_fields(dict(session["resume_data"]))
+    # Covers the whole-resume entry and every per-section entry
+    removed = [await enhancement_cache.invalidate_async(key) for key in ollama_client.enhance_cache_keys(resume)]
+    return {"invalidated": any(removed)}
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers the given ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
 @app.get("/api/resume_preview/{session_id}")
-async def get_resume_preview(session_id: str):
-    if session_id not in resume_data:
+async def get_resume_preview(session_id: str, request: Request):
+    resume = await resume_data.get_async(session_id)
+    if resume is None:
         raise HTTPException(status_code=404, detail="Resume not found")
+
+    content_hash = renderer.bind(session_id, resume)
+    etag = renderer.etag("html", content_hash, session_id)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
     
-    return templates.TemplateResponse(
-        "resume.html",
-        {
-            "request": None,  # Required by FastAPI
-            "resume": resume_data[session_id],
-            "session_id": session_id
-        }
-    )
+    artifact = renderer.html(resume, session_id, content_hash)
+    return HTMLResponse(artifact.content, headers={"ETag": artifact.etag, "Cache-Control": "no-cache"})
 
 @app.get("/api/download/{session_id}")
-async def download_resume(session_id: str):
-    if session_id not in resume_data:
+async def download_resume(session_id: str, request: Request):
+    resume = await resume_data.get_async(session_id)
+    if resume is None:
         raise HTTPException(status_code=404, detail="Resume not found")
+
+    content_hash = renderer.bind(session_id, resume)
+    etag = renderer.etag("docx", content_hash)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
     
     try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-            output_path = temp_file.name
-        
-        # Generate the DOCX file
-        docx_generator.generate_resume(resume_data[session_id], output_path)
+        # Serve the pre-rendered DOCX, join its in-progress render, or render it now
+        artifact = await renderer.docx(resume, content_hash)
         
-        # Return the file
-        return FileResponse(
-            output_path,
-            media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            filename=f"resume_{session_id}.docx"
+        return StreamingResponse(
+            io.BytesIO(artifact.content),
+            media_type=DOCX_MEDIA_TYPE,
+            headers={
+                "Content-Disposition": f'attachment; filename="resume_{session_id}.docx"',
+                "Content-Length": str(len(artifact.content)),
+                "ETag": artifact.etag,
+                "Cache-Control": "no-cache"
+            }
         )
     except Exception as e:
         logger.error(f"Error generating DOCX: {str(e)}")
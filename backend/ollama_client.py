@@ -1,14 +1,141 @@
 import aiohttp
+import asyncio
 import json
-from typing import Dict, List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 import logging
 
+import settings
+from backend_pool import Backend, BackendPool
+from enhancement_cache import EnhancementCache
+from fingerprint import fingerprint
+from logging_setup import LogPayload
+from metrics import (
+    OLLAMA_EVAL_SECONDS, OLLAMA_EVAL_TOKENS, OLLAMA_LOAD_SECONDS, OLLAMA_PROMPT_EVAL_SECONDS,
+    OLLAMA_PROMPT_TOKENS, OLLAMA_REQUESTS, OLLAMA_TIME_TO_FIRST_TOKEN, OLLAMA_TOKENS_PER_SECOND,
+    STAGE_SECONDS
+)
+from schemas import RESUME_SCHEMA, ParseStats, extract_json, section_schema
+from section_enhancement import (
+    SECTION_INSTRUCTIONS, SectionStats, create_section_prompt, merge_sections, parse_section, section_input
+)
+from single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever the enhancement prompt changes so cached results are not reused
+ENHANCE_PROMPT_VERSION = "1"
+
+# Fields every enhanced resume carries
+RESUME_FIELDS = ['name', 'title', 'phone', 'email', 'location', 'summary',
+                 'education', 'skills', 'projects', 'experience', 'certifications']
+
+class OllamaAPIError(Exception):
+    """Ollama answered a request with an error status."""
+
+    def __init__(self, status: int):
+        super().__init__(f"Ollama API error: {status}")
+        self.status = status
+
+def _retryable(error: Exception) -> bool:
+    # Connection problems, timeouts and server-side errors are the backend's
+    # fault; a 404 usually means that server has not pulled the model
+    if isinstance(error, OllamaAPIError):
+        return error.status >= 500 or error.status == 404
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
 class OllamaClient:
-    def __init__(self):
-        self.base_url = "http://localhost:11434/api"
-        self.model = "llama3"  # Using llama3 model
+    def __init__(
+        self,
+        base_url: Union[str, Sequence[str]] = settings.OLLAMA_BASE_URL,
+        model: str = settings.OLLAMA_MODEL,
+        pool_size: int = settings.OLLAMA_POOL_SIZE,
+        pool_per_host: int = settings.OLLAMA_POOL_PER_HOST,
+        keepalive_timeout: float = settings.OLLAMA_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = settings.OLLAMA_DNS_CACHE_TTL,
+        connect_timeout: float = settings.OLLAMA_CONNECT_TIMEOUT,
+        read_timeout: float = settings.OLLAMA_READ_TIMEOUT,
+        cache: Optional[EnhancementCache] = None,
+        enhance_mode: str = settings.ENHANCE_MODE,
+        keep_alive: str = settings.OLLAMA_KEEP_ALIVE,
+        max_failures: int = settings.OLLAMA_MAX_FAILURES,
+        eject_seconds: float = settings.OLLAMA_EJECT_SECONDS,
+        health_interval: float = settings.OLLAMA_HEALTH_INTERVAL,
+        enhance_format: str = settings.ENHANCE_FORMAT,
+    ):
+        # One or more Ollama servers; a string may list several separated by commas
+        urls = base_url.split(",") if isinstance(base_url, str) else list(base_url)
+        self.backends = BackendPool(
+            [url.strip() for url in urls if url.strip()],
+            max_failures=max_failures,
+            eject_seconds=eject_seconds,
+            health_interval=health_interval
+        )
+        self.base_url = self.backends.backends[0].url
+        self.health_timeout = aiohttp.ClientTimeout(total=connect_timeout)
+        self.model = model  # Using llama3 model
+        # Sent with every request so Ollama does not unload the model between users
+        self.keep_alive = keep_alive
+        self.pool_size = pool_size
+        self.pool_per_host = pool_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=connect_timeout,
+            sock_read=read_timeout
+        )
+        self.enhance_options = {
+            "temperature": 0.7,
+            "top_p": 0.9,
+            "max_tokens": 2000
+        }
+        self.cache = cache
+        # "whole" sends one prompt for the resume, "sections" one per section
+        self.enhance_mode = enhance_mode
+        self.section_stats = SectionStats()
+        # "schema", "json" or "none"; see _format()
+        self.enhance_format = enhance_format
+        self.parse_stats = ParseStats()
+        self.single_flight = SingleFlight()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self) -> None:
+        """
+        Open the shared HTTP session and its connection pool.
+
+        Called from the application lifespan hook; calling it again while a
+        session is open is a no-op.
+        """
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        self.backends.start_health_checks(self._check_backend)
+        logger.info(
+            f"Ollama connection pool opened (limit={self.pool_size}, per_host={self.pool_per_host}, "
+            f"backends={len(self.backends.backends)})"
+        )
+
+    async def close(self) -> None:
+        """Close the shared HTTP session and release pooled connections."""
+        await self.backends.stop_health_checks()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Ollama connection pool closed")
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Lazily open the pool when the client is used outside the app lifespan
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
 
     async def generate_resume(self, user_data: Dict) -> str:
         """
@@ -20,29 +147,156 @@ class OllamaClient:
         Returns:
             str: Generated response text
         """
-        prompt = self._create_prompt(user_data)
+        with STAGE_SECONDS.time("prompt_build"):
+            prompt = self._create_prompt(user_data)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False
-                    }
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Ollama API error: {error_text}")
-                        raise Exception(f"Ollama API error: {response.status}")
-                    
-                    result = await response.json()
-                    return result["response"]
+            result = await self._generate({
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False
+            })
+            return result["response"]
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
             raise
 
+    async def _generate(self, payload: Dict, kind: str = "generate") -> Dict:
+        """
+        Post a non-streaming generate request.
+
+        Concurrent calls with an identical payload share one upstream request.
+
+        Args:
+            payload: Generate request body
+            kind: What the call is for, as labelled in the metrics
+
+        Returns:
+            Dict: Ollama's decoded response; callers must not mutate it
+        """
+        return await self.single_flight.do(
+            fingerprint(payload),
+            lambda: self._post_generate(payload, kind)
+        )
+
+    def _record_generation(self, kind: str, result: Dict, first_token_seconds: Optional[float] = None) -> None:
+        """Record the statistics Ollama reports in a final response; durations are in nanoseconds."""
+        OLLAMA_REQUESTS.inc(1, kind, "ok")
+        load = result.get("load_duration")
+        prompt_eval = result.get("prompt_eval_duration")
+        if load is not None:
+            OLLAMA_LOAD_SECONDS.observe(load / 1e9, kind)
+        if first_token_seconds is None and load is not None and prompt_eval is not None:
+            first_token_seconds = (load + prompt_eval) / 1e9
+        if first_token_seconds is not None:
+            OLLAMA_TIME_TO_FIRST_TOKEN.observe(first_token_seconds, kind)
+        if "prompt_eval_count" in result:
+            OLLAMA_PROMPT_TOKENS.inc(result["prompt_eval_count"], kind)
+        if prompt_eval is not None:
+            OLLAMA_PROMPT_EVAL_SECONDS.observe(prompt_eval / 1e9, kind)
+        eval_count, eval_duration = result.get("eval_count"), result.get("eval_duration")
+        if eval_count is not None:
+            OLLAMA_EVAL_TOKENS.inc(eval_count, kind)
+        if eval_duration:
+            OLLAMA_EVAL_SECONDS.observe(eval_duration / 1e9, kind)
+            if eval_count is not None:
+                OLLAMA_TOKENS_PER_SECOND.observe(eval_count / (eval_duration / 1e9), kind)
+
+    async def load_model(self) -> Dict:
+        """
+        Load the model into memory on every backend without generating anything.
+
+        Ollama treats a generate request without a prompt as a load request;
+        it also resets the model's keep_alive timer.
+
+        Returns:
+            Dict: The first backend's response, including "load_duration" in
+            nanoseconds
+
+        Raises:
+            Exception: The first error, if no backend loaded the model
+        """
+        body = {"model": self.model, "stream": False, "keep_alive": self.keep_alive}
+        results = await asyncio.gather(
+            *[self._load_on(backend, body) for backend in self.backends.backends],
+            return_exceptions=True
+        )
+        for result in results:
+            if not isinstance(result, BaseException):
+                return result
+        raise results[0]
+
+    async def _load_on(self, backend: Backend, body: Dict) -> Dict:
+        with self.backends.track(backend):
+            try:
+                result = await self._post_to(backend, body)
+            except Exception as e:
+                self.backends.record_failure(backend, e)
+                OLLAMA_REQUESTS.inc(1, "load", "error")
+                raise
+        self.backends.record_success(backend)
+        self._record_generation("load", result)
+        return result
+
+    async def _post_generate(self, payload: Dict, kind: str = "generate") -> Dict:
+        """
+        Post a non-streaming generate request, failing over between backends.
+
+        Generate calls are idempotent, so a request that fails on one backend
+        for a reason that is not the request's fault is retried on another.
+        """
+        body = {**payload, "stream": False, "keep_alive": self.keep_alive}
+        tried: List[Backend] = []
+        error: Optional[Exception] = None
+        while True:
+            try:
+                backend = self._next_backend(tried, error)
+            except Exception:
+                OLLAMA_REQUESTS.inc(1, kind, "error")
+                raise
+            with self.backends.track(backend):
+                try:
+                    result = await self._post_to(backend, body)
+                except Exception as e:
+                    if not _retryable(e):
+                        OLLAMA_REQUESTS.inc(1, kind, "error")
+                        raise
+                    error = self._backend_failed(backend, e)
+                    continue
+            self.backends.record_success(backend)
+            self._record_generation(kind, result)
+            return result
+
+    def _next_backend(self, tried: List[Backend], error: Optional[Exception]) -> Backend:
+        # Raises the last error once every backend has failed this request
+        backend = self.backends.pick(tried)
+        if backend is None:
+            raise error
+        if tried:
+            self.backends.retries += 1
+        tried.append(backend)
+        return backend
+
+    def _backend_failed(self, backend: Backend, error: Exception) -> Exception:
+        self.backends.record_failure(backend, error)
+        logger.warning(f"Ollama backend {backend.url} failed: {type(error).__name__} {str(error)}")
+        return error
+
+    async def _post_to(self, backend: Backend, body: Dict) -> Dict:
+        session = await self._get_session()
+        async with session.post(f"{backend.url}/generate", json=body) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Ollama API error: {error_text}")
+                raise OllamaAPIError(response.status)
+            return await response.json()
+
+    async def _check_backend(self, backend: Backend) -> bool:
+        # /tags is cheap and answers as soon as the server is up
+        session = await self._get_session()
+        async with session.get(f"{backend.url}/tags", timeout=self.health_timeout) as response:
+            return response.status == 200
+
     def _create_prompt(self, user_data: Dict) -> str:
         """
         Create a prompt for the Ollama model based on user data.
@@ -82,6 +336,9 @@ Skills:
 Projects:
 {self._format_projects(user_data.get('projects', []))}
 
+Experience:
+{self._format_experience(user_data.get('experience', []))}
+
 Certifications:
 {self._format_certifications(user_data.get('certifications', []))}
 
@@ -104,16 +361,20 @@ Use bullet points for lists and maintain a professional tone throughout.
             for proj in projects
         ])
 
+    def _format_experience(self, experience: List[Dict]) -> str:
+        return "\n".join([
+            f"- {exp.get('title', '')} at {exp.get('company', '')} ({exp.get('duration', '')}): {exp.get('description', '')}"
+            for exp in experience
+        ])
+
     def _format_certifications(self, certifications: List[Dict]) -> str:
         return "\n".join([
             f"- {cert.get('title', '')} - {cert.get('issuer', '')} ({cert.get('date', '')})"
             for cert in certifications
         ])
 
-    async def enhance_resume(self, resume_data):
-        try:
-            # Prepare the prompt for enhancing the resume
-            prompt = f"""You are a professional resume writer. Please enhance the following resume data to make it more professional and detailed.
+    def _create_enhance_prompt(self, resume_data: Dict) -> str:
+        return f"""You are a professional resume writer. Please enhance the following resume data to make it more professional and detailed.
             Keep the original information but expand upon it professionally.
 
             Original Resume Data:
@@ -133,45 +394,369 @@ Use bullet points for lists and maintain a professional tone throughout.
 
             Return the enhanced data in the same JSON format. Only return the JSON, no additional text."""
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "top_p": 0.9,
-                            "max_tokens": 2000
-                        }
-                    }
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        try:
-                            # The response should be a JSON string
-                            enhanced_data = json.loads(result["response"])
-                            
-                            # Ensure all required fields are present
-                            for field in ['name', 'title', 'phone', 'email', 'location', 'summary', 
-                                        'education', 'skills', 'projects', 'experience', 'certifications']:
-                                if field not in enhanced_data:
-                                    enhanced_data[field] = resume_data.get(field, '')
-                            
-                            # Log the enhanced data for debugging
-                            logger.info(f"Enhanced resume data: {json.dumps(enhanced_data, indent=2)}")
-                            
-                            return enhanced_data
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Failed to parse enhanced resume data: {str(e)}")
-                            logger.error(f"Raw response: {result['response']}")
-                            return resume_data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Error from Ollama API: {response.status} - {error_text}")
-                        return resume_data
+    def _format(self, schema: Dict) -> Dict:
+        # Constrain decoding so answers are JSON of the expected shape instead
+        # of relying on the prompt's "Only return the JSON"
+        if self.enhance_format == "schema":
+            return {"format": schema}
+        if self.enhance_format == "json":
+            return {"format": "json"}
+        return {}
+
+    def _enhance_payload(self, resume_data: Dict, stream: bool) -> Dict:
+        with STAGE_SECONDS.time("prompt_build"):
+            prompt = self._create_enhance_prompt(resume_data)
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": self.enhance_options,
+            **self._format(RESUME_SCHEMA)
+        }
+
+    def _decode(self, kind: str, raw_response: str) -> Any:
+        """
+        Decode the JSON in a model answer and count how it went.
+
+        Args:
+            kind: "resume" or the section name, for the counters
+            raw_response: Complete text generated by the model
+
+        Returns:
+            Any: The decoded value
+
+        Raises:
+            ValueError: If the answer holds no JSON object or array
+        """
+        try:
+            with STAGE_SECONDS.time("json_parse"):
+                value, outcome = extract_json(raw_response)
+        except ValueError:
+            self.parse_stats.record(kind, "failed")
+            raise
+        self.parse_stats.record(kind, outcome)
+        if outcome == "recovered":
+            logger.warning(f"Recovered {kind} JSON from a malformed answer")
+        return value
+
+    def enhance_cache_key(self, resume_data: Dict) -> str:
+        """Fingerprint of everything that determines an enhancement result."""
+        return fingerprint(resume_data, self.model, ENHANCE_PROMPT_VERSION, self.enhance_options)
+
+    def section_cache_key(self, section: str, resume_data: Dict) -> str:
+        return fingerprint(
+            "section", section, section_input(section, resume_data),
+            self.model, ENHANCE_PROMPT_VERSION, self.enhance_options
+        )
+
+    def enhance_cache_keys(self, resume_data: Dict) -> List[str]:
+        """Every cache key an enhancement of resume_data may be stored under, in either mode."""
+        return [self.enhance_cache_key(resume_data)] + [
+            self.section_cache_key(section, resume_data) for section in SECTION_INSTRUCTIONS
+        ]
+
+    def _parse_enhanced(self, raw_response: str, resume_data: Dict) -> Optional[Dict]:
+        """
+        Parse the model's JSON answer.
+
+        Args:
+            raw_response: Complete text generated by the model
+            resume_data: Resume data that was sent for enhancement
+
+        Returns:
+            Optional[Dict]: Enhanced resume data, or None if no JSON object can
+            be recovered from the answer
+        """
+        try:
+            enhanced_data = self._decode("resume", raw_response)
+        except ValueError as e:
+            logger.error(f"Failed to parse enhanced resume data: {str(e)}")
+            logger.error("Raw response: %s", LogPayload(raw_response))
+            return None
+        if not isinstance(enhanced_data, dict):
+            logger.error("Enhanced resume data is not an object: %s", LogPayload(raw_response))
+            return None
+
+        # Ensure all required fields are present
+        for field in RESUME_FIELDS:
+            if field not in enhanced_data:
+                enhanced_data[field] = resume_data.get(field, '')
+        
+        # The app logs the stored result at INFO already
+        logger.debug("Parsed enhanced resume data: %s", LogPayload(enhanced_data))
+
+        return enhanced_data
+
+    async def _stream_generate(self, payload: Dict, kind: str = "generate") -> AsyncIterator[Dict]:
+        """
+        Post a streaming generate request and yield Ollama's NDJSON chunks.
+
+        A backend that fails before sending anything is retried on another;
+        once chunks have been yielded, errors are raised to the caller.
+
+        Args:
+            payload: Generate request body; "stream" is forced to True
+            kind: What the call is for, as labelled in the metrics
+
+        Yields:
+            Dict: Each decoded chunk, ending with the one where "done" is true
+        """
+        body = {**payload, "stream": True, "keep_alive": self.keep_alive}
+        tried: List[Backend] = []
+        error: Optional[Exception] = None
+        start = time.perf_counter()
+        first_token_seconds: Optional[float] = None
+        while True:
+            try:
+                backend = self._next_backend(tried, error)
+            except Exception:
+                OLLAMA_REQUESTS.inc(1, kind, "error")
+                raise
+            started = False
+            with self.backends.track(backend):
+                try:
+                    async for chunk in self._stream_from(backend, body):
+                        started = True
+                        if first_token_seconds is None and chunk.get("response"):
+                            first_token_seconds = time.perf_counter() - start
+                        if chunk.get("done"):
+                            self._record_generation(kind, chunk, first_token_seconds)
+                        yield chunk
+                except Exception as e:
+                    if not _retryable(e) or started:
+                        OLLAMA_REQUESTS.inc(1, kind, "error")
+                    if not _retryable(e):
+                        raise
+                    error = self._backend_failed(backend, e)
+                    if started:
+                        raise
+                    continue
+            self.backends.record_success(backend)
+            return
+
+    async def _stream_from(self, backend: Backend, body: Dict) -> AsyncIterator[Dict]:
+        session = await self._get_session()
+        async with session.post(f"{backend.url}/generate", json=body) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Ollama API error: {error_text}")
+                raise OllamaAPIError(response.status)
+
+            # Ollama writes one JSON object per line as tokens are produced
+            async for line in response.content:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise Exception(f"Ollama API error: {chunk['error']}")
+                yield chunk
+                if chunk.get("done"):
+                    break
+
+    async def generate_resume_stream(self, user_data: Dict) -> AsyncIterator[str]:
+        """
+        Stream a generated resume token by token.
+
+        Args:
+            user_data: Dictionary containing user's information or chat context
+
+        Yields:
+            str: Response text fragments in generation order
+        """
+        with STAGE_SECONDS.time("prompt_build"):
+            prompt = self._create_prompt(user_data)
+        payload = {
+            "model": self.model,
+            "prompt": prompt
+        }
+        try:
+            async for chunk in self._stream_generate(payload):
+                if chunk.get("response"):
+                    yield chunk["response"]
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            raise
+
+    async def _cached_enhancement(self, resume_data: Dict, use_cache: bool) -> Tuple[Optional[str], Optional[Dict]]:
+        # Returns the cache key to store under (if caching) and any cached result
+        if self.cache is None:
+            return None, None
+        key = self.enhance_cache_key(resume_data)
+        return key, await self.cache.get_async(key) if use_cache else None
+
+    async def enhance_resume(self, resume_data, use_cache: bool = True):
+        """
+        Enhance resume data with the model, falling back to the original data.
+
+        Args:
+            resume_data: Resume data collected from the conversation
+            use_cache: When False, skip the cache lookup and regenerate; the
+                fresh result still replaces the cached entry
+
+        Returns:
+            Dict: Enhanced resume data, or resume_data if enhancement failed
+        """
+        if self.enhance_mode == "sections":
+            return await self._enhance_by_sections(resume_data, use_cache)
+
+        cache_key, cached = await self._cached_enhancement(resume_data, use_cache)
+        if cached is not None:
+            return cached
+
+        try:
+            result = await self._generate(self._enhance_payload(resume_data, stream=False), "enhance")
+            enhanced_data = self._parse_enhanced(result["response"], resume_data)
+            if enhanced_data is None:
+                return resume_data
+            if cache_key is not None:
+                await self.cache.put_async(cache_key, enhanced_data)
+            return enhanced_data
+
+        except Exception as e:
+            logger.error(f"Error enhancing resume: {str(e)}")
+            return resume_data
+
+    async def enhance_resume_stream(self, resume_data: Dict, use_cache: bool = True) -> AsyncIterator[Dict]:
+        """
+        Stream the enhancement of resume data.
+
+        Token events are yielded as the model writes them; the final event
+        carries the buffered result, parsed exactly as enhance_resume does.
+        A cache hit yields the result event alone.
+
+        Args:
+            resume_data: Resume data collected from the conversation
+            use_cache: Same meaning as for enhance_resume
+
+        In "sections" mode, one {"type": "section", "section": ...,
+        "value": ...} event is yielded per enhanced section instead of tokens.
+
+        Yields:
+            Dict: {"type": "token", "text": ...} events followed by one
+            {"type": "result", "resume_data": ...} event
+        """
+        if self.enhance_mode == "sections":
+            enhanced_sections = {}
+            async for section, value in self.enhance_sections(resume_data, use_cache):
+                if value is not None:
+                    enhanced_sections[section] = value
+                    yield {"type": "section", "section": section, "value": value}
+            yield {"type": "result", "resume_data": self._merge_sections(resume_data, enhanced_sections)}
+            return
 
+        cache_key, cached = await self._cached_enhancement(resume_data, use_cache)
+        if cached is not None:
+            yield {"type": "result", "resume_data": cached}
+            return
+
+        parts = []
+        try:
+            async for chunk in self._stream_generate(self._enhance_payload(resume_data, stream=True), "enhance"):
+                token = chunk.get("response", "")
+                if token:
+                    parts.append(token)
+                    yield {"type": "token", "text": token}
         except Exception as e:
             logger.error(f"Error enhancing resume: {str(e)}")
-            return resume_data 
\ No newline at end of file
+            yield {"type": "result", "resume_data": resume_data}
+            return
+
+        enhanced_data = self._parse_enhanced("".join(parts), resume_data)
+        if enhanced_data is None:
+            enhanced_data = resume_data
+        elif cache_key is not None:
+            await self.cache.put_async(cache_key, enhanced_data)
+        yield {"type": "result", "resume_data": enhanced_data}
+
+    def _section_payload(self, section: str, resume_data: Dict) -> Dict:
+        with STAGE_SECONDS.time("prompt_build"):
+            prompt = create_section_prompt(section, resume_data)
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": self.enhance_options,
+            **self._format(section_schema(section))
+        }
+
+    def enhanced_sections(self, resume_data: Dict) -> List[str]:
+        """Sections a section-mode enhancement of resume_data sends prompts for."""
+        return [section for section in SECTION_INSTRUCTIONS if resume_data.get(section)]
+
+    async def enhance_section(self, section: str, resume_data: Dict,
+                              use_cache: bool = True) -> Tuple[str, Any, str, float]:
+        """
+        Enhance one section, returning (section, value, outcome, seconds).
+
+        value is None unless the outcome is "enhanced" or "cached"; failed
+        and empty ("skipped") sections keep the original data.
+        """
+        if not resume_data.get(section):
+            self.section_stats.record(section, "skipped")
+            return section, None, "skipped", 0.0
+
+        cache_key = self.section_cache_key(section, resume_data) if self.cache is not None else None
+        if cache_key is not None and use_cache:
+            cached = await self.cache.get_async(cache_key)
+            if cached is not None:
+                self.section_stats.record(section, "cached")
+                return section, cached["value"], "cached", 0.0
+
+        start = time.perf_counter()
+        try:
+            result = await self._generate(self._section_payload(section, resume_data), "section")
+            value = parse_section(section, self._decode(section, result["response"]), resume_data[section])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            self.section_stats.record(section, "failed", elapsed)
+            logger.warning(f"Enhancing {section} failed, keeping the original: {str(e)}")
+            return section, None, "failed", elapsed
+
+        elapsed = time.perf_counter() - start
+        self.section_stats.record(section, "enhanced", elapsed)
+        if cache_key is not None:
+            await self.cache.put_async(cache_key, {"value": value})
+        return section, value, "enhanced", elapsed
+
+    async def enhance_sections(self, resume_data: Dict, use_cache: bool = True) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Enhance every section concurrently, one prompt each.
+
+        Args:
+            resume_data: Resume data collected from the conversation
+            use_cache: Same meaning as for enhance_resume, per section
+
+        Yields:
+            Tuple[str, Any]: (section, enhanced value) in completion order;
+            the value is None when the section keeps its original data
+        """
+        tasks = [
+            asyncio.ensure_future(self.enhance_section(section, resume_data, use_cache))
+            for section in SECTION_INSTRUCTIONS
+        ]
+        timings = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                section, value, outcome, elapsed = await next_done
+                timings[section] = f"{outcome} {elapsed:.2f}s"
+                yield section, value
+        finally:
+            for task in tasks:
+                task.cancel()
+        logger.info(f"Section enhancement: {json.dumps(timings)}")
+
+    async def _enhance_by_sections(self, resume_data: Dict, use_cache: bool) -> Dict:
+        enhanced_sections = {}
+        async for section, value in self.enhance_sections(resume_data, use_cache):
+            if value is not None:
+                enhanced_sections[section] = value
+        return self._merge_sections(resume_data, enhanced_sections)
+
+    def _merge_sections(self, resume_data: Dict, enhanced_sections: Dict) -> Dict:
+        if not enhanced_sections:
+            # Nothing was enhanced; callers can tell by identity
+            return resume_data
+        return merge_sections(resume_data, enhanced_sections, RESUME_FIELDS)
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Deque, Dict, NamedTuple, Set
+
+import jinja2
+
+from artifact_cache import ArtifactCache
+from docx_generator import render_docx
+from fingerprint import fingerprint
+from metrics import STAGE_SECONDS
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# How a download was served: already rendered, joined an in-progress
+# render, or rendered on demand
+DOWNLOAD_PATHS = ("prebuilt", "in_progress", "cold")
+
+class Artifact(NamedTuple):
+    content: bytes
+    etag: str
+
+class ArtifactRenderer:
+    """
+    Renders downloadable resume artifacts and caches them by content hash.
+
+    DOCX rendering is CPU-bound python-docx work, so it runs in a thread or
+    process pool and returns the file as bytes; nothing touches the disk.
+    Rendered DOCX bytes and preview HTML are kept in an ArtifactCache and
+    carry strong ETags derived from the resume's content hash.
+
+    prerender() renders both artifacts in the background as soon as a
+    session's resume is final. DOCX renders are single-flighted by content
+    hash, so a download that arrives mid-render waits for that render
+    instead of starting a second one.
+    """
+
+    def __init__(self, env: jinja2.Environment, executor: str = "thread", workers: int = 4,
+                 cache_bytes: int = 64 * 1024 * 1024):
+        self.env = env
+        self.executor_kind = executor
+        self.workers = workers
+        self.cache = ArtifactCache(max_bytes=cache_bytes)
+        self.single_flight = SingleFlight()
+        self._executor: Executor = self._create_executor()
+        self._prerenders: Set[asyncio.Task] = set()
+        self.prerendered = 0
+        self.prerender_failures = 0
+        self._latencies: Dict[str, Deque[float]] = {path: deque(maxlen=1000) for path in DOWNLOAD_PATHS}
+
+    def _create_executor(self) -> Executor:
+        if self.executor_kind == "process":
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="docx")
+
+    def content_hash(self, resume: Dict) -> str:
+        return fingerprint(resume)
+
+    def bind(self, session_id: str, resume: Dict) -> str:
+        """Record the session's current resume, invalidating artifacts of its previous one."""
+        content_hash = self.content_hash(resume)
+        self.cache.bind(session_id, content_hash)
+        return content_hash
+
+    def etag(self, kind: str, content_hash: str, variant: str = "") -> str:
+        tag = fingerprint(content_hash, variant) if variant else content_hash
+        return f'"{kind}-{tag[:32]}"'
+
+    async def render_docx(self, resume: Dict) -> bytes:
+        # Includes waiting for a pool worker, and works with either pool kind
+        loop = asyncio.get_running_loop()
+        with STAGE_SECONDS.time("docx_render"):
+            return await loop.run_in_executor(self._executor, render_docx, resume)
+
+    async def _docx_content(self, resume: Dict, content_hash: str) -> bytes:
+        content = self.cache.get("docx", content_hash)
+        if content is None:
+            async def render() -> bytes:
+                rendered = await self.render_docx(resume)
+                self.cache.put("docx", content_hash, rendered)
+                return rendered
+            content = await self.single_flight.do(content_hash, render)
+        return content
+
+    async def docx(self, resume: Dict, content_hash: str) -> Artifact:
+        """
+        Serve the resume as DOCX bytes, recording which path served it.
+
+        Args:
+            resume: Resume data to render on a cache miss
+            content_hash: Content hash of resume, from bind()
+
+        Returns:
+            Artifact: DOCX bytes and their ETag
+        """
+        start = time.perf_counter()
+        if self.single_flight.is_running(content_hash):
+            path = "in_progress"
+        elif self.cache.contains("docx", content_hash):
+            path = "prebuilt"
+        else:
+            path = "cold"
+        content = await self._docx_content(resume, content_hash)
+        self._latencies[path].append(time.perf_counter() - start)
+        return Artifact(content, self.etag("docx", content_hash))
+
+    def html(self, resume: Dict, session_id: str, content_hash: str) -> Artifact:
+        # The preview links to its own download URL, so it varies by session
+        content = self.cache.get("html", content_hash, session_id)
+        if content is None:
+            with STAGE_SECONDS.time("html_render"):
+                content = self.env.get_template("resume.html").render(
+                    resume=resume,
+                    session_id=session_id
+                ).encode("utf-8")
+            self.cache.put("html", content_hash, content, session_id)
+        return Artifact(content, self.etag("html", content_hash, session_id))
+
+    def prerender(self, session_id: str, resume: Dict) -> None:
+        """
+        Render the session's DOCX and preview HTML in the background.
+
+        Must be called from the event loop. Artifacts that are already
+        cached are not rendered again.
+
+        Args:
+            session_id: Session the preview HTML is rendered for
+            resume: The session's final resume data
+        """
+        content_hash = self.bind(session_id, resume)
+        task = asyncio.ensure_future(self._prerender(session_id, resume, content_hash))
+        # Keep a reference so the task is not garbage-collected mid-render
+        self._prerenders.add(task)
+        task.add_done_callback(self._prerenders.discard)
+
+    async def _prerender(self, session_id: str, resume: Dict, content_hash: str) -> None:
+        try:
+            if not self.cache.contains("html", content_hash, session_id):
+                self.html(resume, session_id, content_hash)
+            if not self.cache.contains("docx", content_hash):
+                await self._docx_content(resume, content_hash)
+            self.prerendered += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.prerender_failures += 1
+            logger.error(f"Error pre-rendering artifacts for session {session_id}: {str(e)}")
+
+    def stats(self) -> Dict:
+        downloads = {}
+        for path, samples in self._latencies.items():
+            latencies = sorted(samples)
+            downloads[path] = {
+                "count": len(latencies),
+                "seconds_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+                "seconds_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+                "seconds_max": latencies[-1] if latencies else 0.0
+            }
+        return {
+            **self.cache.stats(),
+            "prerendering": len(self._prerenders),
+            "prerendered": self.prerendered,
+            "prerender_failures": self.prerender_failures,
+            "downloads": downloads
+        }
+
+    async def close(self) -> None:
+        for task in list(self._prerenders):
+            task.cancel()
+        await asyncio.gather(*self._prerenders, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
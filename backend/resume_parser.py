@@ -1,164 +1,461 @@
+import html
 import re
-import markdown
-from bs4 import BeautifulSoup
-from typing import Dict, List
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
 import logging
 
+from metrics import STAGE_SECONDS
+
 logger = logging.getLogger(__name__)
 
+# Block-level Markdown, matched one line at a time. The rules follow
+# Python-Markdown, which the parser used to render resumes through.
+ATX_HEADING = re.compile(r'^(#{1,6})(.*?)#*$')
+SETEXT_UNDERLINE = re.compile(r'^[=-]+[ ]*$')
+HORIZONTAL_RULE = re.compile(r'^[ ]{0,3}(?:(?:-+[ ]{0,2}){3,}|(?:_+[ ]{0,2}){3,}|(?:\*+[ ]{0,2}){3,})[ ]*$')
+LIST_ITEM = re.compile(r'^[ ]{0,3}(\d+\.|[*+-])[ ]+(.*)$')
+NESTED_LIST_ITEM = re.compile(r'^[ ]{4,7}(?:\d+\.|[*+-])[ ]+(.*)$')
+BLOCKQUOTE = re.compile(r'^[ ]{0,3}>')
+INDENT = '    '
+
+# Inline Markdown, reduced to the plain text a browser would show
+INLINE_MARKUP = re.compile(r'[\\`*_\[!<&]')
+ESCAPED = re.compile(r'\\([\\`*_{}\[\]()>#+\-.!])')
+CODE_SPAN = re.compile(r'(?<!`)(`+)(.+?)(?<!`)\1(?!`)', re.DOTALL)
+IMAGE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+AUTOLINK = re.compile(r'<((?:https?|ftp)://[^>]*|[^>@\s]+@[^>\s]+)>')
+HTML_TAG = re.compile(r'</?[A-Za-z][^>]*>')
+STRONG = re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1', re.DOTALL)
+EMPHASIS = re.compile(r'\*(?=\S)(.+?)(?<=\S)\*|(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)', re.DOTALL)
+ENTITY = re.compile(r'&(?:#\d+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);')
+STASHED = re.compile(r'\x02(\d+)\x03')
+
+class ListItem(NamedTuple):
+    text: str  # Full item text, nested items included
+    own: str  # The item's text without its nested items
+    children: List[str]
+
+# A parsed block: ("heading", level, text), ("paragraph", text) or
+# ("list", ordered, items)
+Block = Tuple
+
+def inline_text(text: str) -> str:
+    """Strip inline Markdown (emphasis, code, links, HTML, entities) from text."""
+    if not INLINE_MARKUP.search(text):
+        return text
+
+    # Escapes and code spans are literal, so hide them from the other rules
+    stash: List[str] = []
+
+    def keep(value: str) -> str:
+        stash.append(value)
+        return f'\x02{len(stash) - 1}\x03'
+
+    text = ESCAPED.sub(lambda m: keep(m.group(1)), text)
+    text = CODE_SPAN.sub(lambda m: keep(m.group(2).strip()), text)
+    text = IMAGE.sub('', text)
+    text = LINK.sub(r'\1', text)
+    text = AUTOLINK.sub(lambda m: keep(m.group(1)), text)
+    text = HTML_TAG.sub('', text)
+    text = STRONG.sub(r'\2', text)
+    text = EMPHASIS.sub(lambda m: m.group(1) or m.group(2), text)
+    text = ENTITY.sub(lambda m: html.unescape(m.group(0)), text)
+    return STASHED.sub(lambda m: stash[int(m.group(1))], text)
+
+class MarkdownBlockReader:
+    """
+    Splits Markdown into headings, paragraphs and lists, one line at a time.
+
+    feed() returns the blocks a line completes, so callers can act on each
+    block as soon as it is known; close() flushes whatever is still open.
+    Nested lists are kept one level deep, the most a resume uses.
+    """
+
+    def __init__(self):
+        self._paragraph: List[str] = []
+        self._items: List[Dict] = []
+        self._ordered = False
+        self._in_quote = False
+        self._after_blank = False
+
+    def feed(self, line: str) -> List[Block]:
+        line = line.rstrip('\r\n')
+        blocks: List[Block] = []
+
+        if not line.strip():
+            blocks.extend(self._flush_paragraph())
+            self._in_quote = False
+            self._after_blank = True
+            return blocks
+
+        after_blank, self._after_blank = self._after_blank, False
+
+        heading = ATX_HEADING.match(line)
+        if heading:
+            blocks.extend(self._flush())
+            blocks.append(('heading', len(heading.group(1)), inline_text(heading.group(2).strip())))
+            return blocks
+
+        if len(self._paragraph) == 1 and SETEXT_UNDERLINE.match(line):
+            # A one-line paragraph underlined with = or - is a heading
+            text = self._paragraph.pop()
+            blocks.append(('heading', 1 if line.startswith('=') else 2, inline_text(text.strip())))
+            return blocks
+
+        if HORIZONTAL_RULE.match(line):
+            blocks.extend(self._flush())
+            return blocks
+
+        if self._in_quote and not after_blank:
+            # Lazy continuation of a blockquote, which no section reads
+            return blocks
+
+        if BLOCKQUOTE.match(line):
+            if self._items and not after_blank:
+                # A quote inside a list item reads as part of the item
+                self._continue_item(line.lstrip()[1:].strip(), after_blank)
+                return blocks
+            blocks.extend(self._flush())
+            self._in_quote = True
+            return blocks
+
+        if self._paragraph:
+            # Paragraphs only end at a blank line, a heading or a rule
+            self._paragraph.append(line)
+            return blocks
+
+        item = LIST_ITEM.match(line)
+        nested = NESTED_LIST_ITEM.match(line)
+        if item:
+            if not self._items:
+                self._ordered = item.group(1)[0].isdigit()
+            elif after_blank:
+                # Items separated by blank lines are wrapped in paragraphs
+                self._items[-1]['loose'] = True
+            self._items.append({'lines': [item.group(2)], 'children': [], 'loose': after_blank and bool(self._items)})
+        elif self._items and nested:
+            self._items[-1]['children'].append({'lines': [nested.group(1)]})
+            self._items[-1]['loose'] |= after_blank
+        elif self._items and (not after_blank or line.startswith(INDENT)):
+            self._continue_item(line, after_blank)
+        else:
+            blocks.extend(self._flush())
+            if not line.startswith(INDENT):
+                self._paragraph.append(line)
+            # else: an indented code block, which no section reads
+        return blocks
+
+    def _continue_item(self, line: str, after_blank: bool) -> None:
+        current = self._items[-1]
+        if after_blank:
+            # An indented paragraph inside the last item
+            current['lines'].append(line[len(INDENT):])
+        elif current['children']:
+            # Lazy continuation of the last nested item
+            current['children'][-1]['lines'].append(line[len(INDENT):] if line.startswith(INDENT) else line)
+        else:
+            current['lines'].append(line)
+
+    def close(self) -> List[Block]:
+        return self._flush()
+
+    def _flush(self) -> List[Block]:
+        blocks = self._flush_paragraph()
+        if self._items:
+            blocks.append(('list', self._ordered, [self._list_item(item) for item in self._items]))
+            self._items = []
+        self._in_quote = False
+        return blocks
+
+    def _flush_paragraph(self) -> List[Block]:
+        if not self._paragraph:
+            return []
+        lines = [line.rstrip(' ') if line.endswith('  ') else line for line in self._paragraph]
+        self._paragraph = []
+        return [('paragraph', inline_text('\n'.join(lines)).strip())]
+
+    def _list_item(self, item: Dict) -> ListItem:
+        own = inline_text('\n'.join(item['lines'])).strip()
+        children = [inline_text('\n'.join(child['lines'])).strip() for child in item['children']]
+        if not children:
+            return ListItem(own, own, children)
+        # A paragraph-wrapped item keeps a blank line before its nested list
+        separator = '\n\n' if item['loose'] else '\n'
+        return ListItem(own + separator + '\n'.join(children), own, children)
+
 class ResumeParser:
     def __init__(self):
-        self.section_patterns = {
-            'name': r'^#\s+(.+)$',
-            'title': r'^##\s+(.+)$',
-            'summary': r'^###\s+Summary\s*\n(.+?)(?=^###|\Z)',
-            'education': r'^###\s+Education\s*\n(.+?)(?=^###|\Z)',
-            'skills': r'^###\s+Skills\s*\n(.+?)(?=^###|\Z)',
-            'projects': r'^###\s+Projects\s*\n(.+?)(?=^###|\Z)',
-            'certifications': r'^###\s+Certifications\s*\n(.+?)(?=^###|\Z)',
-            'languages': r'^###\s+Languages\s*\n(.+?)(?=^###|\Z)'
+        # Resume sections, keyed by their level-3 heading
+        self.sections = {
+            'Summary': 'summary',
+            'Education': 'education',
+            'Skills': 'skills',
+            'Projects': 'projects',
+            'Experience': 'experience',
+            'Certifications': 'certifications',
+            'Languages': 'languages'
         }
 
     def parse_markdown_to_json(self, markdown_text: str) -> Dict:
         """
         Parse markdown resume text into structured JSON.
-        
+
         Args:
             markdown_text: Resume text in markdown format
-            
+
         Returns:
             Dict: Structured resume data
         """
         try:
-            # Convert markdown to HTML
-            html = markdown.markdown(markdown_text)
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Initialize result dictionary
-            result = {}
-            
-            # Extract name and title
-            h1 = soup.find('h1')
-            if h1:
-                result['name'] = h1.text.strip()
-            
-            h2 = soup.find('h2')
-            if h2:
-                result['title'] = h2.text.strip()
-            
-            # Extract summary
-            summary_section = soup.find('h3', text='Summary')
-            if summary_section:
-                summary_text = []
-                current = summary_section.find_next_sibling()
-                while current and current.name != 'h3':
-                    if current.name == 'p':
-                        summary_text.append(current.text.strip())
-                    current = current.find_next_sibling()
-                result['summary'] = ' '.join(summary_text)
-            
-            # Extract education
-            education_section = soup.find('h3', text='Education')
-            if education_section:
-                result['education'] = self._parse_education(education_section)
-            
-            # Extract skills
-            skills_section = soup.find('h3', text='Skills')
-            if skills_section:
-                result['skills'] = self._parse_list(skills_section)
-            
-            # Extract projects
-            projects_section = soup.find('h3', text='Projects')
-            if projects_section:
-                result['projects'] = self._parse_projects(projects_section)
-            
-            # Extract certifications
-            certs_section = soup.find('h3', text='Certifications')
-            if certs_section:
-                result['certifications'] = self._parse_certifications(certs_section)
-            
-            # Extract languages
-            languages_section = soup.find('h3', text='Languages')
-            if languages_section:
-                result['languages'] = self._parse_list(languages_section)
-            
-            return result
-            
+            parser = IncrementalResumeParser(self)
+            parser.feed(markdown_text)
+            parser.close()
+            return parser.resume()
         except Exception as e:
             logger.error(f"Error parsing resume: {str(e)}")
             raise
 
-    def _parse_education(self, section) -> List[Dict]:
+    def parse_section(self, key: str, blocks: List[Block]):
+        if key == 'summary':
+            return ' '.join(block[1] for block in blocks if block[0] == 'paragraph')
+        if key == 'experience':
+            return self._parse_experience(blocks)
+
+        # Only bulleted lists count, matching the earlier HTML-based parser
+        items = [
+            text
+            for block in blocks if block[0] == 'list' and not block[1]
+            for item in block[2]
+            for text in (item.text, *item.children)
+        ]
+        if key == 'education':
+            return self._parse_education(items)
+        if key == 'projects':
+            return self._parse_projects(items)
+        if key == 'certifications':
+            return self._parse_certifications(items)
+        return self._parse_list(items)
+
+    def ordered(self, result: Dict) -> Dict:
+        order = ['name', 'title', 'summary', 'education', 'skills', 'projects',
+                 'experience', 'certifications', 'languages']
+        return {key: result[key] for key in order if key in result}
+
+    def _parse_education(self, items: List[str]) -> List[Dict]:
         education = []
-        current = section.find_next_sibling()
-        while current and current.name != 'h3':
-            if current.name == 'ul':
-                for li in current.find_all('li'):
-                    text = li.text.strip()
-                    # Parse education entry
-                    parts = text.split(' - ')
-                    if len(parts) >= 2:
-                        institution = parts[0].strip()
-                        details = parts[1].strip()
-                        year_range = re.search(r'\((\d{4}-\d{4}|\d{4})\)', details)
-                        if year_range:
-                            year_range = year_range.group(1)
-                            details = details.replace(f'({year_range})', '').strip()
-                        
-                        education.append({
-                            'institution': institution,
-                            'degree': details,
-                            'year_range': year_range or ''
-                        })
-            current = current.find_next_sibling()
+        for text in items:
+            # Parse education entry
+            parts = text.split(' - ')
+            if len(parts) >= 2:
+                institution = parts[0].strip()
+                details = parts[1].strip()
+                year_range = re.search(r'\((\d{4}-\d{4}|\d{4})\)', details)
+                if year_range:
+                    year_range = year_range.group(1)
+                    details = details.replace(f'({year_range})', '').strip()
+
+                education.append({
+                    'institution': institution,
+                    'degree': details,
+                    'year_range': year_range or ''
+                })
         return education
 
-    def _parse_list(self, section) -> List[str]:
-        items = []
-        current = section.find_next_sibling()
-        while current and current.name != 'h3':
-            if current.name == 'ul':
-                for li in current.find_all('li'):
-                    items.append(li.text.strip())
-            current = current.find_next_sibling()
-        return items
-
-    def _parse_projects(self, section) -> List[Dict]:
+    def _parse_list(self, items: List[str]) -> List[str]:
+        return list(items)
+
+    def _parse_projects(self, items: List[str]) -> List[Dict]:
         projects = []
-        current = section.find_next_sibling()
-        while current and current.name != 'h3':
-            if current.name == 'ul':
-                for li in current.find_all('li'):
-                    text = li.text.strip()
-                    parts = text.split(': ', 1)
-                    if len(parts) == 2:
-                        projects.append({
-                            'name': parts[0].strip(),
-                            'description': parts[1].strip()
-                        })
-            current = current.find_next_sibling()
+        for text in items:
+            parts = text.split(': ', 1)
+            if len(parts) == 2:
+                projects.append({
+                    'name': parts[0].strip(),
+                    'description': parts[1].strip()
+                })
         return projects
 
-    def _parse_certifications(self, section) -> List[Dict]:
+    def _parse_certifications(self, items: List[str]) -> List[Dict]:
         certifications = []
-        current = section.find_next_sibling()
-        while current and current.name != 'h3':
-            if current.name == 'ul':
-                for li in current.find_all('li'):
-                    text = li.text.strip()
-                    # Parse certification entry
-                    parts = text.split(' - ')
-                    if len(parts) >= 2:
-                        title = parts[0].strip()
-                        issuer_date = parts[1].strip()
-                        date_match = re.search(r'\((\d{4})\)', issuer_date)
-                        if date_match:
-                            date = date_match.group(1)
-                            issuer = issuer_date.replace(f'({date})', '').strip()
-                            certifications.append({
-                                'title': title,
-                                'issuer': issuer,
-                                'date': date
-                            })
-            current = current.find_next_sibling()
-        return certifications 
\ No newline at end of file
+        for text in items:
+            # Parse certification entry
+            parts = text.split(' - ')
+            if len(parts) >= 2:
+                title = parts[0].strip()
+                issuer_date = parts[1].strip()
+                date_match = re.search(r'\((\d{4})\)', issuer_date)
+                if date_match:
+                    date = date_match.group(1)
+                    issuer = issuer_date.replace(f'({date})', '').strip()
+                    certifications.append({
+                        'title': title,
+                        'issuer': issuer,
+                        'date': date
+                    })
+        return certifications
+
+    def _parse_experience(self, blocks: List[Block]) -> List[Dict]:
+        """
+        Parse work experience written either as one bullet per role
+        ("Title at Company (Duration): Description", nested bullets adding
+        to the description) or as a sub-heading per role followed by its
+        description paragraphs and bullets.
+        """
+        experience = []
+        current: Optional[Dict] = None
+        details: List[str] = []
+
+        def finish() -> None:
+            if current is not None:
+                description = ' '.join([current['description'], *details]).strip()
+                current['description'] = description
+                experience.append(current)
+
+        for block in blocks:
+            if block[0] == 'heading':
+                finish()
+                current, details = self._parse_role(block[2]), []
+            elif block[0] == 'paragraph':
+                if current is not None:
+                    details.append(block[1])
+            elif current is not None:
+                details.extend(item.text for item in block[2])
+            else:
+                for item in block[2]:
+                    role = self._parse_role(item.own)
+                    role['description'] = ' '.join([role['description'], *item.children]).strip()
+                    experience.append(role)
+        finish()
+        return experience
+
+    def _parse_role(self, text: str) -> Dict:
+        head, _, description = text.partition(': ')
+        head = head.strip()
+        duration = ''
+        duration_match = re.search(r'\(([^()]*)\)$', head)
+        if duration_match:
+            duration = duration_match.group(1).strip()
+            head = head[:duration_match.start()].strip()
+
+        title, company = head, ''
+        for separator in (' at ', ' - ', ' | ', ', '):
+            if separator in head:
+                title, company = head.split(separator, 1)
+                break
+        if separator == ', ' and not duration and ', ' in company:
+            # "Title, Company, Duration", the order the chat asks for
+            company, duration = company.split(', ', 1)
+
+        return {
+            'title': title.strip(),
+            'company': company.strip(),
+            'duration': duration,
+            'description': description.strip()
+        }
+
+# What feed() returns when the text completed no field
+NO_FIELDS = ()
+
+class IncrementalResumeParser:
+    """
+    Parses a resume from a stream of text fragments, such as model tokens.
+
+    The first level-1 and level-2 headings are the name and title. Each
+    known level-3 heading opens a section that runs until the next level-3
+    heading; only the first occurrence of a section is used. feed() returns
+    every field the new text completed: the name and title once their
+    heading line ends, a section once the next level-3 heading (or close())
+    ends it. Each line is scanned once, as when parsing the buffered text.
+    Fragments without a newline are only buffered until a line ends, but
+    fed token by token this is still one feed() call per token on top of
+    the buffered parse.
+    """
+
+    def __init__(self, parser: Optional[ResumeParser] = None):
+        self.parser = parser or ResumeParser()
+        self.result: Dict = {}
+        self._reader = MarkdownBlockReader()
+        # Fragments of the line that has not ended yet
+        self._pending: List[str] = []
+        self._seen: Set[str] = set()
+        self._section: Optional[str] = None
+        self._blocks: List[Block] = []
+        # Time spent in feed() and close(), observed once the document is closed
+        self._seconds = 0.0
+
+    def feed(self, text: str) -> Sequence[Tuple[str, Any]]:
+        """
+        Consume the next fragment of Markdown.
+
+        Args:
+            text: Any fragment; lines may be split across calls
+
+        Returns:
+            Sequence[Tuple[str, Any]]: (field, value) pairs completed by this text
+        """
+        if '\n' not in text:
+            # The common case for a token: no list and no string copy
+            self._pending.append(text)
+            return NO_FIELDS
+        start = time.perf_counter()
+        self._pending.append(text)
+        lines = ''.join(self._pending).split('\n')
+        partial_line = lines.pop()
+        self._pending = [partial_line] if partial_line else []
+        fields = []
+        for line in lines:
+            for block in self._reader.feed(line):
+                fields.extend(self._add(block))
+        self._seconds += time.perf_counter() - start
+        return fields
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """Finish the document, returning the fields still open."""
+        start = time.perf_counter()
+        partial_line = ''.join(self._pending)
+        self._pending = []
+        blocks = self._reader.feed(partial_line) if partial_line else []
+        fields = []
+        for block in blocks + self._reader.close():
+            fields.extend(self._add(block))
+        fields.extend(self._finish_section())
+        STAGE_SECONDS.observe(self._seconds + time.perf_counter() - start, "resume_parse")
+        return fields
+
+    def resume(self) -> Dict:
+        """The fields parsed so far, in the order parse_markdown_to_json uses."""
+        return self.parser.ordered(self.result)
+
+    def _add(self, block: Block) -> List[Tuple[str, Any]]:
+        if block[0] != 'heading':
+            if self._section:
+                self._blocks.append(block)
+            return []
+
+        level, text = block[1], block[2]
+        if level == 1 and 'name' not in self.result:
+            self.result['name'] = text
+            return [('name', text)]
+        if level == 2 and 'title' not in self.result:
+            self.result['title'] = text
+            return [('title', text)]
+        if level == 3:
+            fields = self._finish_section()
+            section = self.parser.sections.get(text)
+            if section and section not in self._seen:
+                self._seen.add(section)
+                self._section = section
+            return fields
+        if self._section == 'experience' and level > 3:
+            # Experience may give each role its own sub-heading
+            self._blocks.append(block)
+        return []
+
+    def _finish_section(self) -> List[Tuple[str, Any]]:
+        if self._section is None:
+            return []
+        key, value = self._section, self.parser.parse_section(self._section, self._blocks)
+        self._section, self._blocks = None, []
+        self.result[key] = value
+        return [(key, value)]
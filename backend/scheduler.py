@@ -0,0 +1,189 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Priority classes; lower values are served first
+INTERACTIVE = 0
+BULK = 1
+SPECULATIVE = 2  # Work that may turn out to be unneeded
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk", SPECULATIVE: "speculative"}
+
+class SchedulerRejected(Exception):
+    """Raised when a request is refused instead of queued."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take one token. Returns 0 on success, else seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self) -> bool:
+        now = time.monotonic()
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+class OllamaScheduler:
+    """
+    Admission control in front of the Ollama backend.
+
+    At most max_concurrency calls run at once. Further calls wait in a
+    priority queue (interactive before bulk, FIFO within a class) of at most
+    max_queue entries; beyond that they are rejected with a 503. Each user
+    also has a token bucket so one client cannot starve the rest (429).
+    """
+
+    def __init__(self, max_concurrency: int = 2, max_queue: int = 50,
+                 user_rate: float = 0.5, user_burst: float = 5, max_users: int = 10000):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.max_users = max_users
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._buckets: Dict[str, TokenBucket] = {}
+        # Moving average of slot hold time, used for Retry-After estimates
+        self._service_time = 5.0
+        self.admitted = 0
+        self.rejected_busy = 0
+        self.rejected_rate = 0
+
+    def admit(self, user_key: Optional[str]) -> None:
+        """
+        Charge one request to the user's token bucket.
+
+        Raises:
+            SchedulerRejected: 429 if the user is over their rate
+        """
+        if user_key is None:
+            return
+        bucket = self._buckets.get(user_key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_users:
+                self._prune_buckets()
+            bucket = self._buckets[user_key] = TokenBucket(self.user_rate, self.user_burst)
+        wait = bucket.take()
+        if wait > 0:
+            self.rejected_rate += 1
+            raise SchedulerRejected("Too many requests", 429, max(1, math.ceil(wait)))
+
+    def ensure_capacity(self) -> None:
+        """
+        Fail fast when a new call could not even be queued.
+
+        Raises:
+            SchedulerRejected: 503 if the wait queue is full
+        """
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_busy += 1
+            raise SchedulerRejected("Server busy", 503, self.retry_after())
+
+    async def acquire(self, priority: int = INTERACTIVE, user_key: Optional[str] = None,
+                      queue_limit: bool = True) -> None:
+        """
+        Wait for a free slot. Every successful acquire must be paired with release().
+
+        Args:
+            priority: INTERACTIVE or BULK
+            user_key: Identity charged against the per-user rate, None to skip it
+            queue_limit: When False the caller may always queue; used by
+                callers that are already bounded, such as job workers
+
+        Raises:
+            SchedulerRejected: 429 when rate limited, 503 when the queue is full
+        """
+        self.admit(user_key)
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if queue_limit:
+            self.ensure_capacity()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release()
+            else:
+                self._waiters = [w for w in self._waiters if w[2] is not future]
+                heapq.heapify(self._waiters)
+            raise
+        self.admitted += 1
+
+    def release(self, held_for: Optional[float] = None) -> None:
+        if held_for is not None:
+            self._service_time = 0.8 * self._service_time + 0.2 * held_for
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the next waiter
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = INTERACTIVE, user_key: Optional[str] = None,
+                   queue_limit: bool = True) -> AsyncIterator[None]:
+        await self.acquire(priority, user_key, queue_limit)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait, from queue length and service time."""
+        backlog = (len(self._waiters) + 1) / self.max_concurrency
+        return max(1, math.ceil(backlog * self._service_time))
+
+    def stats(self) -> Dict:
+        queued = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                queued[PRIORITY_NAMES.get(priority, str(priority))] += 1
+        return {
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "queued": queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_busy": self.rejected_busy,
+            "rejected_rate": self.rejected_rate,
+            "tracked_users": len(self._buckets)
+        }
+
+    def _prune_buckets(self) -> None:
+        # A full bucket carries no state worth keeping
+        for key in [k for k, b in self._buckets.items() if b.is_full()]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_users:
+            self._buckets.clear()
@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from section_enhancement import SECTION_KEYS
+
+class ResumeData(BaseModel):
+    name: str
+    title: str
+    phone: str
+    email: str
+    location: str
+    summary: str
+    education: List[Dict]
+    skills: List[str]
+    projects: List[Dict]
+    experience: List[Dict]
+    certifications: List[Dict]
+
+def _entry_schema(keys: List[str]) -> Dict:
+    return {
+        "type": "object",
+        "properties": {key: {"type": "string"} for key in keys},
+        "required": keys
+    }
+
+def _resume_schema() -> Dict:
+    # ResumeData leaves list entries as plain dicts; spell out their keys so
+    # the model is constrained all the way down
+    schema = ResumeData.model_json_schema()
+    for field, keys in SECTION_KEYS.items():
+        schema["properties"][field]["items"] = _entry_schema(keys)
+    return schema
+
+# JSON schema passed to Ollama's "format" parameter for whole-resume enhancement
+RESUME_SCHEMA = _resume_schema()
+
+def section_schema(section: str) -> Dict:
+    """Schema of the {"<section>": value} object a section prompt asks for."""
+    return {
+        "type": "object",
+        "properties": {section: RESUME_SCHEMA["properties"][section]},
+        "required": [section]
+    }
+
+FENCE = re.compile(r"```[a-zA-Z]*\s*\n?(.*?)```", re.DOTALL)
+
+def extract_json(raw_response: str) -> Tuple[Any, str]:
+    """
+    Decode the JSON value in a model answer, tolerating surrounding noise.
+
+    The answer is tried as-is first. Failing that, the contents of code
+    fences are tried, and then the first JSON object or array that decodes
+    cleanly from any "{" or "[" in the text, which covers answers wrapped
+    in prose.
+
+    Args:
+        raw_response: Complete text generated by the model
+
+    Returns:
+        Tuple[Any, str]: The decoded value and "parsed" if the answer was
+        clean JSON, or "recovered" if it had to be dug out
+
+    Raises:
+        ValueError: If no JSON object or array can be found
+    """
+    try:
+        return json.loads(raw_response), "parsed"
+    except json.JSONDecodeError:
+        pass
+
+    for fenced in FENCE.findall(raw_response):
+        try:
+            return json.loads(fenced), "recovered"
+        except json.JSONDecodeError:
+            continue
+
+    decoder = json.JSONDecoder()
+    for start in _top_level_openings(raw_response):
+        try:
+            value, _ = decoder.raw_decode(raw_response, start)
+        except json.JSONDecodeError:
+            continue
+        return value, "recovered"
+    raise ValueError("no JSON object found in the model's answer")
+
+def _top_level_openings(text: str) -> List[int]:
+    # Positions of "{" and "[" outside any open bracket. Objects nested in a
+    # truncated answer are skipped so a fragment is never taken for the
+    # whole answer. Quotes only delimit strings inside brackets, since prose
+    # uses them freely.
+    openings, depth, in_string, escaped = [], 0, False, False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"' and depth:
+            in_string = True
+        elif char in "{[":
+            if not depth:
+                openings.append(index)
+            depth += 1
+        elif char in "}]" and depth:
+            depth -= 1
+    return openings
+
+class ParseStats:
+    """How often model answers parsed cleanly, needed recovery, or were lost."""
+
+    OUTCOMES = ("parsed", "recovered", "failed")
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, kind: str, outcome: str) -> None:
+        counts = self._counts.setdefault(kind, dict.fromkeys(self.OUTCOMES, 0))
+        counts[outcome] += 1
+
+    def stats(self) -> Dict:
+        report = {}
+        for kind, counts in self._counts.items():
+            total = sum(counts.values())
+            report[kind] = {
+                **counts,
+                **{f"{outcome}_rate": counts[outcome] / total for outcome in self.OUTCOMES}
+            }
+        return report
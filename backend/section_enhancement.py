@@ -0,0 +1,156 @@
+import json
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+# Sections enhanced by their own prompt, with the fields each prompt sees
+# as context besides the section itself. Context is limited to answers the
+# chat collects early, so a section can be enhanced while the user is still
+# answering later questions.
+SECTION_CONTEXT = {
+    "summary": ["name", "title"],
+    "education": [],
+    "skills": ["title"],
+    "projects": ["title"],
+    "experience": ["title"],
+    "certifications": ["title"]
+}
+
+SECTION_INSTRUCTIONS = {
+    "summary": (
+        "Rewrite the summary as a comprehensive, professional profile of three to "
+        "four sentences. Return a JSON string."
+    ),
+    "education": (
+        "Spell out each degree and major in full and tidy the institution "
+        "names; keep years and grades exactly as given. Return a JSON array of "
+        "objects with \"institution\", \"degree\", \"year_range\", \"cgpa\" "
+        "and \"location\" strings, one per entry, in the same order."
+    ),
+    "skills": (
+        "Return the candidate's skills plus closely related technical and soft "
+        "skills as a JSON array of short strings."
+    ),
+    "projects": (
+        "Expand each project's description with specific achievements and the "
+        "technologies used. Return a JSON array of objects with \"name\" and "
+        "\"description\" strings, one per project, in the same order."
+    ),
+    "experience": (
+        "Expand each role's description with specific accomplishments and "
+        "responsibilities. Return a JSON array of objects with \"title\", "
+        "\"company\", \"duration\" and \"description\" strings, one per role, in "
+        "the same order."
+    ),
+    "certifications": (
+        "Tidy each certification's title and issuer. Return a JSON array of "
+        "objects with \"title\", \"issuer\" and \"date\" strings, one per "
+        "certification, in the same order."
+    )
+}
+
+# Keys kept from each object in list sections
+SECTION_KEYS = {
+    "education": ["institution", "degree", "year_range", "cgpa", "location"],
+    "projects": ["name", "description"],
+    "experience": ["title", "company", "duration", "description"],
+    "certifications": ["title", "issuer", "date"]
+}
+
+class SectionError(ValueError):
+    """The model's answer for a section is missing or malformed."""
+
+def section_input(section: str, resume_data: Dict) -> Dict:
+    """The part of the resume a section prompt is built from."""
+    fields = [section] + SECTION_CONTEXT[section]
+    return {field: resume_data[field] for field in fields if resume_data.get(field)}
+
+def create_section_prompt(section: str, resume_data: Dict) -> str:
+    return f"""You are a professional resume writer. Enhance the "{section}" section of this resume.
+Keep the original information but expand upon it professionally.
+
+Resume data:
+{json.dumps(section_input(section, resume_data), indent=2)}
+
+{SECTION_INSTRUCTIONS[section]}
+Answer with a JSON object whose only key is "{section}". Only return the JSON, no additional text."""
+
+def parse_section(section: str, answer: Any, original: Any = None) -> Any:
+    """
+    Validate the model's decoded answer for one section.
+
+    Args:
+        section: Section the answer is for
+        answer: JSON value decoded from the model's answer
+        original: The section's original value; list entries the model left
+            incomplete keep the original entry's values for missing keys
+
+    Returns:
+        Any: The section value, normalized to the resume schema
+
+    Raises:
+        SectionError: If the answer does not have the expected shape
+    """
+    if isinstance(answer, dict) and section in answer:
+        answer = answer[section]
+
+    if section == "summary":
+        if not isinstance(answer, str) or not answer.strip():
+            raise SectionError("summary must be a non-empty string")
+        return answer.strip()
+
+    if not isinstance(answer, list) or not answer:
+        raise SectionError(f"{section} must be a non-empty array")
+
+    if section == "skills":
+        skills = [skill.strip() for skill in answer if isinstance(skill, str) and skill.strip()]
+        if len(skills) != len(answer):
+            raise SectionError("skills must be non-empty strings")
+        return skills
+
+    keys = SECTION_KEYS[section]
+    originals = original if isinstance(original, list) else []
+    entries = []
+    for index, entry in enumerate(answer):
+        if not isinstance(entry, dict) or not isinstance(entry.get(keys[0]), str) or not entry[keys[0]].strip():
+            raise SectionError(f"every {section} entry needs a \"{keys[0]}\" string")
+        fallback = originals[index] if index < len(originals) and isinstance(originals[index], dict) else {}
+        entries.append({key: str(entry.get(key) or fallback.get(key) or "").strip() for key in keys})
+    return entries
+
+class SectionStats:
+    """Per-section counters and latencies for section-mode enhancement."""
+
+    def __init__(self, window: int = 1000):
+        self._counts: Dict[str, Dict[str, int]] = {
+            section: {"enhanced": 0, "cached": 0, "failed": 0, "skipped": 0}
+            for section in SECTION_INSTRUCTIONS
+        }
+        self._seconds: Dict[str, Deque[float]] = {
+            section: deque(maxlen=window) for section in SECTION_INSTRUCTIONS
+        }
+
+    def record(self, section: str, outcome: str, seconds: Optional[float] = None) -> None:
+        self._counts[section][outcome] += 1
+        if seconds is not None:
+            self._seconds[section].append(seconds)
+
+    def stats(self) -> Dict:
+        report = {}
+        for section, counts in self._counts.items():
+            seconds = sorted(self._seconds[section])
+            report[section] = {
+                **counts,
+                "seconds_avg": sum(seconds) / len(seconds) if seconds else 0.0,
+                "seconds_p95": seconds[int(len(seconds) * 0.95)] if seconds else 0.0,
+                "seconds_max": seconds[-1] if seconds else 0.0
+            }
+        return report
+
+def merge_sections(resume_data: Dict, sections: Dict[str, Any], required_fields: List[str]) -> Dict:
+    """Overlay enhanced sections on the original resume, keeping every required field."""
+    merged = dict(resume_data)
+    merged.update(sections)
+    for field in required_fields:
+        if field not in merged:
+            merged[field] = ""
+    return merged
@@ -0,0 +1,362 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def approximate_size(value: Dict) -> int:
+    """Approximate memory held by a JSON-compatible value, in bytes."""
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+class SessionStore(ABC):
+    """
+    Key/value store for per-session state.
+
+    Values are plain JSON-compatible dicts. Callers that mutate a value they
+    got from the store must write it back with set() (or use update()) so
+    that size accounting and shared backends see the change.
+
+    Code running on the event loop uses the *_async methods, which move
+    blocking backends' I/O off the loop; the plain methods run inline.
+    """
+
+    def __init__(self):
+        self._sweeper: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the value and mark it as recently used, or None if absent or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Dict) -> None:
+        """Store a value, evicting others if the store is over budget."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Drop expired entries. Returns how many were removed."""
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Gauges describing the store's contents."""
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+    def update(self, key: str, fn: Callable[[Dict], None]) -> Optional[Dict]:
+        """
+        Apply fn to the stored value in place and write it back.
+
+        Returns the updated value, or None if the key is absent.
+        """
+        value = self.get(key)
+        if value is None:
+            return None
+        fn(value)
+        self.set(key, value)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> Dict:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Dict) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.delete(key)
+
+    async def get_async(self, key: str) -> Optional[Dict]:
+        return await self._call(self.get, key)
+
+    async def set_async(self, key: str, value: Dict) -> None:
+        await self._call(self.set, key, value)
+
+    async def update_async(self, key: str, fn: Callable[[Dict], None]) -> Optional[Dict]:
+        """update() for the event loop. fn may run on another thread."""
+        return await self._call(self.update, key, fn)
+
+    async def delete_async(self, key: str) -> None:
+        await self._call(self.delete, key)
+
+    async def stats_async(self) -> Dict:
+        return await self._call(self.stats)
+
+    async def _call(self, fn: Callable, *args) -> Any:
+        # In-memory operations are quick enough to run on the loop
+        return fn(*args)
+
+    def start_sweeper(self, interval: float) -> None:
+        """Run sweep() every interval seconds on the event loop."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever(interval))
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def _sweep_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await self._call(self.sweep)
+                if removed:
+                    logger.info(f"Session sweeper expired {removed} entries")
+            except Exception as e:
+                logger.error(f"Session sweep failed: {str(e)}")
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store with idle TTL and LRU eviction.
+
+    Entries idle for longer than ttl seconds expire. When the store holds
+    more than max_entries values or more than max_bytes (approximate JSON
+    size), the least recently used entries are evicted.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, approximate size, last access time)
+        self._entries: "OrderedDict[str, Tuple[Dict, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, last_access = entry
+            now = time.monotonic()
+            if now - last_access > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries[key] = (value, size, now)
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict) -> None:
+        size = approximate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self.bytes += size
+            # Evict least recently used entries, never the one just written
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def sweep(self) -> int:
+        cutoff = time.monotonic() - self.ttl
+        removed = 0
+        with self._lock:
+            # Entries are kept in access order, so expired ones are at the front
+            while self._entries:
+                key, (_, _, last_access) = next(iter(self._entries.items()))
+                if last_access > cutoff:
+                    break
+                self._remove(key)
+                removed += 1
+            self.expirations += removed
+        return removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "live": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+class SqliteSessionStore(SessionStore):
+    """
+    Store backed by a SQLite database in WAL mode.
+
+    Every uvicorn worker opens the same file, so sessions are visible
+    across processes. update() runs inside a BEGIN IMMEDIATE transaction,
+    which makes read-modify-write steps atomic between workers. A write
+    that takes the table over its entry or byte budget evicts the least
+    recently used rows; sweep() drops expired rows and reads skip them in
+    between.
+
+    The *_async methods run on a single thread of the store's own, so a
+    writer waiting for another worker's lock never blocks the event loop.
+    A lock held for longer than busy_timeout seconds fails the call with
+    sqlite3.OperationalError instead of queueing more work behind it.
+    """
+
+    def __init__(self, path: str, table: str, ttl: float = 3600, max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024, busy_timeout: float = 2.0):
+        super().__init__()
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sqlite-{table}")
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None,
+                                   timeout=busy_timeout)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)")
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT value, accessed FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > self.ttl:
+                self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.expirations += 1
+                return None
+            if now - row[1] > 1:
+                # Refresh the access time at most once a second per key
+                self._db.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Dict) -> None:
+        text = json.dumps(value, separators=(",", ":"), default=str)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._write(key, text)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def update(self, key: str, fn: Callable[[Dict], None]) -> Optional[Dict]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    f"SELECT value, accessed FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or time.time() - row[1] > self.ttl:
+                    self._db.execute("COMMIT")
+                    return None
+                value = json.loads(row[0])
+                fn(value)
+                self._write(key, json.dumps(value, separators=(",", ":"), default=str))
+                self._db.execute("COMMIT")
+                return value
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def sweep(self) -> int:
+        with self._lock:
+            cursor = self._db.execute(
+                f"DELETE FROM {self.table} WHERE accessed < ?", (time.time() - self.ttl,)
+            )
+            expired = max(cursor.rowcount, 0)
+            self.expirations += expired
+            self._trim()
+        return expired
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count, total = self._db.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        return {
+            "live": count,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._db.close()
+
+    async def _call(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _write(self, key: str, text: str) -> None:
+        # Called inside a transaction, so the budget check is atomic with the write
+        self._db.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, text, len(text), time.time())
+        )
+        self._trim()
+
+    def _trim(self) -> None:
+        # Evict least recently used rows down to the entry and byte budgets,
+        # never the most recent one (the row just written)
+        count, total = self._db.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        excess_bytes = total - self.max_bytes
+        evict = []
+        # Read only as many rows as need evicting, usually one per write
+        rows = self._db.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed")
+        for key, size in rows:
+            if count - len(evict) <= 1 or (count - len(evict) <= self.max_entries and excess_bytes <= 0):
+                break
+            evict.append((key,))
+            excess_bytes -= size
+        rows.close()
+        self._db.executemany(f"DELETE FROM {self.table} WHERE key = ?", evict)
+        self.evictions += len(evict)
@@ -0,0 +1,89 @@
+import os
+
+# Runtime configuration, read once from the environment at import time.
+
+# Ollama connection; OLLAMA_BASE_URL may list several servers separated by commas
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434/api")
+
+# Multi-server routing: a server is ejected for OLLAMA_EJECT_SECONDS after
+# OLLAMA_MAX_FAILURES consecutive failures, and health-checked meanwhile
+OLLAMA_MAX_FAILURES = int(os.getenv("OLLAMA_MAX_FAILURES", "3"))
+OLLAMA_EJECT_SECONDS = float(os.getenv("OLLAMA_EJECT_SECONDS", "30"))
+OLLAMA_HEALTH_INTERVAL = float(os.getenv("OLLAMA_HEALTH_INTERVAL", "10"))
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+
+# HTTP connection pool used for all Ollama calls
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", "100"))
+OLLAMA_POOL_PER_HOST = int(os.getenv("OLLAMA_POOL_PER_HOST", "32"))
+OLLAMA_KEEPALIVE_TIMEOUT = float(os.getenv("OLLAMA_KEEPALIVE_TIMEOUT", "30"))
+OLLAMA_DNS_CACHE_TTL = int(os.getenv("OLLAMA_DNS_CACHE_TTL", "300"))
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_READ_TIMEOUT = float(os.getenv("OLLAMA_READ_TIMEOUT", "300"))
+
+# Model warm-up: how long Ollama keeps the model loaded after each request
+# (Ollama duration string such as "30m", or "-1" for forever), and how often
+# to ping it while the app has traffic
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "1") == "1"
+OLLAMA_KEEPALIVE_PING_INTERVAL = float(os.getenv("OLLAMA_KEEPALIVE_PING_INTERVAL", "300"))
+OLLAMA_WARMUP_RETRY = float(os.getenv("OLLAMA_WARMUP_RETRY", "10"))
+
+# Enhancement: "whole" sends one prompt per resume, "sections" one per section, concurrently
+ENHANCE_MODE = os.getenv("ENHANCE_MODE", "whole")
+# Ollama "format" for enhancement answers: "schema" sends a JSON schema
+# (Ollama 0.5+), "json" plain JSON mode, "none" relies on the prompt alone
+ENHANCE_FORMAT = os.getenv("ENHANCE_FORMAT", "schema")
+# With ENHANCE_MODE=sections, enhance sections while the user is still answering
+ENHANCE_SPECULATIVE = os.getenv("ENHANCE_SPECULATIVE", "1") == "1"
+
+# Enhancement result cache; set ENHANCE_CACHE_DB to a file path to persist it
+ENHANCE_CACHE_SIZE = int(os.getenv("ENHANCE_CACHE_SIZE", "1024"))
+ENHANCE_CACHE_DB = os.getenv("ENHANCE_CACHE_DB", "")
+ENHANCE_CACHE_DISK_SIZE = int(os.getenv("ENHANCE_CACHE_DISK_SIZE", "10000"))
+
+# Background job queue for enhancement and generation
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", "1000"))
+JOB_MAX_WAIT = float(os.getenv("JOB_MAX_WAIT", "30"))
+
+# Admission control in front of Ollama
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+OLLAMA_MAX_QUEUE = int(os.getenv("OLLAMA_MAX_QUEUE", "50"))
+USER_RATE_LIMIT = float(os.getenv("USER_RATE_LIMIT", "0.5"))
+USER_RATE_BURST = float(os.getenv("USER_RATE_BURST", "5"))
+
+# Session storage; SESSION_BACKEND=sqlite shares sessions between uvicorn workers
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_DB = os.getenv("SESSION_DB", "sessions.db")
+SESSION_DB_BUSY_TIMEOUT = float(os.getenv("SESSION_DB_BUSY_TIMEOUT", "2"))
+SESSION_TTL = float(os.getenv("SESSION_TTL", "3600"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+SESSION_MAX_MESSAGES = int(os.getenv("SESSION_MAX_MESSAGES", "50"))
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+
+# DOCX rendering pool; DOCX_EXECUTOR is "thread" or "process"
+DOCX_EXECUTOR = os.getenv("DOCX_EXECUTOR", "thread")
+DOCX_WORKERS = int(os.getenv("DOCX_WORKERS", "4"))
+
+# Rendered DOCX and preview HTML kept for repeat downloads and previews
+ARTIFACT_CACHE_BYTES = int(os.getenv("ARTIFACT_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Batch generation; concurrency is items in flight, each still waits for an Ollama slot
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+
+# Logging goes through a queue to a writer thread; large payloads (resume
+# bodies, raw model answers) are sampled and cut to LOG_PAYLOAD_MAX_CHARS
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "1.0"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "4096"))
+
+# WebSocket chat: server pings every WS_HEARTBEAT_INTERVAL seconds and drops
+# clients silent for WS_HEARTBEAT_TIMEOUT; clients more than WS_SEND_QUEUE
+# messages behind are disconnected and resume on reconnect
+WS_HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "20"))
+WS_HEARTBEAT_TIMEOUT = float(os.getenv("WS_HEARTBEAT_TIMEOUT", "60"))
+WS_SEND_QUEUE = int(os.getenv("WS_SEND_QUEUE", "256"))
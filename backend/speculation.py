@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional
+
+from ollama_client import OllamaClient
+from scheduler import SPECULATIVE, OllamaScheduler
+
+logger = logging.getLogger(__name__)
+
+# enhance_section outcomes that leave a result in the section cache
+REUSABLE_OUTCOMES = ("enhanced", "cached")
+
+@dataclass
+class Speculation:
+    section: str
+    key: str
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    created_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None  # When it got an Ollama slot
+    finished_at: Optional[float] = None
+    outcome: Optional[str] = None  # enhance_section's outcome once finished
+
+class SpeculativeEnhancer:
+    """
+    Enhances resume sections in the background while the user is still
+    answering the remaining questions.
+
+    speculate() starts a section as soon as its inputs are final, at the
+    lowest scheduler priority. A speculation's result goes into the section
+    cache under the same key the final enhancement looks up, and an
+    in-flight speculation is joined through single-flight, so the final
+    step only waits for the leftovers. If a section's input changes, its
+    speculation is cancelled and started again for the new input.
+
+    final() wraps the end-of-flow enhancement and records how many sections
+    speculation covered and roughly how much waiting it saved.
+    """
+
+    def __init__(self, ollama_client: OllamaClient, scheduler: OllamaScheduler,
+                 enabled: bool = True, max_sessions: int = 10000):
+        self.ollama_client = ollama_client
+        self.scheduler = scheduler
+        self.enabled = enabled
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Dict[str, Speculation]]" = OrderedDict()
+        self.started = 0
+        self.invalidated = 0
+        self.hits = 0  # Finished before the final step needed it
+        self.joined = 0  # Still running; the final step waited on it
+        self.misses = 0
+        self.failed = 0  # Finished without a result the final step can reuse
+        self._final_seconds: Deque[float] = deque(maxlen=1000)
+        self._saved_seconds: Deque[float] = deque(maxlen=1000)
+
+    def speculate(self, session_id: str, resume_data: Dict, sections: List[str]) -> None:
+        """
+        Make sure every given section is being enhanced for its current input.
+
+        Must be called from the event loop.
+
+        Args:
+            session_id: Session the answers belong to
+            resume_data: The session's resume data so far
+            sections: Sections whose inputs are final
+        """
+        if not self.enabled or not sections:
+            return
+        speculations = self._sessions.pop(session_id, {})
+        self._sessions[session_id] = speculations
+        while len(self._sessions) > self.max_sessions:
+            _, abandoned = self._sessions.popitem(last=False)
+            self._cancel(abandoned.values())
+
+        snapshot = dict(resume_data)
+        for section in sections:
+            if not snapshot.get(section):
+                continue
+            key = self.ollama_client.section_cache_key(section, snapshot)
+            current = speculations.get(section)
+            if current is not None:
+                if current.key == key:
+                    continue
+                # A later answer changed this section's input
+                self.invalidated += 1
+                self._cancel([current])
+            speculation = Speculation(section, key)
+            speculation.task = asyncio.ensure_future(self._run(speculation, snapshot))
+            speculations[section] = speculation
+            self.started += 1
+
+    async def _run(self, speculation: Speculation, resume_data: Dict) -> None:
+        try:
+            async with self.scheduler.slot(SPECULATIVE, queue_limit=False):
+                speculation.started_at = time.perf_counter()
+                _, _, speculation.outcome, _ = await self.ollama_client.enhance_section(
+                    speculation.section, resume_data
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            speculation.outcome = "failed"
+            logger.warning(f"Speculative {speculation.section} enhancement failed: {str(e)}")
+        speculation.finished_at = time.perf_counter()
+
+    @contextmanager
+    def final(self, session_id: str, resume_data: Dict, use_cache: bool = True) -> Iterator[None]:
+        """
+        Wrap the end-of-flow enhancement of a session.
+
+        Speculations for stale inputs and those still waiting for a slot are
+        cancelled; running ones are left for the final step to join.
+
+        Args:
+            session_id: Session being enhanced
+            resume_data: The final resume data
+            use_cache: False when the final step ignores cached results,
+                which makes every speculation useless
+        """
+        speculations = self._sessions.pop(session_id, {})
+        if not self.enabled or not use_cache:
+            self._cancel(speculations.values())
+            yield
+            return
+
+        now = time.perf_counter()
+        covered: List[float] = []  # How long each useful speculation ran or has run
+        for section in self.ollama_client.enhanced_sections(resume_data):
+            speculation = speculations.pop(section, None)
+            if speculation is None or speculation.key != self.ollama_client.section_cache_key(section, resume_data):
+                self.misses += 1
+                if speculation is not None:
+                    speculations[section] = speculation
+            elif speculation.finished_at is not None:
+                if speculation.outcome in REUSABLE_OUTCOMES:
+                    self.hits += 1
+                    covered.append(speculation.finished_at - speculation.started_at)
+                else:
+                    # Nothing was cached, so the final step enhances it again
+                    self.failed += 1
+            elif speculation.started_at is not None and not speculation.task.done():
+                self.joined += 1
+                covered.append(now - speculation.started_at)
+            else:
+                self.misses += 1
+                speculations[section] = speculation
+        self._cancel(speculations.values())
+
+        start = time.perf_counter()
+        yield
+        waited = time.perf_counter() - start
+        self._final_seconds.append(waited)
+        # Sections are enhanced concurrently, so without speculation the
+        # final step would have taken as long as the longest of them
+        self._saved_seconds.append(max(covered + [waited]) - waited)
+
+    def _cancel(self, speculations) -> None:
+        for speculation in speculations:
+            if speculation.task is not None and not speculation.task.done():
+                speculation.task.cancel()
+
+    def stats(self) -> Dict:
+        finals = list(self._final_seconds)
+        saved = list(self._saved_seconds)
+        used = self.hits + self.joined
+        wasted = self.misses + self.failed
+        return {
+            "enabled": self.enabled,
+            "sessions": len(self._sessions),
+            "started": self.started,
+            "invalidated": self.invalidated,
+            "hits": self.hits,
+            "joined": self.joined,
+            "misses": self.misses,
+            "failed": self.failed,
+            "hit_rate": used / (used + wasted) if used + wasted else 0.0,
+            "final_seconds_avg": sum(finals) / len(finals) if finals else 0.0,
+            "saved_seconds_avg": sum(saved) / len(saved) if saved else 0.0
+        }
@@ -0,0 +1,31 @@
+from artifact_cache import ArtifactCache
+
+
+def test_rebinding_drops_the_previous_artifacts():
+    cache = ArtifactCache()
+    cache.bind("a", "h1")
+    cache.put("docx", "h1", b"old")
+    cache.bind("a", "h2")
+    assert not cache.contains("docx", "h1")
+    assert cache.bytes == 0
+
+
+def test_artifacts_shared_by_another_session_are_kept():
+    cache = ArtifactCache()
+    cache.bind("a", "h1")
+    cache.bind("b", "h1")
+    cache.put("docx", "h1", b"shared")
+    cache.bind("a", "h2")
+    assert cache.get("docx", "h1") == b"shared"
+    cache.bind("b", "h2")
+    assert not cache.contains("docx", "h1")
+
+
+def test_forgotten_sessions_release_their_hash():
+    cache = ArtifactCache(max_sessions=1)
+    cache.bind("a", "h1")
+    cache.bind("b", "h1")  # forgets "a"
+    cache.put("docx", "h1", b"content")
+    cache.bind("b", "h2")
+    assert not cache.contains("docx", "h1")
+    assert cache._hash_sessions == {"h2": 1}
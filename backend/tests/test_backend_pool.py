@@ -0,0 +1,96 @@
+import asyncio
+import logging
+
+from ollama_client import OllamaClient
+from benchmarks.stub_ollama import StubOllama
+
+
+async def _setup(eject_seconds: float = 60):
+    stubs = [StubOllama(latency=0.02), StubOllama(latency=0.02)]
+    urls = [await stub.start() for stub in stubs]
+    # Health checks off, so only the cooldown brings an ejected backend back
+    client = OllamaClient(base_url=urls, model="stub", max_failures=3,
+                          eject_seconds=eject_seconds, health_interval=0)
+    await client.start()
+    return stubs, client
+
+
+async def _teardown(stubs, client) -> None:
+    await client.close()
+    for stub in stubs:
+        await stub.stop()
+
+
+async def _send(client: OllamaClient, count: int, tag: str):
+    # Distinct prompts so single-flight does not merge the requests
+    return await asyncio.gather(
+        *[client._generate({"model": "stub", "prompt": f"{tag} {i}", "stream": False}) for i in range(count)],
+        return_exceptions=True
+    )
+
+
+def test_requests_are_spread_across_backends():
+    async def scenario():
+        stubs, client = await _setup()
+        try:
+            results = await _send(client, 40, "spread")
+            assert not [result for result in results if isinstance(result, Exception)]
+            counts = [stub.request_count for stub in stubs]
+            assert sum(counts) == 40
+            assert min(counts) >= 10
+        finally:
+            await _teardown(stubs, client)
+
+    asyncio.run(scenario())
+
+
+def test_failed_requests_are_retried_on_the_healthy_backend():
+    async def scenario():
+        stubs, client = await _setup()
+        stubs[1].down = True
+        try:
+            results = await _send(client, 30, "failover")
+            assert not [result for result in results if isinstance(result, Exception)]
+            assert stubs[0].request_count == 30
+            assert client.backends.retries >= 1
+            failing = client.backends.stats()["backends"][1]
+            assert not failing["available"]
+            assert failing["ejections"] == 1
+            # Once ejected, the failing backend gets no more requests
+            received = stubs[1].request_count
+            await _send(client, 10, "after")
+            assert stubs[1].request_count == received
+        finally:
+            await _teardown(stubs, client)
+
+    logging.disable(logging.WARNING)
+    try:
+        asyncio.run(scenario())
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def test_ejected_backend_returns_after_its_cooldown():
+    async def scenario():
+        stubs, client = await _setup(eject_seconds=0.2)
+        stubs[1].down = True
+        try:
+            await _send(client, 20, "eject")
+            assert not client.backends.stats()["backends"][1]["available"]
+
+            stubs[1].down = False
+            await asyncio.sleep(0.3)
+            assert client.backends.stats()["backends"][1]["available"]
+            before = stubs[1].request_count
+            results = await _send(client, 20, "back")
+            assert not [result for result in results if isinstance(result, Exception)]
+            assert stubs[1].request_count > before
+            assert client.backends.stats()["backends"][1]["consecutive_failures"] == 0
+        finally:
+            await _teardown(stubs, client)
+
+    logging.disable(logging.WARNING)
+    try:
+        asyncio.run(scenario())
+    finally:
+        logging.disable(logging.NOTSET)
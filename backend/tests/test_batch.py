@@ -0,0 +1,123 @@
+import io
+import json
+import zipfile
+from typing import Dict
+
+import pytest
+from docx import Document
+from fastapi.testclient import TestClient
+
+import main
+from scheduler import OllamaScheduler
+from benchmarks.bench_docx import sample_resume
+
+# Without the lifespan, nothing here may reach Ollama
+client = TestClient(main.app)
+
+
+class FakeOllama:
+    """Enhances by rewriting the summary; a "fail" summary makes the model call fail."""
+
+    async def enhance_resume(self, resume_data: Dict, use_cache: bool = True) -> Dict:
+        if resume_data["summary"] == "fail":
+            return resume_data
+        return {**resume_data, "summary": f"Enhanced: {resume_data['summary']}"}
+
+
+@pytest.fixture(autouse=True)
+def fake_backend(monkeypatch):
+    scheduler = OllamaScheduler(max_concurrency=2)
+    monkeypatch.setattr(main, "scheduler", scheduler)
+    monkeypatch.setattr(main.batch_generator, "scheduler", scheduler)
+    monkeypatch.setattr(main.batch_generator, "ollama_client", FakeOllama())
+
+
+def _records(count: int):
+    return [{**sample_resume(i), "name": f"Candidate {i}"} for i in range(count)]
+
+
+def _archive(response) -> zipfile.ZipFile:
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    # The manifest is written last, after every DOCX
+    assert archive.namelist()[-1] == "manifest.json"
+    return archive
+
+
+def _text(archive: zipfile.ZipFile, name: str) -> str:
+    return "\n".join(p.text for p in Document(io.BytesIO(archive.read(name))).paragraphs)
+
+
+def test_json_list_renders_one_docx_per_record():
+    archive = _archive(client.post("/api/batch/generate", json=_records(3)))
+    manifest = json.loads(archive.read("manifest.json"))
+
+    assert (manifest["total"], manifest["succeeded"], manifest["failed"]) == (3, 3, 0)
+    assert [entry["index"] for entry in manifest["items"]] == [0, 1, 2]
+    for i, entry in enumerate(manifest["items"]):
+        assert entry["status"] == "ok" and entry["enhanced"] is True
+        assert entry["file"] == f"{i:04d}_candidate_{i}.docx"
+        assert entry["bytes"] == archive.getinfo(entry["file"]).file_size
+        text = _text(archive, entry["file"])
+        assert f"Candidate {i}" in text
+        assert "Enhanced: " in text
+
+
+def test_jsonl_upload_is_read_line_by_line():
+    lines = [json.dumps(record) for record in _records(3)]
+    # Blank lines are skipped and the last line needs no newline
+    body = "\n".join(lines[:2]) + "\n\n" + lines[2]
+    response = client.post("/api/batch/generate",
+                           files={"file": ("resumes.jsonl", body.encode("utf-8"), "application/x-ndjson")})
+    manifest = json.loads(_archive(response).read("manifest.json"))
+
+    assert (manifest["total"], manifest["succeeded"]) == (3, 3)
+    assert [entry["name"] for entry in manifest["items"]] == ["Candidate 0", "Candidate 1", "Candidate 2"]
+
+
+def test_manifest_records_failed_validation_without_stopping_the_batch():
+    records = _records(3)
+    del records[1]["email"]
+    records[1]["skills"] = "Python"
+    records[2]["summary"] = "fail"
+    archive = _archive(client.post("/api/batch/generate", json=records))
+    manifest = json.loads(archive.read("manifest.json"))
+
+    assert (manifest["total"], manifest["succeeded"], manifest["failed"]) == (3, 2, 1)
+    failed = manifest["items"][1]
+    assert failed["status"] == "failed" and failed["stage"] == "validate"
+    assert "email: Field required" in failed["error"]
+    assert "skills: Input should be a valid list" in failed["error"]
+    assert "file" not in failed
+    # A failed model call still renders the original data
+    assert manifest["items"][2]["status"] == "ok" and manifest["items"][2]["enhanced"] is False
+    assert len(archive.namelist()) == 3
+
+
+def test_malformed_jsonl_line_fails_only_that_item():
+    lines = [json.dumps(record) for record in _records(2)]
+    body = "\n".join([lines[0], "{not json", lines[1]])
+    response = client.post("/api/batch/generate", files={"file": ("resumes.jsonl", body.encode("utf-8"))})
+    manifest = json.loads(_archive(response).read("manifest.json"))
+
+    assert [entry["status"] for entry in manifest["items"]] == ["ok", "failed", "ok"]
+    assert manifest["items"][1]["stage"] == "validate"
+
+
+def test_items_beyond_the_limit_are_skipped(monkeypatch):
+    monkeypatch.setattr(main.batch_generator, "max_items", 2)
+    manifest = json.loads(_archive(client.post("/api/batch/generate", json=_records(4))).read("manifest.json"))
+
+    assert (manifest["total"], manifest["succeeded"]) == (2, 2)
+    assert manifest["items"][-1]["status"] == "skipped"
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"json": {"name": "not a list"}},
+    {"content": b"not json", "headers": {"content-type": "application/json"}},
+    {"files": {"other": ("resumes.jsonl", b"{}")}},
+])
+def test_bad_bodies_are_rejected(kwargs):
+    assert client.post("/api/batch/generate", **kwargs).status_code == 400
@@ -0,0 +1,37 @@
+import asyncio
+
+from starlette.websockets import WebSocketDisconnect, WebSocketState
+
+from chat_socket import Outbox
+
+
+class GoneWebSocket:
+    """A WebSocket whose client disconnected after the first message."""
+
+    application_state = WebSocketState.CONNECTED
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        if self.sent:
+            raise WebSocketDisconnect(1006)
+        self.sent.append(message)
+
+    async def close(self, code):
+        raise AssertionError("the outbox closed a socket that is gone")
+
+
+def test_outbox_ends_cleanly_when_the_client_is_gone():
+    async def scenario():
+        websocket = GoneWebSocket()
+        outbox = Outbox(websocket)
+        writer = asyncio.create_task(outbox.run())
+        for i in range(3):
+            outbox.send({"type": "reply", "response": str(i)})
+        await asyncio.wait_for(writer, timeout=1)
+        # Finished without an exception for the event loop to report
+        assert writer.exception() is None
+        assert websocket.sent == [{"type": "reply", "response": "0"}]
+
+    asyncio.run(scenario())
@@ -0,0 +1,56 @@
+import asyncio
+import io
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import jinja2
+import pytest
+from docx import Document
+
+from docx_generator import DocxGenerator
+from renderer import ArtifactRenderer
+from benchmarks.bench_docx import large_resume, sample_resume
+
+DOCUMENTS = 24
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    # A private temp directory, so files other processes create do not count
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def _resume(index: int) -> dict:
+    return large_resume(index) if index % 4 == 0 else sample_resume(index)
+
+
+def _assert_isolated(contents) -> None:
+    for i, content in enumerate(contents):
+        text = "\n".join(p.text for p in Document(io.BytesIO(content)).paragraphs)
+        assert f"Candidate {i}\n" in text, f"document {i} is missing its own name"
+        assert text.count("Candidate ") == 1, f"document {i} contains another resume's data"
+        assert f"candidate{i}@example.com" in text
+
+
+def test_shared_generator_renders_concurrent_documents_in_isolation(temp_dir):
+    generator = DocxGenerator()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        contents = list(pool.map(generator.render, [_resume(i) for i in range(DOCUMENTS)]))
+    _assert_isolated(contents)
+    assert os.listdir(temp_dir) == []
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_renderer_renders_concurrent_documents_in_isolation(temp_dir, executor):
+    async def scenario():
+        renderer = ArtifactRenderer(jinja2.Environment(), executor=executor, workers=4)
+        try:
+            return await asyncio.gather(*(renderer.render_docx(_resume(i)) for i in range(DOCUMENTS)))
+        finally:
+            await renderer.close()
+
+    _assert_isolated(asyncio.run(scenario()))
+    assert os.listdir(temp_dir) == []
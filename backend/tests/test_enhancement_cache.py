@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from enhancement_cache import EnhancementCache
+from ollama_client import OllamaClient
+from benchmarks.bench_enhance_sections import RESUME
+from benchmarks.stub_ollama import StubOllama
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def test_memory_tier_hits_misses_and_lru_eviction():
+    cache = EnhancementCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}  # "b" is now least recently used
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("c") == {"n": 3}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+
+
+def test_hits_are_independent_copies():
+    cache = EnhancementCache()
+    cache.put("a", {"skills": ["python"]})
+    cache.get("a")["skills"].append("mutated")
+    assert cache.get("a") == {"skills": ["python"]}
+
+
+def test_sqlite_tier_survives_a_restart_and_promotes_hits(db_path):
+    cache = EnhancementCache(max_entries=1, db_path=db_path)
+    cache.put("a", {"n": 1})
+    cache.close()
+
+    cache = EnhancementCache(max_entries=1, db_path=db_path)
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("a") == {"n": 1}
+    stats = cache.stats()
+    assert (stats["hits"], stats["disk_hits"]) == (2, 1)
+    assert cache.get("missing") is None
+    cache.close()
+
+
+def test_sqlite_tier_is_trimmed_to_its_limit_oldest_first(db_path):
+    cache = EnhancementCache(max_entries=1, db_path=db_path, disk_max_entries=10)
+    for i in range(11):
+        cache.put(f"k{i}", {"n": i})
+    # Over the limit: trimmed to nine tenths, least recently accessed first
+    rows = cache._db.execute("SELECT key FROM enhance_cache ORDER BY accessed").fetchall()
+    assert [key for key, in rows] == [f"k{i}" for i in range(2, 11)]
+    # Replacing a row does not trim
+    for _ in range(5):
+        cache.put("k10", {"n": 10})
+    assert cache._db.execute("SELECT COUNT(*) FROM enhance_cache").fetchone()[0] == 9
+    cache.close()
+
+
+def test_invalidate_drops_both_tiers(db_path):
+    cache = EnhancementCache(db_path=db_path)
+    cache.put("a", {"n": 1})
+    assert cache.invalidate("a") is True
+    assert cache.invalidate("a") is False
+    assert cache.get("a") is None
+    cache.close()
+
+
+def test_async_methods_run_sqlite_off_the_event_loop(db_path, monkeypatch):
+    cache = EnhancementCache(max_entries=1, db_path=db_path)
+    threads = set()
+    execute = cache._db.execute
+
+    class Connection:
+        def execute(self, *args):
+            threads.add(threading.current_thread().name)
+            return execute(*args)
+
+    monkeypatch.setattr(cache, "_db", Connection())
+
+    async def scenario():
+        await cache.put_async("a", {"n": 1})
+        await cache.put_async("b", {"n": 2})  # evicts "a" from memory
+        assert await cache.get_async("a") == {"n": 1}
+        assert await cache.invalidate_async("a") is True
+        assert await cache.get_async("a") is None
+
+    asyncio.run(scenario())
+    assert threads == {"sqlite-enhance-cache_0"}
+    monkeypatch.undo()
+    cache.close()
+
+
+def test_use_cache_false_bypasses_the_cache_and_refreshes_it():
+    async def scenario():
+        stub = StubOllama(response=json.dumps({**RESUME, "summary": "first"}))
+        client = OllamaClient(base_url=await stub.start(), model="stub", enhance_mode="whole",
+                              cache=EnhancementCache())
+        await client.start()
+        try:
+            assert (await client.enhance_resume(dict(RESUME)))["summary"] == "first"
+            assert (await client.enhance_resume(dict(RESUME)))["summary"] == "first"
+            assert stub.request_count == 1
+
+            stub.response = json.dumps({**RESUME, "summary": "second"})
+            assert (await client.enhance_resume(dict(RESUME), use_cache=False))["summary"] == "second"
+            assert stub.request_count == 2
+            # The fresh result replaced the cached one
+            assert (await client.enhance_resume(dict(RESUME)))["summary"] == "second"
+            assert stub.request_count == 2
+        finally:
+            await client.close()
+            await stub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_delete_endpoint_invalidates_the_sessions_enhancement():
+    client = TestClient(main.app)
+    session_id = client.post("/api/session", json={}).json()["session_id"]
+    resume = main._ensure_required_fields(dict(main.sessions.get(session_id)["resume_data"]))
+    key = main.ollama_client.enhance_cache_key(resume)
+    main.enhancement_cache.put(key, {"summary": "cached"})
+
+    response = client.delete(f"/api/cache/enhance/{session_id}")
+    assert response.json() == {"invalidated": True}
+    assert main.enhancement_cache.get(key) is None
+    assert client.delete(f"/api/cache/enhance/{session_id}").json() == {"invalidated": False}
+    assert client.delete("/api/cache/enhance/missing").status_code == 404
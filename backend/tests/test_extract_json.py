@@ -0,0 +1,62 @@
+import pytest
+
+from ollama_client import OllamaClient
+from schemas import extract_json
+
+
+@pytest.mark.parametrize("raw, expected, outcome", [
+    ('{"name": "Jane"}', {"name": "Jane"}, "parsed"),
+    ('  [1, 2]\n', [1, 2], "parsed"),
+    ('```json\n{"name": "Jane"}\n```', {"name": "Jane"}, "recovered"),
+    ('Here you go:\n```\n{"name": "Jane"}\n```\nAnything else?', {"name": "Jane"}, "recovered"),
+    # A fence that does not hold JSON falls through to the scan
+    ('```\nnot json\n```\nthen {"name": "Jane"}', {"name": "Jane"}, "recovered"),
+    ('Sure! Here is the resume: {"name": "Jane", "skills": ["Go"]}', {"name": "Jane", "skills": ["Go"]}, "recovered"),
+    ('{"name": "Jane"}\nI improved the summary.', {"name": "Jane"}, "recovered"),
+    ('Result: {"a": {"b": [{"c": 1}]}} Hope that helps.', {"a": {"b": [{"c": 1}]}}, "recovered"),
+])
+def test_extracts_json_from_noisy_answers(raw, expected, outcome):
+    assert extract_json(raw) == (expected, outcome)
+
+
+def test_braces_and_quotes_inside_strings_do_not_end_the_value():
+    raw = 'Here: {"summary": "Uses {braces} and ]brackets[", "quote": "say \\"}\\" twice"} done'
+    value, outcome = extract_json(raw)
+    assert value == {"summary": "Uses {braces} and ]brackets[", "quote": 'say "}" twice'}
+    assert outcome == "recovered"
+
+
+@pytest.mark.parametrize("raw", [
+    "",
+    "I could not improve this resume.",
+    '{"name": "Jane", "skills": ["Go"',
+    # An object nested in a truncated answer is not taken for the whole answer
+    'Here it is: {"name": "Jane", "education": {"degree": "BSc"}',
+    "```json\n{name: 'Jane'}\n```",
+])
+def test_malformed_answers_raise_value_error(raw):
+    with pytest.raises(ValueError):
+        extract_json(raw)
+
+
+def test_decode_counts_each_outcome():
+    client = OllamaClient()
+    assert client._decode("resume", '{"name": "Jane"}') == {"name": "Jane"}
+    assert client._decode("resume", 'Sure: {"name": "Jane"}') == {"name": "Jane"}
+    assert client._decode("skills", '```json\n{"skills": ["Go"]}\n```') == {"skills": ["Go"]}
+    with pytest.raises(ValueError):
+        client._decode("resume", "no JSON at all")
+
+    stats = client.parse_stats.stats()
+    assert {key: stats["resume"][key] for key in ("parsed", "recovered", "failed")} == {
+        "parsed": 1, "recovered": 1, "failed": 1
+    }
+    assert stats["resume"]["failed_rate"] == pytest.approx(1 / 3)
+    assert stats["skills"]["recovered_rate"] == 1.0
+
+
+def test_parse_enhanced_rejects_malformed_and_non_object_answers():
+    client = OllamaClient()
+    resume = {"name": "Jane"}
+    assert client._parse_enhanced("no JSON at all", resume) is None
+    assert client._parse_enhanced('["not", "an", "object"]', resume) is None
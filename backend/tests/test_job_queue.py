@@ -0,0 +1,36 @@
+import asyncio
+
+from job_queue import JobQueue
+
+
+def test_every_submitted_job_is_accounted_for():
+    async def scenario():
+        queue = JobQueue(workers=2, max_depth=10)
+        await queue.start()
+        release = asyncio.Event()
+
+        async def ok():
+            return "ok"
+
+        async def fail():
+            raise ValueError("boom")
+
+        async def block():
+            await release.wait()
+
+        done = [queue.submit("ok", ok), queue.submit("fail", fail)]
+        await asyncio.gather(*(queue.wait(job, 1) for job in done))
+        blocked = [queue.submit("block", block) for _ in range(2)]
+        queued = queue.submit("block", block)
+        await asyncio.sleep(0.01)
+        await queue.stop()
+
+        stats = queue.stats()
+        assert (stats["succeeded"], stats["failed"], stats["cancelled"]) == (1, 1, 2)
+        assert stats["submitted"] == (stats["succeeded"] + stats["failed"] + stats["cancelled"]
+                                      + stats["running"] + stats["depth"]) == 5
+        assert [job.status for job in blocked] == ["cancelled", "cancelled"]
+        assert all(job.finished for job in blocked)
+        assert queued.status == "queued"
+
+    asyncio.run(scenario())
@@ -0,0 +1,151 @@
+import datetime
+import io
+import json
+import logging
+import queue
+import threading
+
+import pytest
+
+import logging_setup
+from logging_setup import DeferredQueueHandler, LogPayload, configure_logging, logging_stats, stop_logging
+
+logger = logging.getLogger("tests.logging_setup")
+
+
+class Traced:
+    """Records the threads it is turned into text on."""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self) -> str:
+        self.threads.append(threading.current_thread())
+        return "traced"
+
+
+class ThreadRecordingStream(io.StringIO):
+    """Records the threads that write to it."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def write(self, text: str) -> int:
+        self.threads.add(threading.current_thread())
+        return super().write(text)
+
+
+class BlockingStream(io.StringIO):
+    """A stream whose writes wait until released, to hold the listener thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.released = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.writing.set()
+        self.released.wait(5)
+        return super().write(text)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Configure a separate logging pipeline, leaving the app's own in place."""
+    for name in ("_handler", "_sampler", "_listener"):
+        monkeypatch.setattr(logging_setup, name, None)
+    monkeypatch.setattr(LogPayload, "max_chars", LogPayload.max_chars)
+    root = logging.getLogger()
+    level = root.level
+
+    def configure(**options) -> io.StringIO:
+        stream = options.pop("stream", None) or io.StringIO()
+        configure_logging(stream=stream, **options)
+        return stream
+
+    yield configure
+    stop_logging()
+    root.setLevel(level)
+
+
+def _records(stream: io.StringIO):
+    return [json.loads(line) for line in stream.getvalue().splitlines()
+            if json.loads(line)["name"] == logger.name]
+
+
+def test_payload_formats_lazily_and_truncates():
+    resume = {"name": "Jane", "when": datetime.date(2024, 1, 2)}
+    payload = LogPayload(resume, max_chars=0)
+    resume["name"] = "Changed"
+    assert str(payload) == '{"name": "Jane", "when": "2024-01-02"}'
+    assert str(LogPayload("x" * 10, max_chars=4)) == "xxxx... (6 more chars)"
+    assert str(LogPayload("short", max_chars=10)) == "short"
+
+    traced = Traced()
+    logger.debug("Never written: %s", LogPayload({"value": traced}))
+    assert traced.threads == []
+
+
+def test_queue_handler_leaves_formatting_to_the_listener():
+    traced = Traced()
+    log_queue = queue.Queue()
+    handler = DeferredQueueHandler(log_queue)
+    record = logger.makeRecord(logger.name, logging.INFO, __file__, 0, "Resume: %s",
+                               (LogPayload({"value": traced}),), None)
+    handler.handle(record)
+    queued = log_queue.get_nowait()
+    assert traced.threads == []
+    assert queued.getMessage() == 'Resume: {"value": "traced"}'
+
+
+def test_records_are_written_by_the_listener_and_flushed_on_stop(pipeline):
+    stream = ThreadRecordingStream()
+    pipeline(level="INFO", max_chars=20, stream=stream)
+    logger.info("Resume: %s", LogPayload({"name": "Jane", "padding": "p" * 40}))
+    logger.debug("Below the level: %s", LogPayload({"name": "Jane"}))
+    stop_logging()
+
+    records = _records(stream)
+    assert [record["levelname"] for record in records] == ["INFO"]
+    assert records[0]["message"] == 'Resume: {"name": "Jane", "pa... (51 more chars)'
+    assert stream.threads and threading.main_thread() not in stream.threads
+
+    # After shutdown the handler is gone and nothing more is written
+    assert logging_setup._handler not in logging.getLogger().handlers
+    logger.info("After stop")
+    assert len(_records(stream)) == 1
+    stop_logging()
+
+
+def test_full_queue_drops_instead_of_blocking(pipeline):
+    stream = BlockingStream()
+    pipeline(level="INFO", queue_size=2, stream=stream)
+    logger.info("taken by the listener")
+    assert stream.writing.wait(5)
+    for i in range(5):
+        logger.info("record %d", i)
+    stats = logging_stats()
+    assert stats["queued"] == 2
+    assert stats["dropped_queue_full"] == 3
+
+    # Stopping waits for room for its sentinel rather than failing
+    stopper = threading.Thread(target=stop_logging)
+    stopper.start()
+    stopper.join(0.1)
+    stream.released.set()
+    stopper.join(5)
+    assert logging_setup._listener is None
+    assert [record["message"] for record in _records(stream)] == [
+        "taken by the listener", "record 0", "record 1"
+    ]
+
+
+def test_payload_records_are_sampled(pipeline):
+    stream = pipeline(level="INFO", sample_rate=0.0)
+    for _ in range(3):
+        logger.info("Resume: %s", LogPayload({"name": "Jane"}))
+    logger.info("Plain record")
+    assert logging_stats()["dropped_sampling"] == 3
+    stop_logging()
+    assert [record["message"] for record in _records(stream)] == ["Plain record"]
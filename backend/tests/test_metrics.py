@@ -0,0 +1,114 @@
+import re
+from collections import defaultdict
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from metrics import PROMETHEUS_CONTENT_TYPE, Registry
+
+# Without the lifespan, nothing here may reach Ollama
+client = TestClient(main.app)
+
+METRIC_NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+LABEL = r'[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\[\\"n])*"'
+SAMPLE = re.compile(rf"^({METRIC_NAME})(\{{{LABEL}(?:,{LABEL})*\}})? (\S+)$")
+COMMENT = re.compile(rf"^# (HELP|TYPE) ({METRIC_NAME}) (.*)$")
+
+
+def _parse(text: str):
+    """Check the text exposition grammar and return (types, samples)."""
+    assert text.endswith("\n")
+    types, samples = {}, []
+    for line in text[:-1].split("\n"):
+        comment = COMMENT.match(line)
+        if comment:
+            kind, name, rest = comment.groups()
+            if kind == "TYPE":
+                assert rest in ("counter", "gauge", "histogram", "summary", "untyped"), line
+                assert name not in types, f"{name} declared twice"
+                types[name] = rest
+            continue
+        sample = SAMPLE.match(line)
+        assert sample, f"malformed line: {line!r}"
+        name, labels, value = sample.groups()
+        float(value)
+        family = re.sub(r"_(bucket|sum|count)$", "", name) if name not in types else name
+        assert family in types, f"{name} has no TYPE line before it"
+        samples.append((name, dict(re.findall(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"', labels or "")), value))
+    return types, samples
+
+
+def _check_histograms(types, samples) -> None:
+    buckets = defaultdict(list)
+    counts = {}
+    for name, labels, value in samples:
+        if name.endswith("_bucket") and types.get(name[:-len("_bucket")]) == "histogram":
+            key = (name[:-len("_bucket")], tuple(sorted((k, v) for k, v in labels.items() if k != "le")))
+            buckets[key].append((labels["le"], float(value)))
+        elif name.endswith("_count") and types.get(name[:-len("_count")]) == "histogram":
+            counts[(name[:-len("_count")], tuple(sorted(labels.items())))] = float(value)
+    for key, series in buckets.items():
+        values = [value for _, value in series]
+        assert values == sorted(values), f"{key} buckets are not cumulative"
+        assert [float(le) for le, _ in series] == sorted(float(le) for le, _ in series)
+        assert series[-1][0] == "+Inf"
+        assert series[-1][1] == counts[key]
+
+
+def test_counter_and_histogram_exposition():
+    registry = Registry()
+    requests = registry.counter("app_requests_total", "Requests handled", ["route", "status"])
+    latency = registry.histogram("app_seconds", "Latency", ["stage"], buckets=(0.1, 1))
+    registry.counter("app_idle_total", "Never incremented")
+    requests.inc(1, "/api/x", "200")
+    requests.inc(2, "/api/x", "200")
+    requests.inc(1, 'say "hi"\\\n', "500")
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, "parse")
+
+    assert registry.render() == "\n".join([
+        "# HELP app_requests_total Requests handled",
+        "# TYPE app_requests_total counter",
+        'app_requests_total{route="/api/x",status="200"} 3',
+        'app_requests_total{route="say \\"hi\\"\\\\\\n",status="500"} 1',
+        "# HELP app_seconds Latency",
+        "# TYPE app_seconds histogram",
+        'app_seconds_bucket{stage="parse",le="0.1"} 2',
+        'app_seconds_bucket{stage="parse",le="1"} 3',
+        'app_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'app_seconds_sum{stage="parse"} 3.65',
+        'app_seconds_count{stage="parse"} 4',
+        "# HELP app_idle_total Never incremented",
+        "# TYPE app_idle_total counter",
+    ]) + "\n"
+    types, samples = _parse(registry.render())
+    _check_histograms(types, samples)
+
+
+def test_metric_names_are_registered_once():
+    registry = Registry()
+    registry.counter("app_total", "Total")
+    with pytest.raises(ValueError):
+        registry.histogram("app_total", "Again")
+
+
+def test_metrics_endpoint_serves_valid_exposition():
+    session_id = client.post("/api/session", json={}).json()["session_id"]
+    client.get(f"/api/resume_preview/{session_id}")
+    client.get("/no/such/page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == PROMETHEUS_CONTENT_TYPE
+
+    types, samples = _parse(response.text)
+    assert types["resullme_http_requests_total"] == "counter"
+    assert types["resullme_stage_seconds"] == "histogram"
+    _check_histograms(types, samples)
+
+    routes = {labels["route"] for name, labels, _ in samples if name == "resullme_http_requests_total"}
+    # Per-session URLs are labelled by their route template
+    assert "/api/resume_preview/{session_id}" in routes
+    assert "unmatched" in routes
+    assert not any(session_id in route for route in routes)
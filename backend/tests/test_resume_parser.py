@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from resume_parser import IncrementalResumeParser, ResumeParser
+from benchmarks.bench_parser import EDGE_CASES, generated_resume, tokenize
+from benchmarks.legacy_resume_parser import LegacyResumeParser
+
+# The legacy parser is kept unchanged, including its old BeautifulSoup calls
+pytestmark = pytest.mark.filterwarnings("ignore:The 'text' argument:DeprecationWarning")
+
+SEED = 7
+DOCUMENTS = 200
+
+
+def _corpus():
+    rng = random.Random(SEED)
+    return EDGE_CASES + [generated_resume(rng) for _ in range(DOCUMENTS)]
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return ResumeParser()
+
+
+@pytest.mark.parametrize("index, document", list(enumerate(_corpus())))
+def test_single_pass_parser_matches_the_legacy_parser(parser, index, document):
+    expected = LegacyResumeParser().parse_markdown_to_json(document)
+    actual = parser.parse_markdown_to_json(document)
+    # The legacy parser had no Experience support
+    actual.pop("experience", None)
+    assert actual == expected
+
+
+def test_incremental_parser_matches_the_buffered_parse(parser):
+    rng = random.Random(SEED)
+    for document in _corpus():
+        incremental = IncrementalResumeParser(parser)
+        fields = []
+        for token in tokenize(rng, document):
+            fields.extend(incremental.feed(token))
+        fields.extend(incremental.close())
+        assert len(fields) == len({key for key, _ in fields}), "a field was emitted twice"
+        assert incremental.resume() == parser.parse_markdown_to_json(document)
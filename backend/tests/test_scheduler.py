@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from scheduler import BULK, INTERACTIVE, OllamaScheduler, SchedulerRejected
+
+# Without the lifespan, nothing here may reach Ollama
+client = TestClient(main.app)
+
+
+def test_interactive_waiters_are_served_before_bulk():
+    async def scenario():
+        scheduler = OllamaScheduler(max_concurrency=1, max_queue=10)
+        order = []
+        release = asyncio.Event()
+
+        async def worker(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+                if name == "holder":
+                    await release.wait()
+
+        holder = asyncio.create_task(worker("holder", INTERACTIVE))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(worker(name, priority))
+            for name, priority in [("bulk-1", BULK), ("interactive-1", INTERACTIVE),
+                                   ("bulk-2", BULK), ("interactive-2", INTERACTIVE)]
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == {"interactive": 2, "bulk": 2, "speculative": 0}
+        release.set()
+        await asyncio.gather(holder, *waiters)
+        assert scheduler.active == 0
+        return order
+
+    assert asyncio.run(scenario()) == ["holder", "interactive-1", "interactive-2", "bulk-1", "bulk-2"]
+
+
+def test_full_wait_queue_is_rejected_with_503():
+    async def scenario():
+        scheduler = OllamaScheduler(max_concurrency=1, max_queue=2)
+        release = asyncio.Event()
+
+        async def worker():
+            async with scheduler.slot():
+                await release.wait()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(3)]
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerRejected) as rejected:
+            await scheduler.acquire()
+        # Callers that are already bounded may still queue
+        bounded = asyncio.create_task(scheduler.acquire(queue_limit=False))
+        await asyncio.sleep(0)
+        assert sum(scheduler.stats()["queued"].values()) == 3
+        release.set()
+        await asyncio.gather(*tasks)
+        await bounded
+        scheduler.release()
+        return scheduler, rejected.value
+
+    scheduler, rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    # Two waiters ahead of it on one slot, at the default 5s service time
+    assert rejected.retry_after == 15
+    assert scheduler.stats()["rejected_busy"] == 1
+    assert scheduler.active == 0
+
+
+def test_token_bucket_rejects_with_429():
+    scheduler = OllamaScheduler(user_rate=0.5, user_burst=3)
+    for _ in range(3):
+        scheduler.admit("alice")
+    with pytest.raises(SchedulerRejected) as rejected:
+        scheduler.admit("alice")
+    assert rejected.value.status_code == 429
+    # One token refills in two seconds at 0.5/s
+    assert 1 <= rejected.value.retry_after <= 2
+    # Other users and anonymous calls are not charged
+    scheduler.admit("bob")
+    scheduler.admit(None)
+    assert scheduler.stats()["rejected_rate"] == 1
+
+
+def test_retry_after_grows_with_backlog_and_service_time():
+    scheduler = OllamaScheduler(max_concurrency=2)
+    assert scheduler.retry_after() == 3
+    scheduler.active = 1
+    scheduler.release(held_for=30.0)
+    assert scheduler.retry_after() == 5
+    quick = OllamaScheduler()
+    for _ in range(50):
+        quick.active += 1
+        quick.release(held_for=0.0)
+    # Never below one second, however fast calls complete
+    assert quick.retry_after() == 1
+
+
+def _session() -> str:
+    return client.post("/api/session", json={}).json()["session_id"]
+
+
+def test_endpoint_answers_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(main, "scheduler", OllamaScheduler(user_rate=0.1, user_burst=1))
+    session_id = _session()
+    main.scheduler.admit(session_id)
+    response = client.post(f"/api/generate?session_id={session_id}")
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 10
+
+
+def test_endpoint_answers_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(main, "scheduler", OllamaScheduler(max_queue=0))
+    response = client.post(f"/api/generate?session_id={_session()}")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert main.scheduler.stats()["rejected_busy"] == 1
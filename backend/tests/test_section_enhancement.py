@@ -0,0 +1,133 @@
+import asyncio
+import logging
+
+import pytest
+
+from enhancement_cache import EnhancementCache
+from ollama_client import RESUME_FIELDS, OllamaClient
+from section_enhancement import SECTION_INSTRUCTIONS, SectionError, merge_sections, parse_section
+from benchmarks.bench_enhance_sections import ENHANCED, RESUME, make_responder
+from benchmarks.stub_ollama import StubOllama
+
+
+def test_parse_section_unwraps_and_normalizes():
+    assert parse_section("summary", {"summary": "  Seasoned engineer.  "}) == "Seasoned engineer."
+    assert parse_section("skills", [" Go ", "SQL"]) == ["Go", "SQL"]
+    # Keys the model left out are filled from the original entry at the same position
+    original = [{"title": "Dev", "company": "Acme", "duration": "2 years", "description": "APIs"}]
+    assert parse_section("experience", {"experience": [{"title": "Developer", "description": "Built APIs"}]}, original) == [
+        {"title": "Developer", "company": "Acme", "duration": "2 years", "description": "Built APIs"}
+    ]
+
+
+@pytest.mark.parametrize("section, answer", [
+    ("summary", ""),
+    ("summary", ["not", "a", "string"]),
+    ("skills", []),
+    ("skills", ["Go", 3]),
+    ("projects", {"projects": [{"description": "no name"}]}),
+    ("education", "State University"),
+])
+def test_parse_section_rejects_malformed_answers(section, answer):
+    with pytest.raises(SectionError):
+        parse_section(section, answer)
+
+
+def test_merge_sections_overlays_and_keeps_required_fields():
+    merged = merge_sections({"name": "Jane", "skills": ["Go"]}, {"skills": ["Go", "SQL"]}, RESUME_FIELDS)
+    assert merged["name"] == "Jane"
+    assert merged["skills"] == ["Go", "SQL"]
+    assert set(merged) == set(RESUME_FIELDS)
+
+
+def _run(scenario):
+    # Failed sections log a warning each; they are expected here
+    logging.disable(logging.WARNING)
+    try:
+        return asyncio.run(scenario())
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+async def _client(stub: StubOllama, **options) -> OllamaClient:
+    client = OllamaClient(base_url=await stub.start(), model="stub", enhance_mode="sections", **options)
+    await client.start()
+    return client
+
+
+def test_failed_section_keeps_its_original_and_the_rest_merge_back():
+    async def scenario():
+        stub = StubOllama(respond=make_responder("projects"))
+        client = await _client(stub)
+        try:
+            resume = dict(RESUME)
+            return await client.enhance_resume(resume), client.section_stats.stats(), resume
+        finally:
+            await client.close()
+            await stub.stop()
+
+    result, stats, resume = _run(scenario)
+    assert result["projects"] == RESUME["projects"]
+    for section in SECTION_INSTRUCTIONS:
+        if section != "projects":
+            assert result[section] == ENHANCED[section]
+    assert {field: result[field] for field in ("name", "title", "email")} == {
+        field: RESUME[field] for field in ("name", "title", "email")
+    }
+    assert stats["projects"]["failed"] == 1
+    assert sum(stats[section]["enhanced"] for section in SECTION_INSTRUCTIONS) == len(SECTION_INSTRUCTIONS) - 1
+    # The caller's data is not modified
+    assert resume == RESUME
+
+
+def test_stream_yields_successful_sections_then_the_merged_result():
+    async def scenario():
+        stub = StubOllama(respond=make_responder("skills"))
+        client = await _client(stub)
+        try:
+            return [event async for event in client.enhance_resume_stream(dict(RESUME))]
+        finally:
+            await client.close()
+            await stub.stop()
+
+    events = _run(scenario)
+    sections = {event["section"]: event["value"] for event in events if event["type"] == "section"}
+    assert set(sections) == set(SECTION_INSTRUCTIONS) - {"skills"}
+    assert events[-1]["type"] == "result"
+    assert events[-1]["resume_data"] == {**RESUME, **sections}
+
+
+def test_all_sections_failing_returns_the_original_data():
+    async def scenario():
+        stub = StubOllama(response="I cannot help with that.")
+        client = await _client(stub)
+        try:
+            resume = dict(RESUME)
+            return await client.enhance_resume(resume), resume
+        finally:
+            await client.close()
+            await stub.stop()
+
+    result, resume = _run(scenario)
+    assert result is resume
+
+
+def test_only_failed_sections_are_asked_for_again_with_the_cache():
+    async def scenario():
+        stub = StubOllama(respond=make_responder("experience"))
+        client = await _client(stub, cache=EnhancementCache())
+        try:
+            await client.enhance_resume(dict(RESUME))
+            first = stub.request_count
+            stub.respond = make_responder(None)
+            result = await client.enhance_resume(dict(RESUME))
+            return result, first, stub.request_count - first, client.section_stats.stats()
+        finally:
+            await client.close()
+            await stub.stop()
+
+    result, first, second, stats = _run(scenario)
+    assert first == len(SECTION_INSTRUCTIONS)
+    assert second == 1
+    assert result["experience"] == ENHANCED["experience"]
+    assert sum(stats[section]["cached"] for section in SECTION_INSTRUCTIONS) == len(SECTION_INSTRUCTIONS) - 1
@@ -0,0 +1,17 @@
+import pytest
+
+import main
+import settings
+
+
+def _session():
+    return {"messages": []}
+
+
+@pytest.mark.parametrize("limit", [0, 1, 3])
+def test_record_message_keeps_the_most_recent(monkeypatch, limit):
+    monkeypatch.setattr(settings, "SESSION_MAX_MESSAGES", limit)
+    session = _session()
+    for i in range(5):
+        main._record_message(session, f"message {i}")
+    assert [m["text"] for m in session["messages"]] == [f"message {i}" for i in range(5 - limit, 5)]
@@ -0,0 +1,107 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from session_store import SqliteSessionStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "sessions.db")
+
+
+def test_idle_entries_expire(db_path):
+    store = SqliteSessionStore(db_path, "sessions", ttl=0.2)
+    store.set("old", {"n": 1})
+    time.sleep(0.3)
+    store.set("new", {"n": 2})
+    assert store.get("old") is None
+    assert store.get("new") == {"n": 2}
+    store.set("stale", {"n": 3})
+    time.sleep(0.3)
+    assert store.sweep() == 2
+    assert store.stats()["live"] == 0
+    store.close()
+
+
+def test_writes_evict_least_recently_used_entries_over_budget(db_path):
+    store = SqliteSessionStore(db_path, "sessions", max_entries=3)
+    for i in range(5):
+        store.set(f"s{i}", {"n": i})
+    assert store.stats()["live"] == 3
+    assert store.get("s0") is None and store.get("s1") is None
+    assert store.get("s4") == {"n": 4}
+    assert store.evictions == 2
+    store.close()
+
+
+def test_byte_budget_keeps_the_entry_just_written(db_path):
+    store = SqliteSessionStore(db_path, "sessions", max_bytes=100)
+    store.set("small", {"text": "x" * 10})
+    store.set("big", {"text": "x" * 200})
+    assert store.get("small") is None
+    assert store.get("big") is not None
+    store.close()
+
+
+def test_update_is_serialized_across_connections(db_path):
+    # Two stores on one file stand in for two uvicorn workers
+    stores = [SqliteSessionStore(db_path, "sessions") for _ in range(2)]
+    stores[0].set("counter", {"n": 0})
+
+    def increment(value):
+        n = value["n"]
+        time.sleep(0.001)  # Widen the read-modify-write window
+        value["n"] = n + 1
+
+    def work(store):
+        for _ in range(25):
+            store.update("counter", increment)
+
+    threads = [threading.Thread(target=work, args=(store,)) for store in stores for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stores[1].get("counter") == {"n": 100}
+    for store in stores:
+        store.close()
+
+
+def test_async_methods_run_off_the_event_loop(db_path):
+    store = SqliteSessionStore(db_path, "sessions")
+    threads = set()
+
+    def record(value):
+        threads.add(threading.current_thread().name)
+        value["n"] += 1
+
+    async def scenario():
+        await store.set_async("s", {"n": 0})
+        assert await store.update_async("s", record) == {"n": 1}
+        assert await store.get_async("s") == {"n": 1}
+        await store.delete_async("s")
+        assert await store.get_async("s") is None
+        assert (await store.stats_async())["live"] == 0
+
+    asyncio.run(scenario())
+    assert threads == {"sqlite-sessions_0"}
+    store.close()
+
+
+def test_a_held_lock_fails_writes_after_the_busy_timeout(db_path):
+    store = SqliteSessionStore(db_path, "sessions", busy_timeout=0.1)
+    holder = sqlite3.connect(db_path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    start = time.monotonic()
+    with pytest.raises(sqlite3.OperationalError):
+        store.set("s", {"n": 1})
+    assert time.monotonic() - start < 1
+    holder.execute("ROLLBACK")
+    holder.close()
+    store.set("s", {"n": 1})
+    assert store.get("s") == {"n": 1}
+    store.close()
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from ollama_client import OllamaClient
+from single_flight import SingleFlight
+from benchmarks.stub_ollama import StubOllama
+
+PAYLOAD = {"model": "stub", "prompt": "Enhance this resume", "stream": False}
+
+
+async def _client(**stub_options):
+    stub = StubOllama(**stub_options)
+    client = OllamaClient(base_url=await stub.start(), model="stub")
+    await client.start()
+    return stub, client
+
+
+async def _close(stub: StubOllama, client: OllamaClient) -> None:
+    await client.close()
+    await stub.stop()
+
+
+def test_concurrent_identical_calls_send_one_upstream_request():
+    async def scenario():
+        stub, client = await _client(latency=0.1)
+        try:
+            results = await asyncio.gather(*[client._generate(dict(PAYLOAD)) for _ in range(20)])
+            assert stub.request_count == 1
+            assert all(result == results[0] for result in results)
+            assert client.single_flight.coalesced == 19
+            assert client.single_flight.in_flight() == 0
+        finally:
+            await _close(stub, client)
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_one_caller_does_not_cancel_the_others():
+    async def scenario():
+        stub, client = await _client(latency=0.2)
+        try:
+            tasks = [asyncio.create_task(client._generate(dict(PAYLOAD))) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            tasks[0].cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            assert isinstance(results[0], asyncio.CancelledError)
+            assert all(isinstance(result, dict) for result in results[1:])
+            assert stub.request_count == 1
+        finally:
+            await _close(stub, client)
+
+    asyncio.run(scenario())
+
+
+def test_leader_failure_reaches_every_waiter_and_releases_the_key():
+    async def scenario():
+        stub, client = await _client(latency=0.1)
+        stub.down = True
+        try:
+            results = await asyncio.gather(*[client._generate(dict(PAYLOAD)) for _ in range(5)],
+                                           return_exceptions=True)
+            assert all(isinstance(result, Exception) for result in results)
+            assert len({id(result) for result in results}) == 1
+            assert client.single_flight.in_flight() == 0
+
+            # The failure is not cached: the next identical call goes upstream again
+            stub.down = False
+            before = stub.request_count
+            assert "response" in await client._generate(dict(PAYLOAD))
+            assert stub.request_count == before + 1
+        finally:
+            await _close(stub, client)
+
+    asyncio.run(scenario())
+
+
+def test_upstream_work_is_cancelled_once_every_caller_is_gone():
+    async def scenario():
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        flight = SingleFlight()
+        tasks = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+        await started.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert not flight.is_running("key")
+
+    asyncio.run(scenario())
+
+
+def test_exception_is_raised_to_every_caller():
+    async def scenario():
+        async def work():
+            await asyncio.sleep(0.05)
+            raise ValueError("boom")
+
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.started == 1
+        assert not flight.is_running("key")
+        with pytest.raises(ValueError):
+            await flight.do("key", work)
+        assert flight.started == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+import asyncio
+import logging
+
+from enhancement_cache import EnhancementCache
+from ollama_client import OllamaClient
+from scheduler import OllamaScheduler
+from speculation import SpeculativeEnhancer
+from benchmarks.bench_enhance_sections import RESUME, make_responder
+from benchmarks.stub_ollama import StubOllama
+
+
+def test_failed_speculation_is_not_counted_as_a_hit():
+    async def scenario():
+        # The skills answer is malformed JSON, so that speculation fails
+        stub = StubOllama(respond=make_responder("skills"))
+        client = OllamaClient(base_url=await stub.start(), model="stub", enhance_mode="sections",
+                              cache=EnhancementCache())
+        await client.start()
+        speculator = SpeculativeEnhancer(client, OllamaScheduler(max_concurrency=4))
+        try:
+            resume = dict(RESUME)
+            speculator.speculate("session", resume, ["summary", "skills"])
+            await asyncio.gather(*[s.task for s in speculator._sessions["session"].values()])
+
+            with speculator.final("session", resume):
+                await client.enhance_resume(resume)
+            stats = speculator.stats()
+            assert stats["hits"] == 1
+            assert stats["failed"] == 1
+            # Sections that were never speculated on are misses
+            assert stats["misses"] == len(client.enhanced_sections(resume)) - 2
+            assert stats["hit_rate"] == 1 / len(client.enhanced_sections(resume))
+        finally:
+            await client.close()
+            await stub.stop()
+
+    logging.disable(logging.WARNING)
+    try:
+        asyncio.run(scenario())
+    finally:
+        logging.disable(logging.NOTSET)
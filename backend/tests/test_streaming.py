@@ -0,0 +1,138 @@
+import json
+from typing import Dict, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+ANSWERS = {
+    "name": "Jane Doe", "title": "Software Engineer", "phone": "+1 555 0100",
+    "email": "jane@example.com", "location": "Berlin", "summary": "Backend developer",
+    "education": "TU Berlin", "education_degree": "BSc CS", "education_year": "2020-2024",
+    "education_cgpa": "3.8", "skills": "Python, Go, SQL", "projects": "Scheduler: a job scheduler",
+    "experience": "Engineer, Acme, 2 years, built APIs", "certifications": "CKA, CNCF, 2023"
+}
+
+MARKDOWN = (
+    "# Jane Doe\n## Software Engineer\n### Summary\nBuilds backends.\n"
+    "### Skills\n- Python\n- Go\n### Experience\n**Engineer** | Acme | 2 years\n- built APIs\n"
+)
+
+# Without the lifespan, nothing here may reach Ollama
+client = TestClient(main.app)
+
+
+class FakeOllama:
+    """Stands in for OllamaClient, answering from fixed text in small fragments."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    @staticmethod
+    def enhanced(resume_data: Dict) -> Dict:
+        return {**resume_data, "summary": "Enhanced summary"}
+
+    @staticmethod
+    def _fragments(text: str) -> List[str]:
+        return [text[i:i + 7] for i in range(0, len(text), 7)]
+
+    async def generate_resume(self, user_data: Dict) -> str:
+        return MARKDOWN
+
+    async def generate_resume_stream(self, user_data: Dict):
+        for fragment in self._fragments(MARKDOWN):
+            yield fragment
+            if self.fail:
+                raise RuntimeError("connection reset")
+
+    async def enhance_resume(self, resume_data: Dict, use_cache: bool = True) -> Dict:
+        return self.enhanced(resume_data)
+
+    async def enhance_resume_stream(self, resume_data: Dict, use_cache: bool = True):
+        enhanced = self.enhanced(resume_data)
+        for fragment in self._fragments(json.dumps(enhanced)):
+            yield {"type": "token", "text": fragment}
+        yield {"type": "result", "resume_data": enhanced}
+
+
+@pytest.fixture
+def fake_ollama(monkeypatch):
+    fake = FakeOllama()
+    monkeypatch.setattr(main, "ollama_client", fake)
+    return fake
+
+
+def _events(response) -> List[Tuple[str, object]]:
+    """Split an SSE body into (event, data) pairs, checking the framing."""
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    body = response.text
+    assert body.endswith("\n\n")
+    events = []
+    for message in body[:-2].split("\n\n"):
+        lines = message.split("\n")
+        assert len(lines) == 2, message
+        assert lines[0].startswith("event: ") and lines[1].startswith("data: "), message
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+
+def _session(answered: int) -> str:
+    session_id = client.post("/api/session", json={}).json()["session_id"]
+    for entry in main.CONVERSATION_FLOW[:answered]:
+        response = client.post("/api/chat", json={"session_id": session_id, "message": ANSWERS[entry["field"]]})
+        assert response.status_code == 200
+    return session_id
+
+
+def _last_answer() -> str:
+    return ANSWERS[main.CONVERSATION_FLOW[-1]["field"]]
+
+
+def test_chat_stream_enhancement_ends_with_the_chat_body(fake_ollama):
+    steps = len(main.CONVERSATION_FLOW)
+    streamed, plain = _session(steps - 1), _session(steps - 1)
+
+    events = _events(client.post("/api/chat/stream", json={"session_id": streamed, "message": _last_answer()}))
+    expected = client.post("/api/chat", json={"session_id": plain, "message": _last_answer()}).json()
+
+    kinds = [kind for kind, _ in events]
+    assert kinds == ["token"] * (len(kinds) - 1) + ["done"]
+    assert json.loads("".join(data["text"] for _, data in events[:-1])) == expected["resume_data"]
+    assert events[-1][1] == expected
+    assert expected["completed"] is True
+    assert main.resume_data.get(streamed)["summary"] == "Enhanced summary"
+
+
+def test_chat_stream_question_is_a_single_done_event(fake_ollama):
+    streamed, plain = _session(0), _session(0)
+    message = ANSWERS[main.CONVERSATION_FLOW[0]["field"]]
+
+    events = _events(client.post("/api/chat/stream", json={"session_id": streamed, "message": message}))
+    expected = client.post("/api/chat", json={"session_id": plain, "message": message}).json()
+
+    assert events == [("done", expected)]
+
+
+def test_generate_stream_sections_and_done_match_generate(fake_ollama):
+    session_id = _session(len(main.CONVERSATION_FLOW))
+
+    events = _events(client.post(f"/api/generate/stream?session_id={session_id}"))
+    expected = client.post(f"/api/generate?session_id={session_id}").json()
+
+    assert "".join(data["text"] for kind, data in events if kind == "token") == MARKDOWN
+    sections = {data["field"]: data["value"] for kind, data in events if kind == "section"}
+    assert events[-1] == ("done", expected)
+    assert sections == expected
+    assert expected["skills"] == ["Python", "Go"]
+
+
+def test_generate_stream_failure_ends_with_an_error_event(fake_ollama):
+    fake_ollama.fail = True
+    session_id = _session(len(main.CONVERSATION_FLOW))
+
+    events = _events(client.post(f"/api/generate/stream?session_id={session_id}"))
+
+    assert events[0][0] == "token"
+    assert events[-1] == ("error", {"detail": "Error generating resume"})
@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+
+import main
+
+ANSWERS = {
+    "name": "Jane Doe", "title": "Software Engineer", "phone": "+1 555 0100",
+    "email": "jane@example.com", "location": "Berlin", "summary": "Backend developer",
+    "education": "TU Berlin", "education_degree": "BSc CS", "education_year": "2020-2024",
+    "education_cgpa": "3.8", "skills": "Python, Go, SQL", "projects": "Scheduler: a job scheduler",
+    "experience": "Engineer, Acme, 2 years, built APIs", "certifications": "CKA, CNCF, 2023"
+}
+
+# Without the lifespan, nothing here may reach Ollama
+client = TestClient(main.app)
+
+
+def _session() -> str:
+    return client.post("/api/session", json={}).json()["session_id"]
+
+
+def _submit(session_id: str, answers: dict, enhance: bool = False):
+    return client.post(f"/api/session/{session_id}/answers", json={"answers": answers, "enhance": enhance})
+
+
+def test_answers_complete_the_session_without_enhancing():
+    session_id = _session()
+    response = _submit(session_id, ANSWERS)
+    assert response.status_code == 200
+    assert response.json()["completed"] is False
+    session = main.sessions.get(session_id)
+    assert session["current_step"] == len(main.CONVERSATION_FLOW)
+    assert session["resume_data"]["name"] == "Jane Doe"
+
+
+def test_empty_submission_is_rejected():
+    session_id = _session()
+    response = _submit(session_id, {})
+    assert response.status_code == 422
+    assert main.sessions.get(session_id)["current_step"] == 0
+
+
+def test_unknown_and_missing_fields_are_rejected():
+    session_id = _session()
+    assert _submit(session_id, {**ANSWERS, "hobbies": "chess"}).status_code == 422
+    partial = dict(ANSWERS)
+    del partial["skills"]
+    response = _submit(session_id, partial)
+    assert response.status_code == 422
+    assert "skills" in response.json()["detail"]
+
+
+def test_already_answered_questions_conflict():
+    session_id = _session()
+    client.post("/api/chat", json={"session_id": session_id, "message": ANSWERS["name"]})
+    response = _submit(session_id, ANSWERS)
+    assert response.status_code == 409
+    assert "name" in response.json()["detail"]
+
+
+def test_completed_session_conflicts_instead_of_enhancing_again():
+    session_id = _session()
+    assert _submit(session_id, ANSWERS).status_code == 200
+    assert _submit(session_id, {}, enhance=True).status_code == 422
+    assert _submit(session_id, {"name": "Someone Else"}, enhance=True).status_code == 409
+    assert main.sessions.get(session_id)["resume_data"]["name"] == "Jane Doe"
+
+
+def test_unknown_session_is_not_found():
+    assert _submit("missing", ANSWERS).status_code == 404
@@ -0,0 +1,43 @@
+import asyncio
+
+from ollama_client import OllamaClient
+from warmup import ModelWarmer
+from benchmarks.stub_ollama import StubOllama
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> bool:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+def test_warmer_becomes_ready_again_after_a_failed_ping_without_traffic():
+    async def scenario():
+        stub = StubOllama()
+        client = OllamaClient(base_url=await stub.start(), model="stub")
+        await client.start()
+        warmer = ModelWarmer(client, ping_interval=0.05, retry_interval=0.05)
+        try:
+            warmer.start()
+            assert await _wait_for(lambda: warmer.ready)
+
+            # Traffic makes the next keep-warm ping happen; Ollama is down for it
+            stub.down = True
+            warmer.touch()
+            assert await _wait_for(lambda: not warmer.ready)
+            assert warmer.ping_failures >= 1
+
+            # No traffic from here on, as when a load balancer stops routing
+            stub.down = False
+            assert await _wait_for(lambda: warmer.ready)
+            assert warmer.last_error is None
+        finally:
+            await warmer.stop()
+            await client.close()
+            await stub.stop()
+
+    asyncio.run(scenario())
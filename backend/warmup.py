@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from ollama_client import OllamaClient
+
+logger = logging.getLogger(__name__)
+
+class ModelWarmer:
+    """
+    Keep the Ollama model loaded so user requests never pay its load time.
+
+    start() preloads the model in the background, retrying until Ollama
+    answers. After that the model is pinged every ping_interval seconds,
+    but only if the app has seen traffic since the last ping: an idle
+    instance lets Ollama unload the model after its keep_alive, while users
+    in the middle of a chat keep it warm for the request that will need it.
+
+    ready is what the readiness endpoint reports. It turns false when a
+    ping fails, since Ollama may have restarted without the model, and the
+    model is then reloaded every retry_interval seconds until it is back,
+    whether or not there is traffic. A disabled warmer never touches Ollama
+    and always reports ready.
+    """
+
+    def __init__(self, ollama_client: OllamaClient, ping_interval: float = 300,
+                 retry_interval: float = 10, enabled: bool = True):
+        self.ollama_client = ollama_client
+        self.ping_interval = ping_interval
+        self.retry_interval = retry_interval
+        self.enabled = enabled
+        self.ready = not enabled
+        self.loaded_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.pings = 0
+        self.ping_failures = 0
+        self._last_traffic = 0.0
+        self._last_ping = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self) -> None:
+        """Record app traffic; called for every HTTP request."""
+        self._last_traffic = time.monotonic()
+
+    def start(self) -> None:
+        """Preload the model and keep it warm on the event loop."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            if not self.ready:
+                # Reload until Ollama answers, traffic or not: a load balancer
+                # sends no traffic to an instance that is not ready
+                if not await self._load():
+                    await asyncio.sleep(self.retry_interval)
+                continue
+            await asyncio.sleep(self.ping_interval)
+            if self._last_traffic > self._last_ping:
+                await self._load()
+
+    async def _load(self) -> bool:
+        start = time.perf_counter()
+        self._last_ping = time.monotonic()
+        try:
+            result = await self.ollama_client.load_model()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.loaded_at is not None:
+                self.ping_failures += 1
+            self.ready = False
+            self.last_error = str(e)
+            logger.warning(f"Loading model {self.ollama_client.model} failed: {str(e)}")
+            return False
+
+        elapsed = time.perf_counter() - start
+        if self.loaded_at is None:
+            # Ollama reports the load time in nanoseconds
+            self.load_seconds = result.get("load_duration", elapsed * 1e9) / 1e9
+            logger.info(f"Model {self.ollama_client.model} loaded in {self.load_seconds:.2f}s")
+        else:
+            self.pings += 1
+        self.ready = True
+        self.loaded_at = time.time()
+        self.last_error = None
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "enabled": self.enabled,
+            "model": self.ollama_client.model,
+            "keep_alive": self.ollama_client.keep_alive,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+            "last_error": self.last_error
+        }
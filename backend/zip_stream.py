@@ -0,0 +1,55 @@
+import zipfile
+from typing import List, Optional
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+class ZipStream:
+    """
+    Builds a ZIP archive incrementally for streaming responses.
+
+    The sink has no tell()/seek(), so zipfile writes each entry with a data
+    descriptor and never goes back to patch headers. Every add() returns
+    the bytes for that entry alone, and close() returns the central
+    directory, so only one entry is held in memory at a time.
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes, compression: Optional[int] = None) -> bytes:
+        """
+        Append one file to the archive.
+
+        Args:
+            name: Path of the file inside the archive
+            data: File contents
+            compression: Override the archive's compression for this entry,
+                e.g. ZIP_STORED for content that is already compressed
+
+        Returns:
+            bytes: The encoded entry, ready to send
+        """
+        self._zip.writestr(name, data, compress_type=compression)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Finish the archive and return its central directory."""
+        self._zip.close()
+        return self._sink.drain()